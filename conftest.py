@@ -0,0 +1 @@
+# Presence of this file puts the repository root on sys.path so tests can import the iec101 modules
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 
-from typing import Any, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from scapy.packet import Packet
 from scapy.fields import (
     Field, XBitField, XByteField, XByteEnumField, XLEShortField,
@@ -9,400 +12,17 @@ from scapy.fields import (
     FlagsField, PacketLenField, FieldLenField, StrLenField, PacketField,
     XStrField, MultipleTypeField, FieldListField, PacketListField
 )
-
-FUNCTION_CODES = {
-    0x0: 'SEND/CONFIRM - Reset of remote link',
-    0x1: 'SEND/CONFIRM - Reset of user process',
-    0x2: 'SEND/CONFIRM - Reserved for balanced transmission procedure',
-    0x3: 'SEND/CONFIRM - User data',
-    0x4: 'SEND/NO REPLY - User data',
-    0x5: 'Reserved',
-    0x6: 'Reserved for special use by agreement',
-    0x7: 'Reserved for special use by agreement',
-    0x8: 'REQUEST for access demand',
-    0x9: 'REQUEST/RESPONSE - Status of link',
-    0xa: 'REQUEST/RESPONSE - User data class 1',
-    0xb: 'REQUEST/RESPONSE - User data class 2',
-    0xc: 'Reserved',
-    0xd: 'Reserved',
-    0xe: 'Reserved for special use by agreement',
-    0xf: 'Reserved for special use by agreement',
-}
-
-TYPEID_ASDU = {
-    0x01: 'M_SP_NA_1 (1)',
-    0x02: 'M_SP_TA_1 (2)',
-    0x03: 'M_DP_NA_1 (3)',
-    0x04: 'M_DP_TA_1 (4)',
-    0x05: 'M_ST_NA_1 (5)',
-    0x06: 'M_ST_TA_1 (6)',
-    0x07: 'M_BO_NA_1 (7)',
-    0x08: 'M_BO_TA_1 (8)',
-    0x09: 'M_ME_NA_1 (9)',
-    0x0A: 'M_ME_TA_1 (10)',
-    0x0B: 'M_ME_NB_1 (11)',
-    0x0C: 'M_ME_TB_1 (12)',
-    0x0D: 'M_ME_NC_1 (13)',
-    0x0E: 'M_ME_TC_1 (14)',
-    0x0F: 'M_IT_NA_1 (15)',
-    0x10: 'M_IT_TA_1 (16)',
-    0x11: 'M_EP_TA_1 (17)',
-    0x12: 'M_EP_TB_1 (18)',
-    0x13: 'M_EP_TC_1 (19)',
-    0x14: 'M_PS_NA_1 (20)',
-    0x15: 'M_ME_ND_1 (21)',
-    0x1E: 'M_SP_TB_1 (30)',
-    0x1F: 'M_DP_TB_1 (31)',
-    0x20: 'M_ST_TB_1 (32)',
-    0x21: 'M_BO_TB_1 (33)',
-    0x22: 'M_ME_TD_1 (34)',
-    0x23: 'M_ME_TE_1 (35)',
-    0x24: 'M_ME_TF_1 (36)',
-    0x25: 'M_IT_TB_1 (37)',
-    0x26: 'M_EP_TD_1 (38)',
-    0x27: 'M_EP_TE_1 (39)',
-    0x28: 'M_EP_TF_1 (40)',
-    0x2D: 'C_SC_NA_1 (45)',
-    0x2E: 'C_DC_NA_1 (46)',
-    0x2F: 'C_RC_NA_1 (47)',
-    0x30: 'C_SE_NA_1 (48)',
-    0x31: 'C_SE_NB_1 (49)',
-    0x32: 'C_SE_NC_1 (50)',
-    0x33: 'C_BO_NA_1 (51)',
-    0x46: 'M_EI_NA_1 (70)',
-    0x64: 'C_IC_NA_1 (100)',
-    0x65: 'C_CI_NA_1 (101)',
-    0x66: 'C_RD_NA_1 (102)',
-    0x67: 'C_CS_NA_1 (103)',
-    0x68: 'C_TS_NA_1 (104)',
-    0x69: 'C_RP_NA_1 (105)',
-    0x6A: 'C_CD_NA_1 (106)',
-    0x6E: 'P_ME_NA_1 (110)',
-    0x6F: 'P_ME_NB_1 (111)',
-    0x70: 'P_ME_NC_1 (112)',
-    0x71: 'P_AC_NA_1 (113)',
-    0x78: 'F_FR_NA_1 (120)',
-    0x79: 'F_SR_NA_1 (121)',
-    0x7A: 'F_SC_NA_1 (122)',
-    0x7B: 'F_LS_NA_1 (123)',
-    0x7C: 'F_AF_NA_1 (124)',
-    0x7D: 'F_SG_NA_1 (125)',
-    0x7E: 'F_DR_TA_1 (126)',
-}
-
-CAUSE_OF_TX = {
-    0: 'not used',
-    1: 'per/cyc',
-    2: 'back',
-    3: 'spont',
-    4: 'init',
-    5: 'req',
-    6: 'Act',
-    7: 'ActCon',
-    8: 'Deact',
-    9: 'DeactCon',
-    10: 'ActTerm',
-    11: 'retrem',
-    12: 'retloc',
-    13: 'file',
-    20: 'inrogen',
-    21: 'inro1',
-    22: 'inro2',
-    23: 'inro3',
-    24: 'inro4',
-    25: 'inro5',
-    26: 'inro6',
-    27: 'inro7',
-    28: 'inro8',
-    29: 'inro9',
-    30: 'inro10',
-    31: 'inro11',
-    32: 'inro12',
-    33: 'inro13',
-    34: 'inro14',
-    35: 'inro15',
-    36: 'inro16',
-    37: 'reqcogen',
-    38: 'reqco1',
-    39: 'reqco2',
-    40: 'reqco3',
-    41: 'reqco4',
-    44: 'unknown type identification',
-    45: 'unknown cause of transmission',
-    46: 'unknown common address of ASDU',
-    47: 'unknown information object address'
-}
-
-SQ_ENUM = {
-    0: 'Single',
-    1: 'Sequence'
-}
-
-SC_ENUM = {
-    0: 'OFF',
-    1: 'ON'
-}
-
-DC_ENUM = {
-    0: 'not permitted',
-    1: 'OFF',
-    2: 'ON',
-    3: 'not permitted'
-}
-
-SE_ENUM = {
-    0: 'Execute',
-    1: 'Select'
-}
-
-DPI_ENUM = {
-    0: 'Indeterminate/intermidiate',
-    1: 'OFF',
-    2: 'ON',
-    3: 'Indeterminate'
-}
-
-ES_ENUM = {
-    0: 'Indeterminate (0)',
-    1: 'OFF',
-    2: 'ON',
-    3: 'Indeterminate (3)',
-}
-
-DOW_ENUM = {
-    0: 'not used',
-    1: 'Monday',
-    2: 'Tuesday',
-    3: 'Wednesday',
-    4: 'Thursday',
-    5: 'Friday',
-    6: 'Saturday',
-    7 :'Sunday',
-}
-
-RCS_ENUM = {
-    0: 'not permitted',
-    1: 'next step LOWER',
-    2: 'next step HIGHER',
-    3: 'not permitted',
-}
-
-COI_ENUM = {
-    0: 'local power switch on',
-    1: 'local manual reset',
-    2: 'remote reset',
-}
-COI_ENUM.update({x: 'reserved (compatible)' for x in range(3,32)})
-COI_ENUM.update({x: 'reserved (private)' for x in range(32,128)})
-
-QOI_ENUM = {
-    0 : 'not used',
-    20 : 'Station interrogation (global)',
-    21 : 'Interrogation of group 1',
-    22 : 'Interrogation of group 2',
-    23 : 'Interrogation of group 3',
-    24 : 'Interrogation of group 4',
-    25 : 'Interrogation of group 5',
-    26 : 'Interrogation of group 6',
-    27 : 'Interrogation of group 7',
-    28 : 'Interrogation of group 8',
-    29 : 'Interrogation of group 9',
-    30 : 'Interrogation of group 10',
-    31 : 'Interrogation of group 11',
-    32 : 'Interrogation of group 12',
-    33 : 'Interrogation of group 13',
-    34 : 'Interrogation of group 14',
-    35 : 'Interrogation of group 15',
-    36 : 'Interrogation of group 16',
-}
-QOI_ENUM.update({x: 'Reserved (compatible range)' for x in range(1, 20)})
-QOI_ENUM.update({x: 'Reserved (compatible range)' for x in range(37, 64)})
-QOI_ENUM.update({x: 'Reserved (private)' for x in range(64, 256)})
-
-RQT_ENUM = {
-    0 : 'no counter requested (not used)',
-    1 : 'request counter group 1',
-    2 : 'request counter group 2',
-    3 : 'request counter group 3',
-    4 : 'request counter group 4',
-    5 : 'general request counter',
-}
-RQT_ENUM.update({x: 'Reserved (compatible range)' for x in range(6, 32)})
-RQT_ENUM.update({x: 'Reserved (private)' for x in range(32, 64)})
-
-QRP_ENUM = {
-    0: 'not used',
-    1: 'general reset of process',
-    2: 'reset of pending information with time tag of the event buffer'
-}
-QRP_ENUM.update({x: 'Reserved (compatible range)' for x in range(3, 128)})
-QRP_ENUM.update({x: 'Reserved (private)' for x in range(128, 256)})
-
-FRZ_ENUM = {
-    0: 'read',
-    1: 'counter freeze without reset',
-    2: 'counter freeze with reset',
-    3: 'counter reset'
-}
-
-KPA_ENUM = {
-    0: 'not used',
-    1: 'threshold value',
-    2: 'smoothing factor',
-    3: 'low limit',
-    4: 'high limit'
-}
-KPA_ENUM.update({x: 'Reserved (compatible range)' for x in range(5, 32)})
-KPA_ENUM.update({x: 'Reserved (private)' for x in range(32, 64)})
-
-QPA_ENUM = {
-    0: 'not used',
-    1: 'previously loaded parameters',
-    2: 'parameter of the addressed object',
-    3: 'persistent cyclic or periodic transmission'
-}
-QPA_ENUM.update({x: 'Reserved (compatible range)' for x in range(4, 128)})
-QPA_ENUM.update({x: 'Reserved (private)' for x in range(128, 256)})
-
-FRQ_ENUM = {0: 'default'}
-FRQ_ENUM.update({x: 'Reserved (compatible range)' for x in range(1, 64)})
-FRQ_ENUM.update({x: 'Reserved (private)' for x in range(64, 128)})
-
-SRQ_ENUM = FRQ_ENUM
-
-SCQ_ENUM_A = {
-    0: 'default',
-    1: 'select file',
-    2: 'request file',
-    3: 'deactivate file',
-    4: 'delete file',
-    5: 'select section',
-    6: 'request section',
-    7: 'deactivate section'
-}
-SCQ_ENUM_A.update({x: 'Reserved (compatible range)' for x in range(8, 11)})
-SCQ_ENUM_A.update({x: 'Reserved (private)' for x in range(11, 16)})
-
-SCQ_ENUM_B = {
-    0: 'default',
-    1: 'requested memory space not available',
-    2: 'checksum failed',
-    3: 'unexpected communication service',
-    4: 'unexpected name of file',
-    5: 'unexpected name of section'
-}
-SCQ_ENUM_B.update({x: 'Reserved (compatible range)' for x in range(6, 11)})
-SCQ_ENUM_B.update({x: 'Reserved (private)' for x in range(11, 16)})
-
-LSQ_ENUM = {
-    0: 'not used',
-    1: 'file transfer without deactivation',
-    2: 'file transfer with deactivation',
-    3: 'section transfer without deactivation',
-    4: 'section transfer with deactivation'
-}
-LSQ_ENUM.update({x: 'Reserved (compatible range)' for x in range(5, 128)})
-LSQ_ENUM.update({x: 'Reserved (private)' for x in range(128, 256)})
-
-AFQ_ENUM_A = {
-    0: 'not used',
-    1: 'positive acknowledge of file transfer',
-    2: 'negative acknowledge of file transfer',
-    3: 'positive acknowledge of section transfer',
-    4: 'negative acknowledge of section transfer'
-}
-AFQ_ENUM_A.update({x: 'Reserved (compatible range)' for x in range(5, 11)})
-AFQ_ENUM_A.update({x: 'Reserved (private)' for x in range(11, 16)})
-
-AFQ_ENUM_B = SCQ_ENUM_B
-
-SOF_ENUM = {0: 'default'}
-SOF_ENUM.update({x: 'Reserved (compatible range)' for x in range(1, 16)})
-SOF_ENUM.update({x: 'Reserved (compatible range)' for x in range(16, 32)})
-
-CAUSE_OF_TX_FLAGS = {
-    0: 'Negative',
-    1: 'Test'
-}
-
-CONTROL_FLAGS = {
-    0: 'FCV',
-    1: 'FCB',
-    2: 'PRM',
-    3: 'RES'
-}
-
-SIQ_FLAGS = {
-    0:'SPI',
-    4:'BL',
-    5:'SB',
-    6:'NT',
-    7:'IV'
-}
-
-DIQ_FLAGS = {
-    2:'BL',
-    3:'SB',
-    4:'NT',
-    5:'IV'
-}
-
-QDS_FLAGS = {
-    0: 'OV',
-    4: 'BL',
-    5: 'SB',
-    6: 'NT',
-    7: 'IV',
-}
-
-BCR_FLAGS = {
-    0: 'CY',
-    1: 'CA',
-    2: 'IV',
-}
-
-SEP_FLAGS = {
-    0: 'EI',
-    1: 'BL',
-    2: 'SB',
-    3: 'NT',
-    4: 'IV',
-}
-
-SPE_FLAGS = {
-    0: 'GS',
-    1: 'SL1',
-    2: 'SL2',
-    3: 'SL3',
-    4: 'SIE',
-    5: 'SRD',
-}
-
-QDP_FLAGS = {
-    3: 'EI',
-    4: 'BL',
-    5: 'SB',
-    6: 'NT',
-    7: 'IV',
-}
-
-OCI_FLAGS = {
-    0: 'GC',
-    1: 'CL1',
-    2: 'CL2',
-    3: 'CL3',
-}
-
-LPCPOP_FLAGS = {
-    0: 'LPC',
-    1: 'POP'
-}
-
-SOF_FLAGS = {
-    0: 'LFD',
-    1: 'FOR',
-    2: 'FA'
-}
+from iec101_codec import (
+    MAX_ASDU_LENGTH, FT12Error, DecodedASDU, asdu_size, cp24_to_datetime, cp56_to_datetime, datetime_to_cp24, datetime_to_cp56,
+    decode_asdu, encode_asdu, encode_fixed_frame, encode_variable_frame_into, ft12_checksum, ft12_validate, pack_asdus, scan_frame
+)
+from iec101_constants import (
+    FUNCTION_CODES, TYPEID_ASDU, CAUSE_OF_TX, SQ_ENUM, SC_ENUM, DC_ENUM, SE_ENUM, DPI_ENUM, ES_ENUM, DOW_ENUM, RCS_ENUM, COI_ENUM, QOI_ENUM,
+    RQT_ENUM, QRP_ENUM, FRZ_ENUM, KPA_ENUM, QPA_ENUM, FRQ_ENUM, SRQ_ENUM, SCQ_ENUM_A, SCQ_ENUM_B, LSQ_ENUM, AFQ_ENUM_A, AFQ_ENUM_B,
+    SOF_ENUM, CAUSE_OF_TX_FLAGS, CONTROL_FLAGS, CF_FCV, CF_FCB, CF_PRM, CF_DFC, CF_ACD, SECONDARY_FUNCTION_CODES, SIQ_FLAGS,
+    DIQ_FLAGS, QDS_FLAGS, BCR_FLAGS, SEP_FLAGS, SPE_FLAGS, QDP_FLAGS, OCI_FLAGS, LPCPOP_FLAGS, SOF_FLAGS
+)
+from iec101_records import DEFAULT_TYPES, Record, record_to_object, records_from_decoded, records_to_objects
 
 class NVA(Field):
     def __init__(self, name: str, default: Any, fmt: str = "<e") -> None:
@@ -424,6 +44,13 @@ class CP24Time2a(Packet):
     def extract_padding(self, s: bytes):
         return b'', s
 
+    def to_datetime(self, reference: datetime, mask_invalid: bool = True) -> Optional[datetime]:
+        return cp24_to_datetime(bytes(self), reference, mask_invalid)
+
+    @classmethod
+    def from_datetime(cls, value: datetime, invalid: bool = False) -> 'CP24Time2a':
+        return cls(datetime_to_cp24(value, invalid))
+
 class CP56Time2a(Packet):
     name = 'Seven octet binary time'
     fields_desc = [
@@ -445,6 +72,13 @@ class CP56Time2a(Packet):
     def extract_padding(self, s: bytes):
         return b'', s
 
+    def to_datetime(self, century: int = 2000, utc_offset: Optional[timedelta] = None, dst_offset: timedelta = timedelta(hours=1), mask_invalid: bool = True) -> Optional[datetime]:
+        return cp56_to_datetime(bytes(self), century, utc_offset, dst_offset, mask_invalid)
+
+    @classmethod
+    def from_datetime(cls, value: datetime, century: int = 2000, invalid: bool = False, summer_time: bool = False) -> 'CP56Time2a':
+        return cls(datetime_to_cp56(value, century, invalid, summer_time))
+
 class SOF(Packet):
     name = 'Status of file'
     fields_desc = [
@@ -580,6 +214,10 @@ class AFQ(IOVal):
         BitEnumField('qualifier', 0x0, 4, AFQ_ENUM_A)
     ]
 
+# Information objects are dissected by fields that do not pass the ASDU along,
+# so IODispatchField publishes the ASDU's IOA width here while it dissects them
+IO_BALANCED: ContextVar[bool] = ContextVar('IO_BALANCED', default=True)
+
 class IO(Packet):
     name = 'Information object'
     __slots__ = ['sq', 'number',  'balanced']
@@ -587,9 +225,20 @@ class IO(Packet):
     def __init__(self, _pkt: bytes = b"", post_transform: Any = None, _internal: int = 0, _underlayer: Optional[Packet] = None, _parent : Optional[Packet] = None, sq: int = 0, **fields: Any) -> None:
         self.sq = sq
         self.number = len(_pkt) - 2 if sq == 1 else 1
-        self.balanced : bool = _parent.balanced if _parent is not None and 'balanced' in _parent.__slots__ else True
+        self.balanced : bool = _parent.balanced if _parent is not None and 'balanced' in _parent.__slots__ else IO_BALANCED.get()
         super().__init__(_pkt, post_transform, _internal, _underlayer, **fields)
 
+    # Packet.copy() and clone_with() start from a bare instance, which would drop the SQ layout on build
+    def copy(self) -> 'IO':
+        clone = super().copy()
+        clone.sq, clone.number, clone.balanced = self.sq, self.number, self.balanced
+        return clone
+
+    def clone_with(self, payload: Any = None, share_time: bool = False, **kargs: Any) -> 'IO':
+        clone = super().clone_with(payload, share_time, **kargs)
+        clone.sq, clone.number, clone.balanced = self.sq, self.number, self.balanced
+        return clone
+
     def extract_padding(self, s: bytes):
         return b'', s
 
@@ -1412,127 +1061,412 @@ class IO126(IO):
         PacketListField('entries', [], IOFile, length_from=lambda pkt: pkt.number)
     ]
 
+class IODispatch:
+    __slots__ = ['builder', '_table']
+
+    def __init__(self, builder: Callable[[], Dict[Tuple[int, Optional[int]], Field]]) -> None:
+        self.builder = builder
+        self._table: Optional[Dict[Tuple[int, Optional[int]], Field]] = None
+
+    @property
+    def table(self) -> Dict[Tuple[int, Optional[int]], Field]:
+        # The per-type fields instantiate default IO packets, so they are only built on first dispatch
+        if self._table is None:
+            self._table = self.builder()
+        return self._table
+
+    def lookup(self, pkt: Packet) -> Optional[Field]:
+        type_id = pkt.getfieldval('type')
+        table = self.table
+        fld = table.get((type_id, pkt.getfieldval('VSQ').SQ))
+        if fld is None:
+            fld = table.get((type_id, None))
+        return fld
+
+    def register(self, type_id: int, fld: Field, sq: Optional[int] = None) -> None:
+        self.table[(type_id, sq)] = fld
+
+    def unregister(self, type_id: int, sq: Optional[int] = None) -> Optional[Field]:
+        return self.table.pop((type_id, sq), None)
+
+class LazyIO:
+    __slots__ = ['raw', 'field']
+
+    def __init__(self, raw: bytes, field: Field) -> None:
+        self.raw = raw
+        self.field = field
+
+    def copy(self) -> 'LazyIO':
+        return self
+
+    def __bytes__(self) -> bytes:
+        return self.raw
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyIO):
+            return self.raw == other.raw
+        if isinstance(other, list):
+            return self.raw == b''.join(bytes(obj) for obj in other)
+        return self.raw == bytes(other)
+
+    def __repr__(self) -> str:
+        return f'<LazyIO {len(self.raw):d} bytes>'
+
+class IODispatchField(Field):
+    __slots__ = ['dispatch', 'dflt']
+    islist = 1
+    holds_packets = 1
+
+    def __init__(self, name: str, dispatch: IODispatch, dflt: Field) -> None:
+        self.dispatch = dispatch
+        self.dflt = dflt
+        super().__init__(name, None)
+
+    def field(self, pkt: Optional[Packet]) -> Field:
+        if pkt is None:
+            return self.dflt
+        return self.dispatch.lookup(pkt) or self.dflt
+
+    def getfield(self, pkt: Packet, s: bytes) -> Tuple[bytes, Any]:
+        # A lazy ASDU keeps the object bytes and the field that will dissect them
+        if getattr(pkt, 'lazy', False):
+            return b'', LazyIO(s, self.field(pkt))
+        return self.dissect(pkt, self.field(pkt), s)
+
+    def dissect(self, pkt: Packet, fld: Field, s: bytes) -> Tuple[bytes, Any]:
+        token = IO_BALANCED.set(getattr(pkt, 'balanced', True))
+        try:
+            return fld.getfield(pkt, s)
+        finally:
+            IO_BALANCED.reset(token)
+
+    def materialize(self, pkt: Packet, x: LazyIO) -> Any:
+        rest, val = self.dissect(pkt, x.field, x.raw)
+        pkt.fields[self.name] = val
+        if pkt.raw_packet_cache_fields is not None and self.name in pkt.raw_packet_cache_fields:
+            pkt.raw_packet_cache_fields[self.name] = self.do_copy(val)
+        if rest:
+            pkt.raw_packet_cache = None
+            pkt.add_payload(pkt.guess_payload_class(rest)(rest, _internal=1, _underlayer=pkt))
+        return val
+
+    def addfield(self, pkt: Packet, s: bytes, val: Any) -> bytes:
+        if isinstance(val, LazyIO):
+            return s + val.raw
+        fld = self.field(pkt)
+        return fld.addfield(pkt, s, fld.default if val is None else val)
+
+    def i2h(self, pkt: Optional[Packet], x: Any) -> Any:
+        if isinstance(x, LazyIO):
+            x = self.materialize(pkt, x)
+        fld = self.field(pkt)
+        if x is None and pkt is not None and fld.default is not None:
+            # The per-type default is copied into the packet so that it can be modified in place
+            x = pkt.fields[self.name] = fld.do_copy(fld.default)
+        return fld.i2h(pkt, x)
+
+    def h2i(self, pkt: Optional[Packet], x: Any) -> Any:
+        return self.field(pkt).h2i(pkt, x)
+
+    def any2i(self, pkt: Optional[Packet], x: Any) -> Any:
+        return self.field(pkt).any2i(pkt, x)
+
+    def m2i(self, pkt: Optional[Packet], x: Any) -> Any:
+        return self.field(pkt).m2i(pkt, x)
+
+    def i2m(self, pkt: Optional[Packet], x: Any) -> Any:
+        fld = self.field(pkt)
+        return fld.i2m(pkt, fld.default if x is None else x)
+
+    def i2len(self, pkt: Packet, x: Any) -> int:
+        if isinstance(x, LazyIO):
+            return len(x)
+        fld = self.field(pkt)
+        return fld.i2len(pkt, fld.default if x is None else x)
+
+    def i2count(self, pkt: Optional[Packet], x: Any) -> int:
+        if isinstance(x, LazyIO):
+            x = self.materialize(pkt, x)
+        fld = self.field(pkt)
+        return fld.i2count(pkt, fld.default if x is None else x)
+
+    def i2repr(self, pkt: Optional[Packet], x: Any) -> str:
+        if isinstance(x, LazyIO):
+            x = self.materialize(pkt, x)
+        fld = self.field(pkt)
+        return fld.i2repr(pkt, fld.default if x is None else x)
+
+    def randval(self) -> Any:
+        return self.dflt.randval()
+
+def io_list_field(cls: Any, sq: int = 0) -> Field:
+    return PacketListField('IO', [], lambda b: cls(b, sq=sq), count_from=lambda pkt: pkt.VSQ.number)
+
+def io_sequence_field(cls: Any) -> Field:
+    return PacketField('IO', cls(), lambda b: cls(b, sq=1))
+
+def io_field(cls: Any) -> Field:
+    return PacketField('IO', cls(), cls)
+
+IO_SEQUENCE_TYPES = {
+    0x01: IO1,
+    0x03: IO3,
+    0x05: IO5,
+    0x07: IO7,
+    0x09: IO9,
+    0x0b: IO11,
+    0x0d: IO13,
+    0x0f: IO15,
+    0x14: IO20,
+    0x15: IO21,
+}
+
+IO_LIST_TYPES = {
+    0x02: IO2,
+    0x04: IO4,
+    0x06: IO6,
+    0x08: IO8,
+    0x0a: IO10,
+    0x0c: IO12,
+    0x0e: IO14,
+    0x10: IO16,
+    0x11: IO17,
+}
+
+IO_SQ0_LIST_TYPES = {
+    0x1e: IO30,
+    0x1f: IO31,
+    0x20: IO32,
+    0x21: IO33,
+    0x22: IO34,
+    0x23: IO35,
+    0x24: IO36,
+    0x25: IO37,
+    0x26: IO38,
+}
+
+IO_SINGLE_TYPES = {
+    0x12: IO18,
+    0x13: IO19,
+    0x27: IO39,
+    0x28: IO40,
+    0x2d: IO45,
+    0x2e: IO46,
+    0x2f: IO47,
+    0x30: IO48,
+    0x31: IO49,
+    0x32: IO50,
+    0x33: IO51,
+    0x46: IO70,
+    0x64: IO100,
+    0x65: IO101,
+    0x66: IO102,
+    0x67: IO103,
+    0x68: IO104,
+    0x69: IO105,
+    0x6a: IO106,
+    0x6e: IO110,
+    0x6f: IO111,
+    0x70: IO112,
+    0x71: IO113,
+    0x78: IO120,
+    0x79: IO121,
+    0x7a: IO122,
+    0x7b: IO123,
+    0x7c: IO124,
+    0x7d: IO125,
+    0x7e: IO126,
+}
+
+IO_CLASSES = {**IO_SEQUENCE_TYPES, **IO_LIST_TYPES, **IO_SQ0_LIST_TYPES, **IO_SINGLE_TYPES}
+
+def io_types() -> List[int]:
+    return sorted(type_id for type_id in IO_CLASSES if type_id in TYPEID_ASDU)
+
+def io_fields() -> Dict[Tuple[int, Optional[int]], Field]:
+    fields: Dict[Tuple[int, Optional[int]], Field] = {}
+    fields.update({(type_id, 0): io_list_field(cls) for type_id, cls in IO_SEQUENCE_TYPES.items()})
+    fields.update({(type_id, 1): io_sequence_field(cls) for type_id, cls in IO_SEQUENCE_TYPES.items()})
+    fields.update({(type_id, None): io_list_field(cls) for type_id, cls in IO_LIST_TYPES.items()})
+    fields.update({(type_id, 0): io_list_field(cls) for type_id, cls in IO_SQ0_LIST_TYPES.items()})
+    fields.update({(type_id, None): io_field(cls) for type_id, cls in IO_SINGLE_TYPES.items()})
+    return fields
+
+IO_DISPATCH = IODispatch(io_fields)
+
+def register_io(type_id: int, fld: Field, sq: Optional[int] = None, name: Optional[str] = None) -> None:
+    IO_DISPATCH.register(type_id, fld, sq)
+    if name is not None:
+        TYPEID_ASDU[type_id] = name
+        type_field = ASDU.fields_desc[0]
+        type_field.i2s[type_id] = name
+        type_field.s2i[name] = type_id
+
+def unregister_io(type_id: int, sq: Optional[int] = None) -> Optional[Field]:
+    return IO_DISPATCH.unregister(type_id, sq)
+
+LAZY_DISSECTION: ContextVar[bool] = ContextVar('LAZY_DISSECTION', default=False)
+
+@contextmanager
+def lazy_dissection(enabled: bool = True) -> Iterator[None]:
+    token = LAZY_DISSECTION.set(enabled)
+    try:
+        yield
+    finally:
+        LAZY_DISSECTION.reset(token)
+
 class ASDU(Packet):
     name = 'ASDU'
-    __slots__ = ['balanced']
+    __slots__ = ['balanced', 'lazy']
     fields_desc = [
         XByteEnumField('type', 0x00, TYPEID_ASDU),
         PacketLenField('VSQ', VSQ(), VSQ, length_from=lambda pkt: 1),
         FlagsField('COT_flags', 0x00, 2, CAUSE_OF_TX_FLAGS),
         BitEnumField('COT', 0x00, 6, CAUSE_OF_TX),
         XByteField('CommonAddress', 0x00),
-        MultipleTypeField(
-            [
-                (PacketListField('IO', [], lambda b: IO1(b, sq=0), count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.VSQ.SQ == 0 and pkt.type == 0x01),
-                (PacketField('IO', IO1(), lambda b: IO1(b, sq=1)), lambda pkt: pkt.VSQ.SQ == 1 and pkt.type == 0x01),
-                (PacketListField('IO', [], IO2, count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.type == 0x02),
-                (PacketListField('IO', [], lambda b: IO3(b, sq=0), count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.VSQ.SQ == 0 and pkt.type == 0x03),
-                (PacketField('IO', IO3(), lambda b: IO3(b, sq=1)), lambda pkt: pkt.VSQ.SQ == 1 and pkt.type == 0x03),
-                (PacketListField('IO', [], IO4, count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.type == 0x04),
-                (PacketListField('IO', [], lambda b: IO5(b, sq=0), count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.VSQ.SQ == 0 and pkt.type == 0x05),
-                (PacketField('IO', IO5(), lambda b: IO5(b, sq=1)), lambda pkt: pkt.VSQ.SQ == 1 and pkt.type == 0x05),
-                (PacketListField('IO', [], IO6, count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.type == 0x06),
-                (PacketListField('IO', [], lambda b: IO7(b, sq=0), count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.VSQ.SQ == 0 and pkt.type == 0x07),
-                (PacketField('IO', IO7(), lambda b: IO7(b, sq=1)), lambda pkt: pkt.VSQ.SQ == 1 and pkt.type == 0x07),
-                (PacketListField('IO', [], IO8, count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.type == 0x08),
-                (PacketListField('IO', [], lambda b: IO9(b, sq=0), count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.VSQ.SQ == 0 and pkt.type == 0x09),
-                (PacketField('IO', IO9(), lambda b: IO9(b, sq=1)), lambda pkt: pkt.VSQ.SQ == 1 and pkt.type == 0x09),
-                (PacketListField('IO', [], IO10, count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.type == 0x0a),
-                (PacketListField('IO', [], lambda b: IO11(b, sq=0), count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.VSQ.SQ == 0 and pkt.type == 0x0b),
-                (PacketField('IO', IO11(), lambda b: IO11(b, sq=1)), lambda pkt: pkt.VSQ.SQ == 1 and pkt.type == 0x0b),
-                (PacketListField('IO', [], IO12, count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.type == 0x0c),
-                (PacketListField('IO', [], lambda b: IO13(b, sq=0), count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.VSQ.SQ == 0 and pkt.type == 0x0d),
-                (PacketField('IO', IO13(), lambda b: IO13(b, sq=1)), lambda pkt: pkt.VSQ.SQ == 1 and pkt.type == 0x0d),
-                (PacketListField('IO', [], IO14, count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.type == 0x0e),
-                (PacketListField('IO', [], lambda b: IO15(b, sq=0), count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.VSQ.SQ == 0 and pkt.type == 0x0f),
-                (PacketField('IO', IO15(), lambda b: IO15(b, sq=1)), lambda pkt: pkt.VSQ.SQ == 1 and pkt.type == 0x0f),
-                (PacketListField('IO', [], IO16, count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.type == 0x10),
-                (PacketListField('IO', [], IO17, count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.type == 0x11),
-                (PacketField('IO', IO18(), IO18), lambda pkt: pkt.type == 0x12),
-                (PacketField('IO', IO19(), IO19), lambda pkt: pkt.type == 0x13),
-                (PacketListField('IO', [], lambda b: IO20(b, sq=0), count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.VSQ.SQ == 0 and pkt.type == 0x14),
-                (PacketField('IO', IO20(), lambda b: IO20(b, sq=1)), lambda pkt: pkt.VSQ.SQ == 1 and pkt.type == 0x14),
-                (PacketListField('IO', [], lambda b: IO21(b, sq=0), count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.VSQ.SQ == 0 and pkt.type == 0x15),
-                (PacketField('IO', IO21(), lambda b: IO21(b, sq=1)), lambda pkt: pkt.VSQ.SQ == 1 and pkt.type == 0x15),
-                (PacketListField('IO', [], lambda b: IO30(b, sq=0), count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.VSQ.SQ == 0 and pkt.type == 0x1e),
-                (PacketListField('IO', [], lambda b: IO31(b, sq=0), count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.VSQ.SQ == 0 and pkt.type == 0x1f),
-                (PacketListField('IO', [], lambda b: IO32(b, sq=0), count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.VSQ.SQ == 0 and pkt.type == 0x20),
-                (PacketListField('IO', [], lambda b: IO33(b, sq=0), count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.VSQ.SQ == 0 and pkt.type == 0x21),
-                (PacketListField('IO', [], lambda b: IO34(b, sq=0), count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.VSQ.SQ == 0 and pkt.type == 0x22),
-                (PacketListField('IO', [], lambda b: IO35(b, sq=0), count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.VSQ.SQ == 0 and pkt.type == 0x23),
-                (PacketListField('IO', [], lambda b: IO36(b, sq=0), count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.VSQ.SQ == 0 and pkt.type == 0x24),
-                (PacketListField('IO', [], lambda b: IO37(b, sq=0), count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.VSQ.SQ == 0 and pkt.type == 0x25),
-                (PacketListField('IO', [], lambda b: IO38(b, sq=0), count_from=lambda pkt: pkt.VSQ.number), lambda pkt: pkt.VSQ.SQ == 0 and pkt.type == 0x26),
-                (PacketField('IO', IO39(), IO39), lambda pkt: pkt.type == 0x27),
-                (PacketField('IO', IO40(), IO40), lambda pkt: pkt.type == 0x28),
-                (PacketField('IO', IO45(), IO45), lambda pkt: pkt.type == 0x2d),
-                (PacketField('IO', IO46(), IO46), lambda pkt: pkt.type == 0x2e),
-                (PacketField('IO', IO47(), IO47), lambda pkt: pkt.type == 0x2f),
-                (PacketField('IO', IO48(), IO48), lambda pkt: pkt.type == 0x30),
-                (PacketField('IO', IO49(), IO49), lambda pkt: pkt.type == 0x31),
-                (PacketField('IO', IO50(), IO50), lambda pkt: pkt.type == 0x32),
-                (PacketField('IO', IO51(), IO51), lambda pkt: pkt.type == 0x33),
-                (PacketField('IO', IO70(), IO70), lambda pkt: pkt.type == 0x46),
-                (PacketField('IO', IO100(), IO100), lambda pkt: pkt.type == 0x64),
-                (PacketField('IO', IO101(), IO101), lambda pkt: pkt.type == 0x65),
-                (PacketField('IO', IO102(), IO102), lambda pkt: pkt.type == 0x66),
-                (PacketField('IO', IO103(), IO103), lambda pkt: pkt.type == 0x67),
-                (PacketField('IO', IO104(), IO104), lambda pkt: pkt.type == 0x68),
-                (PacketField('IO', IO105(), IO105), lambda pkt: pkt.type == 0x69),
-                (PacketField('IO', IO106(), IO106), lambda pkt: pkt.type == 0x6a),
-                (PacketField('IO', IO110(), IO110), lambda pkt: pkt.type == 0x6e),
-                (PacketField('IO', IO111(), IO111), lambda pkt: pkt.type == 0x6f),
-                (PacketField('IO', IO112(), IO112), lambda pkt: pkt.type == 0x70),
-                (PacketField('IO', IO113(), IO113), lambda pkt: pkt.type == 0x71),
-                (PacketField('IO', IO120(), IO120), lambda pkt: pkt.type == 0x78),
-                (PacketField('IO', IO121(), IO121), lambda pkt: pkt.type == 0x79),
-                (PacketField('IO', IO122(), IO122), lambda pkt: pkt.type == 0x7a),
-                (PacketField('IO', IO123(), IO123), lambda pkt: pkt.type == 0x7b),
-                (PacketField('IO', IO124(), IO124), lambda pkt: pkt.type == 0x7c),
-                (PacketField('IO', IO125(), IO125), lambda pkt: pkt.type == 0x7d),
-                (PacketField('IO', IO126(), IO126), lambda pkt: pkt.type == 0x7e),
-            ],
-            XStrField('IO', b'')
-        ),
+        IODispatchField('IO', IO_DISPATCH, XStrField('IO', b'')),
     ]
 
-    def __init__(self, _pkt: bytes = b"", post_transform: Any = None, _internal: int = 0, _underlayer: Optional[Packet] = None, _parent : Optional[Packet] = None, **fields: Any) -> None:
-        self.balanced : bool = _parent.balanced if _parent is not None and 'balanced' in _parent.__slots__ else True
+    def __init__(self, _pkt: bytes = b"", post_transform: Any = None, _internal: int = 0, _underlayer: Optional[Packet] = None, _parent : Optional[Packet] = None, lazy: Optional[bool] = None, balanced: Optional[bool] = None, **fields: Any) -> None:
+        if balanced is None:
+            balanced = _parent.balanced if _parent is not None and 'balanced' in _parent.__slots__ else True
+        self.balanced : bool = balanced
+        self.lazy : bool = LAZY_DISSECTION.get() if lazy is None else lazy
         super().__init__(_pkt, post_transform, _internal, _underlayer, **fields)
 
-class FT12Fixed(Packet):
+    @classmethod
+    def fast_decode(cls, buff: bytes, balanced: bool = True) -> DecodedASDU:
+        decoded = decode_asdu(buff, balanced=balanced)
+        if decoded is None:
+            asdu = cls(bytes(buff), balanced=balanced)
+            decoded = DecodedASDU(asdu.type, asdu.VSQ.SQ, asdu.VSQ.number, int(asdu.COT_flags), asdu.COT, asdu.CommonAddress, asdu.IO)
+        return decoded
+
+    def to_records(self) -> List[Record]:
+        return records_from_decoded(self.fast_decode(bytes(self), self.balanced))
+
+    @classmethod
+    def from_records(cls, records: Iterable[Record], type_id: Optional[int] = None, COT: int = 3, CommonAddress: int = 0, sq: int = 0) -> 'ASDU':
+        records = list(records)
+        if type_id is None:
+            type_id = DEFAULT_TYPES[type(records[0])]
+        return cls(encode_asdu(type_id, records_to_objects(type_id, records), COT, CommonAddress, sq))
+
+    @staticmethod
+    def fast_build(type_id: int, objects: List[Tuple], COT: int = 3, CommonAddress: int = 0, sq: int = 0, COT_flags: int = 0, balanced: bool = True) -> bytes:
+        return encode_asdu(type_id, objects, COT, CommonAddress, sq, balanced, COT_flags)
+
+STRICT_DISSECTION: ContextVar[bool] = ContextVar('STRICT_DISSECTION', default=False)
+
+@contextmanager
+def strict_dissection(enabled: bool = True) -> Iterator[None]:
+    token = STRICT_DISSECTION.set(enabled)
+    try:
+        yield
+    finally:
+        STRICT_DISSECTION.reset(token)
+
+class FT12Checked(Packet):
+    __slots__ = ['strict']
+
+    def __init__(self, _pkt: bytes = b"", post_transform: Any = None, _internal: int = 0, _underlayer: Optional[Packet] = None, _parent : Optional[Packet] = None, strict: Optional[bool] = None, **fields: Any) -> None:
+        self.strict : bool = STRICT_DISSECTION.get() if strict is None else strict
+        super().__init__(_pkt, post_transform, _internal, _underlayer, **fields)
+
+    def pre_dissect(self, s: bytes) -> bytes:
+        if self.strict:
+            ft12_validate(s)
+        return s
+
+class FunctionCodeField(BitEnumField):
+    # Secondary stations (PRM=0) reuse the function code values with other meanings
+    def i2repr(self, pkt: Optional[Packet], x: Any) -> Any:
+        if pkt is not None and not int(pkt.getfieldval('Control_Flags')) & CF_PRM and x in SECONDARY_FUNCTION_CODES:
+            return SECONDARY_FUNCTION_CODES[x]
+        return super().i2repr(pkt, x)
+
+class FT12Fixed(FT12Checked):
     name = 'FT 1.2 Fixed length'
     fields_desc = [
         XByteField('start', 0x10),
         FlagsField('Control_Flags',0x4, 4, CONTROL_FLAGS),
-        BitEnumField('fcode',0x9,4, FUNCTION_CODES),
+        FunctionCodeField('fcode',0x9,4, FUNCTION_CODES),
         XByteField('address',0x00),
-        XByteField('checksum', 0x00),
+        XByteField('checksum', None),
         XByteField('end', 0x16)
     ]
 
-class FT12Variable(Packet):
+    def post_build(self, p: bytes, pay: bytes) -> bytes:
+        if self.checksum is None:
+            p = p[:3] + bytes([ft12_checksum(p[1:3])]) + p[4:]
+        return p + pay
+
+    @staticmethod
+    def fast_build(Control_Flags: int, fcode: int, address: int) -> bytes:
+        return encode_fixed_frame(Control_Flags << 4 | fcode, address)
+
+class FT12Variable(FT12Checked):
     name = 'FT 1.2 Variable Length'
     fields_desc = [
         XByteField('start', 0x68),
-        ByteField('length_1', 0x09),
-        ByteField('length_2', 0x09),
+        ByteField('length_1', None),
+        ByteField('length_2', None),
         XByteField('start2', 0x68),
         FlagsField('Control_Flags',0x4, 4, CONTROL_FLAGS),
-        BitEnumField('fcode',0x9,4, FUNCTION_CODES),
+        FunctionCodeField('fcode',0x9,4, FUNCTION_CODES),
         XByteField('address',0x00),
         PacketLenField('LinkUserData', ASDU(), ASDU, length_from=lambda pkt: pkt.getfieldval('length_1') - 2),
-        XByteField('checksum', 0x00),
+        XByteField('checksum', None),
         XByteField('end', 0x16)
     ]
 
+    def post_build(self, p: bytes, pay: bytes) -> bytes:
+        length = len(p) - 6
+        if self.length_1 is None:
+            p = p[:1] + bytes([length]) + p[2:]
+        if self.length_2 is None:
+            p = p[:2] + bytes([length]) + p[3:]
+        if self.checksum is None:
+            p = p[:-2] + bytes([ft12_checksum(p[4:-2])]) + p[-1:]
+        return p + pay
+
+    @staticmethod
+    def fast_build(Control_Flags: int, fcode: int, address: int, type_id: int, objects: List[Tuple], COT: int = 3, CommonAddress: int = 0,
+                   sq: int = 0, COT_flags: int = 0, balanced: bool = True) -> bytes:
+        buff = bytearray(asdu_size(type_id, len(objects), sq, balanced) + 8)
+        encode_variable_frame_into(buff, 0, Control_Flags << 4 | fcode, address, type_id, objects, COT, CommonAddress, sq, balanced, COT_flags)
+        return bytes(buff)
+
+def pack_frames(updates: Iterable[Any], address: int, CommonAddress: int = 0, COT: int = 3, Control_Flags: int = 0,
+                fcode: int = 0x8, max_asdu_length: int = MAX_ASDU_LENGTH) -> List[FT12Variable]:
+    groups: Dict[Tuple[int, int], List[Tuple]] = {}
+    for update in updates:
+        if isinstance(update, Record):
+            type_id, cot, obj = DEFAULT_TYPES[type(update)], COT, update
+        else:
+            type_id, cot, obj = update
+        groups.setdefault((type_id, cot), []).append(record_to_object(type_id, obj) if isinstance(obj, Record) else tuple(obj))
+    return [
+        FT12Variable(Control_Flags=Control_Flags, fcode=fcode, address=address, LinkUserData=ASDU(asdu))
+        for (type_id, cot), objects in groups.items()
+        for asdu in pack_asdus(type_id, objects, cot, CommonAddress, max_asdu_length)
+    ]
+
 class FT12Single(Packet):
     name = 'FT 1.2 Single character data'
     fields_desc = [
         XByteEnumField('acknowledge', 0xe5, {0xe5: 'positive', 0xa2: 'negative'})
     ]
 
-class FT12Frame(Packet):
+# FT12Frame checks the whole frame itself, because Scapy turns errors raised
+# while dissecting the payload layer into a Raw layer
+class FT12Frame(FT12Checked):
     name = 'FT 1.2 Frame'
 
     def guess_payload_class(self, payload: bytes):
@@ -1543,3 +1477,33 @@ class FT12Frame(Packet):
         if payload[0] == 0x68:
             return FT12Variable
         return self.default_payload_class(payload)
+
+class FT12StreamDecoder:
+    __slots__ = ['buffer', 'pos', 'strict']
+
+    def __init__(self, strict: bool = False) -> None:
+        self.buffer = bytearray()
+        self.pos = 0
+        self.strict = strict
+
+    def feed(self, data: bytes) -> None:
+        if self.pos:
+            del self.buffer[:self.pos]
+            self.pos = 0
+        self.buffer += data
+
+    def __iter__(self) -> Iterator[FT12Frame]:
+        return self
+
+    def __next__(self) -> FT12Frame:
+        start, size = self.next_bounds()
+        with memoryview(self.buffer) as view:
+            return FT12Frame(view[start:start + size].tobytes())
+
+    def next_bounds(self) -> Tuple[int, int]:
+        pos, size = scan_frame(self.buffer, self.pos, len(self.buffer), self.strict)
+        if not size:
+            self.pos = pos
+            raise StopIteration
+        self.pos = pos + size
+        return pos, size
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+import asyncio
+import sys
+from typing import Any, Callable, Dict, Optional, Union
+
+from scapy.packet import Packet
+from iec101 import FT12Frame, FT12StreamDecoder
+
+class IEC101LinkProtocol(asyncio.Protocol):
+    def __init__(self, name: str = '', strict: bool = True) -> None:
+        self.name = name
+        self.decoder = FT12StreamDecoder(strict=strict)
+        self.frames: asyncio.Queue = asyncio.Queue()
+        self.transport: Optional[asyncio.Transport] = None
+        self.timers: Dict[str, asyncio.TimerHandle] = {}
+        self.writable = asyncio.Event()
+        self.writable.set()
+        self.closed = asyncio.get_running_loop().create_future()
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport
+
+    def data_received(self, data: bytes) -> None:
+        self.decoder.feed(data)
+        for frame in self.decoder:
+            self.frames.put_nowait(frame)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        for timer in self.timers.values():
+            timer.cancel()
+        self.timers.clear()
+        self.writable.set()
+        self.frames.put_nowait(None)
+        if not self.closed.done():
+            self.closed.set_result(exc)
+
+    def pause_writing(self) -> None:
+        self.writable.clear()
+
+    def resume_writing(self) -> None:
+        self.writable.set()
+
+    async def send(self, frame: Union[Packet, bytes]) -> None:
+        await self.writable.wait()
+        if self.transport is None or self.transport.is_closing():
+            raise ConnectionError(f'link {self.name} is closed')
+        self.transport.write(bytes(frame))
+
+    async def receive(self, timeout: Optional[float] = None) -> FT12Frame:
+        frame = await asyncio.wait_for(self.frames.get(), timeout)
+        if frame is None:
+            self.frames.put_nowait(None)
+            raise ConnectionError(f'link {self.name} is closed')
+        return frame
+
+    async def request(self, frame: Union[Packet, bytes], timeout: float) -> FT12Frame:
+        while not self.frames.empty():
+            if self.frames.get_nowait() is None:
+                self.frames.put_nowait(None)
+                raise ConnectionError(f'link {self.name} is closed')
+        await self.send(frame)
+        return await self.receive(timeout)
+
+    def start_timer(self, name: str, delay: float, callback: Callable[..., Any], *args: Any) -> None:
+        self.cancel_timer(name)
+        self.timers[name] = asyncio.get_running_loop().call_later(delay, self._expire, name, callback, args)
+
+    def cancel_timer(self, name: str) -> None:
+        timer = self.timers.pop(name, None)
+        if timer is not None:
+            timer.cancel()
+
+    def _expire(self, name: str, callback: Callable[..., Any], args: tuple) -> None:
+        self.timers.pop(name, None)
+        callback(*args)
+
+    def close(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
+
+async def open_serial_link(port: str, baudrate: int = 9600, strict: bool = True, **kwargs: Any) -> IEC101LinkProtocol:
+    import serial_asyncio
+    loop = asyncio.get_running_loop()
+    transport, protocol = await serial_asyncio.create_serial_connection(loop, lambda: IEC101LinkProtocol(port, strict), port, baudrate=baudrate, **kwargs)
+    protocol.transport = transport
+    return protocol
+
+async def open_tcp_link(host: str, port: int, strict: bool = True) -> IEC101LinkProtocol:
+    loop = asyncio.get_running_loop()
+    _, protocol = await loop.create_connection(lambda: IEC101LinkProtocol(f'{host}:{port:d}', strict), host, port)
+    return protocol
+
+async def open_pty_link(strict: bool = True) -> IEC101LinkProtocol:
+    import os
+    import tty
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    name = os.ttyname(slave)
+    loop = asyncio.get_running_loop()
+    protocol = IEC101LinkProtocol(name, strict)
+    await loop.connect_read_pipe(lambda: protocol, os.fdopen(master, 'rb', buffering=0))
+    # The write pipe reports pause_writing/resume_writing to the link protocol so send() waits for the pty to drain
+    await loop.connect_write_pipe(lambda: protocol, os.fdopen(os.dup(master), 'wb', buffering=0))
+    return protocol
+
+async def open_link(url: str, baudrate: int = 9600, strict: bool = True) -> IEC101LinkProtocol:
+    if url == 'pty':
+        return await open_pty_link(strict)
+    if url.startswith('tcp://'):
+        host, _, port = url[len('tcp://'):].rpartition(':')
+        return await open_tcp_link(host, int(port), strict)
+    return await open_serial_link(url, baudrate, strict)
+
+async def monitor(link: IEC101LinkProtocol) -> None:
+    while True:
+        try:
+            frame = await link.receive()
+        except ConnectionError:
+            break
+        print(f'{link.name}: {frame!r}')
+
+async def amain(urls: list) -> None:
+    links = await asyncio.gather(*(open_link(url) for url in urls))
+    await asyncio.gather(*(monitor(link) for link in links))
+
+if __name__ == '__main__':
+    asyncio.run(amain(sys.argv[1:] or ['/dev/ttyS0']))
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+import argparse
+from datetime import datetime, timezone
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from iec101_codec import TYPE_LAYOUTS, DecodedASDU, LinkProfile, cp24_to_datetime, cp56_to_datetime
+
+SCHEMA = pa.schema([
+    ('timestamp', pa.timestamp('us', tz='UTC')),
+    ('link_address', pa.uint16()),
+    ('CommonAddress', pa.uint16()),
+    ('type', pa.uint8()),
+    ('COT', pa.uint8()),
+    ('IOA', pa.uint32()),
+    ('value', pa.float64()),
+    ('quality', pa.uint8()),
+    ('invalid', pa.bool_()),
+    ('time_tag', pa.timestamp('ms')),
+])
+
+# Rows are converted to Arrow in chunks, so max_bytes is measured on the typed columns; the first chunk is small to
+# measure the row size the later chunks are sized by
+FIRST_CHUNK_ROWS = 256
+CHUNK_ROWS = 4096
+
+QUALITY_FIELDS = ('QDS', 'flags', 'QDP')
+
+# Process information in monitor direction (types 1-40); every other type is a command, parameter or system ASDU
+POINT_TYPES = frozenset(type_id for type_id in TYPE_LAYOUTS if type_id <= 0x28)
+
+def _value(name: str, raw: Any) -> Tuple[float, Optional[int]]:
+    if name == 'SIQ':
+        return raw & 0x01, raw & 0xf0
+    if name == 'DIQ':
+        return raw & 0x03, raw & 0xf0
+    if name == 'SEP':
+        return raw & 0x03, raw & 0xf8
+    if name == 'VTI':
+        return (raw & 0x7f) - (raw & 0x40) * 2, None
+    return raw, None
+
+def _time_tag(tag: bytes, reference: Optional[datetime]) -> Optional[datetime]:
+    try:
+        if len(tag) == 7:
+            return cp56_to_datetime(tag)
+        if reference is not None:
+            return cp24_to_datetime(tag, reference)
+    except ValueError:
+        pass
+    return None
+
+def point_rows(decoded: DecodedASDU, timestamp: Optional[float] = None, address: Optional[int] = None) -> Iterator[Tuple]:
+    if decoded.type not in POINT_TYPES or not isinstance(decoded.IO, list):
+        return
+    fields = TYPE_LAYOUTS[decoded.type][1]
+    names = [name for name, _ in fields]
+    quality_index = next((names.index(name) + 1 for name in QUALITY_FIELDS if name in names), None)
+    time_index = names.index('time') + 1 if 'time' in names else None
+    captured = None if timestamp is None else datetime.fromtimestamp(timestamp, timezone.utc)
+    reference = None if captured is None else captured.replace(tzinfo=None)
+    for obj in decoded.IO:
+        if not isinstance(obj, tuple):
+            continue
+        value, quality = _value(names[0], obj[1])
+        if quality is None:
+            quality = obj[quality_index] if quality_index is not None else 0
+        time_tag = _time_tag(obj[time_index], reference) if time_index is not None else None
+        yield (captured, address, decoded.CommonAddress, decoded.type, decoded.COT, obj[0],
+               value, quality, bool(quality & 0x80), time_tag)
+
+def _batch(rows: List[Tuple]) -> pa.RecordBatch:
+    columns = list(zip(*rows)) if rows else [[] for _ in SCHEMA]
+    return pa.RecordBatch.from_arrays([pa.array(column, type=fld.type) for column, fld in zip(columns, SCHEMA)], schema=SCHEMA)
+
+class PointBatcher:
+    def __init__(self, batch_size: int = 65536, max_bytes: int = 64 << 20) -> None:
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self.rows: List[Tuple] = []
+        self.chunks: List[pa.RecordBatch] = []
+        self.chunk_rows = 0
+        self.chunk_bytes = 0
+        self.row_bytes = 0.0
+        self.limit = min(FIRST_CHUNK_ROWS, batch_size)
+
+    def __len__(self) -> int:
+        return self.chunk_rows + len(self.rows)
+
+    def add(self, decoded: DecodedASDU, timestamp: Optional[float] = None, address: Optional[int] = None) -> Iterator[pa.RecordBatch]:
+        for row in point_rows(decoded, timestamp, address):
+            self.rows.append(row)
+            if len(self.rows) >= self.limit:
+                self.seal()
+                if self.chunk_rows >= self.batch_size or self.chunk_bytes >= self.max_bytes:
+                    yield self.flush()
+
+    def seal(self) -> None:
+        if self.rows:
+            chunk = _batch(self.rows)
+            self.rows = []
+            self.chunks.append(chunk)
+            self.chunk_rows += chunk.num_rows
+            self.chunk_bytes += chunk.nbytes
+            self.row_bytes = chunk.nbytes / chunk.num_rows
+        self.resize()
+
+    def resize(self) -> None:
+        rows = min(CHUNK_ROWS, self.batch_size - self.chunk_rows)
+        if self.row_bytes:
+            rows = min(rows, int((self.max_bytes - self.chunk_bytes) / self.row_bytes))
+        self.limit = max(1, rows)
+
+    def flush(self) -> pa.RecordBatch:
+        self.seal()
+        chunks = self.chunks
+        self.chunks = []
+        self.chunk_rows = self.chunk_bytes = 0
+        self.resize()
+        if len(chunks) == 1:
+            return chunks[0]
+        if not chunks:
+            return _batch([])
+        return pa.Table.from_batches(chunks, schema=SCHEMA).combine_chunks().to_batches()[0]
+
+def point_batches(frames: Iterable[Any], batch_size: int = 65536, max_bytes: int = 64 << 20) -> Iterator[pa.RecordBatch]:
+    batcher = PointBatcher(batch_size, max_bytes)
+    for frame in frames:
+        if frame.asdu is not None:
+            yield from batcher.add(frame.asdu, frame.time, frame.address)
+    if len(batcher):
+        yield batcher.flush()
+
+def write_parquet(path: str, frames: Iterable[Any], batch_size: int = 65536, max_bytes: int = 64 << 20,
+                  compression: str = 'zstd') -> int:
+    rows = 0
+    with pq.ParquetWriter(path, SCHEMA, compression=compression) as writer:
+        for batch in point_batches(frames, batch_size, max_bytes):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+def main() -> None:
+    from iec101_ingest import ingest, read_capture
+    parser = argparse.ArgumentParser(description='Export decoded IEC 60870-5-101 points to Parquet')
+    parser.add_argument('output')
+    parser.add_argument('captures', nargs='+')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=65536)
+    parser.add_argument('--max-bytes', type=int, default=64 << 20)
+    parser.add_argument('--unbalanced', action='store_true')
+    parser.add_argument('--profile', type=LinkProfile.parse, help="field widths, e.g. 'address=2,cot=2,ca=2,ioa=3'")
+    args = parser.parse_args()
+
+    def frames() -> Iterator[Any]:
+        for path in args.captures:
+            yield from ingest(read_capture(path, profile=args.profile), workers=args.workers, balanced=not args.unbalanced, profile=args.profile)
+
+    print(f'{write_parquet(args.output, frames(), args.batch_size, args.max_bytes):d} points written to {args.output}')
+
+if __name__ == '__main__':
+    main()
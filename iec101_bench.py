@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import scapy
+
+from iec101 import (
+    ASDU, IO_CLASSES, IO_SINGLE_TYPES, TYPEID_ASDU, VSQ, FT12Frame, io_types, lazy_dissection
+)
+from iec101_codec import (
+    IOA_CODES, IOA_WIDTH_OVERRIDES, LIST_TYPES, SEQUENCE_TYPES, SQ0_LIST_TYPES, TYPE_LAYOUTS, asdu_size, datetime_to_cp24, datetime_to_cp56,
+    decode_asdu, encode_asdu, encode_variable_frame, encode_variable_frame_into
+)
+
+OBJECTS_PER_FRAME = 8
+
+def _field_value(code: str, rng: random.Random) -> Any:
+    if code == 'B':
+        return rng.randrange(0x100)
+    if code in ('<H', '>H'):
+        return rng.randrange(0x10000)
+    if code == '<h':
+        return rng.randrange(-0x8000, 0x8000)
+    if code == '<e':
+        return float(rng.randrange(-0x400, 0x400)) / 0x400
+    if code == '>f':
+        return float(rng.randrange(-0x1000000, 0x1000000)) / 0x100
+    if code == '<i':
+        return rng.randrange(-0x80000000, 0x80000000)
+    if code == '>I':
+        return rng.randrange(0x100000000)
+    if code == '<T':
+        return rng.randrange(0x1000000)
+    moment = datetime(2000, 1, 1) + timedelta(milliseconds=rng.randrange(100 * 365 * 86400000))
+    if code == '3s':
+        return datetime_to_cp24(moment, bool(rng.randrange(2)))
+    return datetime_to_cp56(moment, invalid=bool(rng.randrange(2)), summer_time=bool(rng.randrange(2)))
+
+def object_count(type_id: int) -> int:
+    return OBJECTS_PER_FRAME if type_id in SEQUENCE_TYPES or type_id in LIST_TYPES or type_id in SQ0_LIST_TYPES else 1
+
+def sample_objects(type_id: int, count: int, sq: int = 0, balanced: bool = True, rng: Optional[random.Random] = None) -> List[Tuple]:
+    rng = rng or random.Random()
+    ioa_width = IOA_WIDTH_OVERRIDES.get(type_id, 2 if balanced else 3)
+    ioa_code = IOA_CODES[ioa_width]
+    codes = [code for _, code in TYPE_LAYOUTS[type_id][1]]
+    base = _field_value(ioa_code, rng) % ((1 << 8 * ioa_width) - count)
+    return [
+        (base + index if sq else _field_value(ioa_code, rng),) + tuple(_field_value(code, rng) for code in codes)
+        for index in range(count)
+    ]
+
+def sample_frame(type_id: int, sq: int = 0, balanced: bool = True, rng: Optional[random.Random] = None) -> Tuple[bytes, Optional[List[Tuple]]]:
+    if type_id in TYPE_LAYOUTS:
+        objects = sample_objects(type_id, object_count(type_id), sq, balanced, rng)
+        return encode_variable_frame(0x08, 1, encode_asdu(type_id, objects, 3, 1, sq, balanced)), objects
+    cls = IO_CLASSES[type_id]
+    io = cls() if type_id in IO_SINGLE_TYPES else [cls()]
+    asdu = ASDU(type=type_id, VSQ=VSQ(number=1), COT=3, CommonAddress=1, IO=io)
+    return encode_variable_frame(0x08, 1, bytes(asdu)), None
+
+def cases(types: Optional[List[int]] = None) -> Iterator[Tuple[int, int, bool]]:
+    for type_id in types or io_types():
+        for balanced in (True, False):
+            for sq in ((0, 1) if type_id in SEQUENCE_TYPES else (0,)):
+                yield type_id, sq, balanced
+
+def engines(type_id: int, sq: int, balanced: bool, frame: bytes, objects: Optional[List[Tuple]]) -> Dict[Tuple[str, str], Callable[[], Any]]:
+    found: Dict[Tuple[str, str], Callable[[], Any]] = {}
+    if balanced:
+        def scapy_decode() -> Any:
+            return FT12Frame(frame)
+
+        def scapy_lazy_decode() -> Any:
+            with lazy_dissection():
+                asdu = FT12Frame(frame).payload.LinkUserData
+            return asdu.COT, asdu.CommonAddress
+
+        template = FT12Frame(frame)
+
+        def scapy_encode() -> bytes:
+            template.clear_cache()
+            return bytes(template)
+
+        found[('scapy', 'decode')] = scapy_decode
+        found[('scapy_lazy', 'decode')] = scapy_lazy_decode
+        found[('scapy', 'encode')] = scapy_encode
+    if objects is not None:
+        buff = bytearray(asdu_size(type_id, len(objects), sq, balanced) + 8)
+        found[('codec', 'decode')] = lambda: decode_asdu(frame, 6, balanced, len(frame) - 2)
+        found[('codec', 'encode')] = lambda: encode_variable_frame_into(buff, 0, 0x08, 1, type_id, objects, 3, 1, sq, balanced)
+        try:
+            from iec101_numpy import SEQUENCE_DTYPES, decode_sequence
+        except ImportError:
+            SEQUENCE_DTYPES = {}
+        if sq and type_id in SEQUENCE_DTYPES:
+            found[('numpy', 'decode')] = lambda: decode_sequence(frame, 6, balanced, len(frame) - 2)
+    return found
+
+def throughput(fn: Callable[[], Any], duration: float) -> float:
+    count = 0
+    batch = 1
+    start = perf_counter()
+    while True:
+        for _ in range(batch):
+            fn()
+        count += batch
+        elapsed = perf_counter() - start
+        if elapsed >= duration:
+            return count / elapsed
+        batch *= 2
+
+def allocations(fn: Callable[[], Any]) -> Tuple[int, int]:
+    tracemalloc.start()
+    try:
+        fn()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        result = fn()
+        peak = tracemalloc.get_traced_memory()[1] - base
+        after = tracemalloc.take_snapshot()
+        blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+        del result
+        return peak, blocks
+    finally:
+        tracemalloc.stop()
+
+def run(types: Optional[List[int]] = None, duration: float = 0.2, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    results = []
+    for type_id, sq, balanced in cases(types):
+        frame, objects = sample_frame(type_id, sq, balanced, rng)
+        for (engine, op), fn in engines(type_id, sq, balanced, frame, objects).items():
+            result: Dict[str, Any] = {
+                'type': type_id, 'name': TYPEID_ASDU[type_id], 'sq': sq, 'balanced': balanced,
+                'objects': len(objects) if objects is not None else 1, 'frame_bytes': len(frame), 'engine': engine, 'op': op,
+            }
+            try:
+                result['frames_per_s'] = throughput(fn, duration)
+                result['peak_bytes'], result['retained_blocks'] = allocations(fn)
+            except Exception as exc:
+                result['error'] = f'{type(exc).__name__}: {exc}'
+            results.append(result)
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'scapy': scapy.VERSION,
+            'duration': duration,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+def result_key(result: Dict[str, Any]) -> Tuple:
+    return result['type'], result['sq'], result['balanced'], result['engine'], result['op']
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    previous = {result_key(result): result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        old = previous.get(result_key(result))
+        if old is None or 'frames_per_s' not in old or 'frames_per_s' not in result:
+            continue
+        ratio = result['frames_per_s'] / old['frames_per_s']
+        if ratio < 1 - tolerance:
+            regressions.append(f'{result["name"]} sq={result["sq"]:d} balanced={result["balanced"]} {result["engine"]} {result["op"]}: '
+                               f'{old["frames_per_s"]:.0f} -> {result["frames_per_s"]:.0f} frames/s ({ratio:.2f}x)')
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark IEC 60870-5-101 decode and encode paths')
+    parser.add_argument('-o', '--output', default='iec101_bench.json')
+    parser.add_argument('--types', type=lambda text: [int(part, 0) for part in text.split(',')], help='comma separated type ids')
+    parser.add_argument('--duration', type=float, default=0.2, help='seconds per case')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', help='earlier results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed throughput drop before flagging a regression')
+    args = parser.parse_args()
+    current = run(args.types, args.duration, args.seed)
+    with open(args.output, 'w') as outfile:
+        json.dump(current, outfile, indent=1)
+    for result in current['results']:
+        rate = f'{result["frames_per_s"]:12.0f} frames/s' if 'frames_per_s' in result else result['error']
+        print(f'{result["name"]:<16} sq={result["sq"]:d} {"bal" if result["balanced"] else "unb"} {result["engine"]:<10} {result["op"]:<6} {rate}')
+    if args.baseline:
+        with open(args.baseline) as infile:
+            regressions = compare(current, json.load(infile), args.tolerance)
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        sys.exit(1 if regressions else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+import mmap
+import os
+import sys
+import threading
+from collections import namedtuple
+from struct import Struct
+from time import monotonic, time_ns
+from typing import BinaryIO, Iterator, Optional, Union
+
+CAPTURE_MAGIC = b'I101CAP1'
+CAPTURE_RECORD = Struct('<HqBB')
+
+DIR_RX = 0
+DIR_TX = 1
+
+DIRECTIONS = {
+    DIR_RX: 'Received',
+    DIR_TX: 'Sent',
+}
+
+CaptureRecord = namedtuple('CaptureRecord', ['timestamp_ns', 'direction', 'port', 'frame'])
+
+class CaptureWriter:
+    def __init__(self, target: Union[str, BinaryIO], flush_bytes: int = 65536, flush_interval: float = 1.0) -> None:
+        if isinstance(target, str):
+            exists = os.path.exists(target) and os.path.getsize(target) > 0
+            self.file = open(target, 'ab')
+            self.owned = True
+        else:
+            exists = False
+            self.file = target
+            self.owned = False
+        self.buffer = bytearray() if exists else bytearray(CAPTURE_MAGIC)
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.flushed = monotonic()
+        self.lock = threading.Lock()
+        self.timer: Optional[threading.Timer] = None
+        self.closed = False
+
+    def write(self, frame: bytes, direction: int = DIR_RX, port: int = 0, timestamp_ns: Optional[int] = None) -> None:
+        frame = bytes(frame)
+        with self.lock:
+            self.buffer += CAPTURE_RECORD.pack(len(frame), time_ns() if timestamp_ns is None else timestamp_ns, direction, port)
+            self.buffer += frame
+            if len(self.buffer) >= self.flush_bytes or monotonic() - self.flushed >= self.flush_interval:
+                self._flush()
+            elif self.timer is None:
+                # Frames written just before the traffic stops are flushed by the timer, not by a later write
+                self.timer = threading.Timer(self.flush_interval, self._expire)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def _flush(self) -> None:
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+        self.file.flush()
+        self.flushed = monotonic()
+
+    def _expire(self) -> None:
+        with self.lock:
+            self.timer = None
+            if not self.closed and self.buffer:
+                self._flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            self._flush()
+
+    def close(self) -> None:
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            self._flush()
+            if self.owned:
+                self.file.close()
+
+    def __enter__(self) -> 'CaptureWriter':
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+class CaptureReader:
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def __iter__(self) -> Iterator[CaptureRecord]:
+        with open(self.path, 'rb') as capfile:
+            if not os.fstat(capfile.fileno()).st_size:
+                return
+            with mmap.mmap(capfile.fileno(), 0, access=mmap.ACCESS_READ) as buff:
+                if buff[:len(CAPTURE_MAGIC)] != CAPTURE_MAGIC:
+                    raise ValueError(f'{self.path}: not an IEC 101 capture')
+                pos = len(CAPTURE_MAGIC)
+                end = len(buff)
+                while pos + CAPTURE_RECORD.size <= end:
+                    length, timestamp_ns, direction, port = CAPTURE_RECORD.unpack_from(buff, pos)
+                    pos += CAPTURE_RECORD.size
+                    if pos + length > end:
+                        return
+                    yield CaptureRecord(timestamp_ns, direction, port, buff[pos:pos + length])
+                    pos += length
+
+def render(path: str, out=sys.stdout) -> None:
+    from iec101 import FT12Frame
+    for record in CaptureReader(path):
+        direction = DIRECTIONS.get(record.direction, f'dir {record.direction:d}')
+        out.write(f'{record.timestamp_ns / 1e9:0.6f} port {record.port:d} {direction}: {record.frame!r}\n')
+        out.write(FT12Frame(record.frame).show2(dump=True))
+
+if __name__ == '__main__':
+    for path in sys.argv[1:]:
+        render(path)
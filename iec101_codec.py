@@ -0,0 +1,711 @@
+#!/usr/bin/env python3
+
+import re
+import struct
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from iec101_constants import (
+    AFQ_ENUM_A, AFQ_ENUM_B, BCR_FLAGS, COI_ENUM, DC_ENUM, DIQ_FLAGS, DPI_ENUM, ES_ENUM, FRQ_ENUM, FRZ_ENUM, KPA_ENUM, LPCPOP_FLAGS, LSQ_ENUM,
+    OCI_FLAGS, QDP_FLAGS, QDS_FLAGS, QOI_ENUM, QPA_ENUM, QRP_ENUM, RCS_ENUM, RQT_ENUM, SC_ENUM, SCQ_ENUM_A, SCQ_ENUM_B, SE_ENUM, SEP_FLAGS,
+    SIQ_FLAGS, SPE_FLAGS, SRQ_ENUM
+)
+
+CP24 = '3s'
+CP56 = '7s'
+
+IOA_CODES = {
+    1: 'B',
+    2: '<H',
+    3: '<T',
+}
+
+TYPE_LAYOUTS = {
+    0x01: ('M_SP_NA_1', [('SIQ', 'B')]),
+    0x02: ('M_SP_TA_1', [('SIQ', 'B'), ('time', CP24)]),
+    0x03: ('M_DP_NA_1', [('DIQ', 'B')]),
+    0x04: ('M_DP_TA_1', [('DIQ', 'B'), ('time', CP24)]),
+    0x05: ('M_ST_NA_1', [('VTI', 'B'), ('QDS', 'B')]),
+    0x06: ('M_ST_TA_1', [('VTI', 'B'), ('QDS', 'B'), ('time', CP24)]),
+    0x07: ('M_BO_NA_1', [('BSI', '>I'), ('QDS', 'B')]),
+    0x08: ('M_BO_TA_1', [('BSI', '>I'), ('QDS', 'B'), ('time', CP24)]),
+    0x09: ('M_ME_NA_1', [('NVA', '<e'), ('QDS', 'B')]),
+    0x0A: ('M_ME_TA_1', [('NVA', '<e'), ('QDS', 'B'), ('time', CP24)]),
+    0x0B: ('M_ME_NB_1', [('SVA', '<h'), ('QDS', 'B')]),
+    0x0C: ('M_ME_TB_1', [('SVA', '<h'), ('QDS', 'B'), ('time', CP24)]),
+    0x0D: ('M_ME_NC_1', [('value', '>f'), ('QDS', 'B')]),
+    0x0E: ('M_ME_TC_1', [('value', '>f'), ('QDS', 'B'), ('time', CP24)]),
+    0x0F: ('M_IT_NA_1', [('value', '<i'), ('flags', 'B')]),
+    0x10: ('M_IT_TA_1', [('value', '<i'), ('flags', 'B'), ('time', CP24)]),
+    0x11: ('M_EP_TA_1', [('SEP', 'B'), ('elapsed_time', '<H'), ('time', CP24)]),
+    0x12: ('M_EP_TB_1', [('SPE', 'B'), ('QDP', 'B'), ('relay_duration', '<H'), ('time', CP24)]),
+    0x13: ('M_EP_TC_1', [('OCI', 'B'), ('QDP', 'B'), ('relay_time', '<H'), ('time', CP24)]),
+    0x14: ('M_PS_NA_1', [('status', '>H'), ('change', '>H'), ('QDS', 'B')]),
+    0x15: ('M_ME_ND_1', [('NVA', '<e')]),
+    0x1E: ('M_SP_TB_1', [('SIQ', 'B'), ('time', CP56)]),
+    0x1F: ('M_DP_TB_1', [('DIQ', 'B'), ('time', CP56)]),
+    0x20: ('M_ST_TB_1', [('VTI', 'B'), ('QDS', 'B'), ('time', CP56)]),
+    0x22: ('M_ME_TD_1', [('NVA', '<e'), ('QDS', 'B'), ('time', CP56)]),
+    0x23: ('M_ME_TE_1', [('SVA', '<h'), ('QDS', 'B'), ('time', CP56)]),
+    0x24: ('M_ME_TF_1', [('value', '>f'), ('QDS', 'B'), ('time', CP56)]),
+    0x25: ('M_IT_TB_1', [('value', '<i'), ('flags', 'B'), ('time', CP56)]),
+    0x26: ('M_EP_TD_1', [('SEP', 'B'), ('elapsed_time', '<H'), ('time', CP56)]),
+    0x27: ('M_EP_TE_1', [('SPE', 'B'), ('QDP', 'B'), ('relay_duration', '<H'), ('time', CP56)]),
+    0x28: ('M_EP_TF_1', [('OCI', 'B'), ('QDP', 'B'), ('relay_time', '<H'), ('time', CP56)]),
+    0x2D: ('C_SC_NA_1', [('SCO', 'B')]),
+    0x2E: ('C_DC_NA_1', [('DCO', 'B')]),
+    0x2F: ('C_RC_NA_1', [('RCO', 'B')]),
+    0x30: ('C_SE_NA_1', [('NVA', '<e'), ('QOS', 'B')]),
+    0x31: ('C_SE_NB_1', [('SVA', '<h'), ('QOS', 'B')]),
+    0x32: ('C_SE_NC_1', [('value', '>f'), ('QOS', 'B')]),
+    0x33: ('C_BO_NA_1', [('BSI', '>I')]),
+    0x46: ('M_EI_NA_1', [('COI', 'B')]),
+    0x64: ('C_IC_NA_1', [('QOI', 'B')]),
+    0x65: ('C_CI_NA_1', [('QCC', 'B')]),
+    0x66: ('C_RD_NA_1', []),
+    0x67: ('C_CS_NA_1', [('time', CP56)]),
+    0x68: ('C_TS_NA_1', [('FBP', '<H')]),
+    0x69: ('C_RP_NA_1', [('QRP', 'B')]),
+    0x6A: ('C_CD_NA_1', [('delay_ms', '<H')]),
+    0x6E: ('P_ME_NA_1', [('NVA', '<e'), ('QPM', 'B')]),
+    0x6F: ('P_ME_NB_1', [('SVA', '<h'), ('QPM', 'B')]),
+    0x70: ('P_ME_NC_1', [('value', '>f'), ('QPM', 'B')]),
+    0x71: ('P_AC_NA_1', [('QPA', 'B')]),
+    0x78: ('F_FR_NA_1', [('NOF', '<H'), ('LOF', '<T'), ('FRQ', 'B')]),
+    0x79: ('F_SR_NA_1', [('NOF', '<H'), ('NOS', 'B'), ('LOF', '<T'), ('SRQ', 'B')]),
+    0x7A: ('F_SC_NA_1', [('NOF', '<H'), ('NOS', 'B'), ('SCQ', 'B')]),
+    0x7B: ('F_LS_NA_1', [('NOF', '<H'), ('NOS', 'B'), ('LSQ', 'B'), ('CHS', 'B')]),
+    0x7C: ('F_AF_NA_1', [('NOF', '<H'), ('NOS', 'B'), ('AFQ', 'B')]),
+}
+
+# Number of information objects per ASDU follows the Scapy ASDU definition:
+# SEQUENCE_TYPES honour VSQ.SQ, LIST_TYPES always carry VSQ.number objects,
+# SQ0_LIST_TYPES only decode with SQ=0 and every other type carries one object.
+SEQUENCE_TYPES = frozenset({0x01, 0x03, 0x05, 0x07, 0x09, 0x0B, 0x0D, 0x0F, 0x14, 0x15})
+LIST_TYPES = frozenset({0x02, 0x04, 0x06, 0x08, 0x0A, 0x0C, 0x0E, 0x10, 0x11})
+SQ0_LIST_TYPES = frozenset({0x1E, 0x1F, 0x20, 0x22, 0x23, 0x24, 0x25, 0x26})
+
+IOA_WIDTH_OVERRIDES = {
+    0x66: 2,
+}
+
+class RecordTable(dict):
+    # Record classes are created on first use and published as module attributes so they pickle
+    def __missing__(self, type_id: int) -> Any:
+        name, fields = TYPE_LAYOUTS[type_id]
+        record = self[type_id] = globals()[name] = namedtuple(name, ['IOA'] + [fname for fname, _ in fields])
+        return record
+
+RECORDS = RecordTable()
+
+RECORD_NAMES = {name: type_id for type_id, (name, _) in TYPE_LAYOUTS.items()}
+
+def __getattr__(name: str) -> Any:
+    if name in RECORD_NAMES:
+        return RECORDS[RECORD_NAMES[name]]
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+SubField = namedtuple('SubField', ['name', 'width', 'enum', 'flags'])
+
+# Octet fields split the same way as the Scapy IO classes dissect them, most significant bits first
+SUBFIELDS = {
+    'SIQ': [SubField('SIQ', 8, None, SIQ_FLAGS)],
+    'DIQ': [SubField('quality', 6, None, DIQ_FLAGS), SubField('DPI', 2, DPI_ENUM, None)],
+    'VTI': [SubField('transient', 1, None, None), SubField('value', 7, None, None)],
+    'QDS': [SubField('QDS', 8, None, QDS_FLAGS)],
+    'flags': [SubField('flags', 3, None, BCR_FLAGS), SubField('sequence', 5, None, None)],
+    'SEP': [SubField('flags', 5, None, SEP_FLAGS), SubField('reserved', 1, None, None), SubField('event_state', 2, ES_ENUM, None)],
+    'SPE': [SubField('SPE', 8, None, SPE_FLAGS)],
+    'QDP': [SubField('QDP', 8, None, QDP_FLAGS)],
+    'OCI': [SubField('OCI', 8, None, OCI_FLAGS)],
+    'SCO': [SubField('SE', 1, SE_ENUM, None), SubField('QU', 5, None, None), SubField('reserved', 1, None, None), SubField('SCS', 1, SC_ENUM, None)],
+    'DCO': [SubField('SE', 1, SE_ENUM, None), SubField('QU', 5, None, None), SubField('DCS', 2, DC_ENUM, None)],
+    'RCO': [SubField('SE', 1, SE_ENUM, None), SubField('QU', 5, None, None), SubField('RCS', 2, RCS_ENUM, None)],
+    'QOS': [SubField('SE', 1, SE_ENUM, None), SubField('QL', 7, None, None)],
+    'COI': [SubField('after_change', 1, None, None), SubField('COI', 7, COI_ENUM, None)],
+    'QOI': [SubField('QOI', 8, QOI_ENUM, None)],
+    'QCC': [SubField('FRZ', 2, FRZ_ENUM, None), SubField('RQT', 6, RQT_ENUM, None)],
+    'QRP': [SubField('QRP', 8, QRP_ENUM, None)],
+    'QPM': [SubField('parameter', 2, None, LPCPOP_FLAGS), SubField('KPA', 6, KPA_ENUM, None)],
+    'QPA': [SubField('QPA', 8, QPA_ENUM, None)],
+    'FRQ': [SubField('PN', 1, None, None), SubField('qualifier', 7, FRQ_ENUM, None)],
+    'SRQ': [SubField('ready', 1, None, None), SubField('qualifier', 7, SRQ_ENUM, None)],
+    'SCQ': [SubField('error', 4, SCQ_ENUM_B, None), SubField('qualifier', 4, SCQ_ENUM_A, None)],
+    'LSQ': [SubField('LSQ', 8, LSQ_ENUM, None)],
+    'AFQ': [SubField('error', 4, AFQ_ENUM_B, None), SubField('qualifier', 4, AFQ_ENUM_A, None)],
+}
+
+def split_field(name: str, value: int) -> Dict[str, int]:
+    parts = {}
+    shift = 8
+    for sub in SUBFIELDS[name]:
+        shift -= sub.width
+        parts[sub.name] = value >> shift & ((1 << sub.width) - 1)
+    return parts
+
+def subfield_repr(sub: SubField, value: int) -> Any:
+    if sub.flags is not None:
+        return '+'.join(name for bit, name in sorted(sub.flags.items()) if value >> bit & 1)
+    if sub.enum is not None:
+        return sub.enum.get(value, value)
+    return value
+
+def describe(record: Tuple) -> Dict[str, Any]:
+    described: Dict[str, Any] = {}
+    for name, value in zip(record._fields, record):
+        subs = SUBFIELDS.get(name)
+        if subs is None:
+            described[name] = value
+            continue
+        for sub, part in zip(subs, split_field(name, value).values()):
+            described[sub.name] = subfield_repr(sub, part)
+    return described
+
+ASDU_HEADER = struct.Struct('<BBBB')
+
+DecodedASDU = namedtuple('DecodedASDU', ['type', 'SQ', 'number', 'COT_flags', 'COT', 'CommonAddress', 'IO', 'originator'], defaults=(0,))
+
+class ASDUError(ValueError):
+    pass
+
+class Layout:
+    __slots__ = ['size', 'unpack_from', 'pack_into']
+
+    def __init__(self, codes: List[str]) -> None:
+        segments = []
+        merges = []
+        fmt = ''
+        order = '<'
+        start = offset = index = first = 0
+        for code in codes:
+            code_order, body = (code[0], code[1:]) if code[0] in '<>' else (None, code)
+            if code_order is not None and code_order != order:
+                if fmt:
+                    segments.append((start, struct.Struct(order + fmt), first, index))
+                fmt, order, start, first = '', code_order, offset, index
+            if body == 'T':
+                merges.append(index)
+                body = 'HB'
+                index += 1
+            fmt += body
+            offset += struct.calcsize('<' + body)
+            index += 1
+        if fmt or not segments:
+            segments.append((start, struct.Struct(order + fmt), first, index))
+        self.size = offset
+        self.unpack_from = self._compile_unpack(segments, merges)
+        self.pack_into = self._compile_pack(segments, merges)
+
+    @staticmethod
+    def _compile_unpack(segments: List[Tuple[int, struct.Struct, int, int]], merges: List[int]) -> Callable[[Any, int], Tuple]:
+        if len(segments) == 1 and not merges:
+            return segments[0][1].unpack_from
+
+        def unpack_from(buff: Any, offset: int = 0) -> Tuple:
+            values = []
+            for start, layout, _, _ in segments:
+                values.extend(layout.unpack_from(buff, offset + start))
+            for index in reversed(merges):
+                values[index:index + 2] = [values[index] | values[index + 1] << 16]
+            return tuple(values)
+        return unpack_from
+
+    @staticmethod
+    def _compile_pack(segments: List[Tuple[int, struct.Struct, int, int]], merges: List[int]) -> Callable[..., None]:
+        if len(segments) == 1 and not merges:
+            return segments[0][1].pack_into
+
+        def pack_into(buff: Any, offset: int, *values: Any) -> None:
+            values = list(values)
+            for index in merges:
+                values[index:index + 1] = [values[index] & 0xffff, values[index] >> 16]
+            for start, layout, first, last in segments:
+                layout.pack_into(buff, offset + start, *values[first:last])
+        return pack_into
+
+IOA_LAYOUTS = {width: Layout([code]) for width, code in IOA_CODES.items()}
+
+_LAYOUTS: Dict[Tuple[int, int, int], Layout] = {}
+
+def compile_layout(type_id: int, sq: int, ioa_width: int) -> Optional[Layout]:
+    key = (type_id, sq, ioa_width)
+    layout = _LAYOUTS.get(key)
+    if layout is None and type_id in TYPE_LAYOUTS:
+        codes = [code for _, code in TYPE_LAYOUTS[type_id][1]]
+        layout = _LAYOUTS[key] = Layout(codes if sq else [IOA_CODES[ioa_width]] + codes)
+    return layout
+
+def layout_for(type_id: int, sq: int, ioa_width: int) -> Optional[Layout]:
+    return compile_layout(type_id, sq, IOA_WIDTH_OVERRIDES.get(type_id, ioa_width))
+
+ADDRESS_LAYOUTS = {
+    1: struct.Struct('<B'),
+    2: struct.Struct('<H'),
+}
+
+FT12_VARIABLE_START = struct.Struct('<BBBBB')
+
+# The L field counts the control field, the link address and the ASDU
+MAX_LENGTH_FIELD = 255
+
+TypeCodec = namedtuple('TypeCodec', ['record', 'layout', 'element', 'ioa', 'counted'])
+
+class LinkProfile:
+    __slots__ = ['address_width', 'cot_width', 'ca_width', 'ioa_width', 'ioa_overrides', 'header', 'address', 'asdu_offset',
+                 'fixed_size', 'max_asdu_length', 'types']
+
+    def __init__(self, address_width: int = 1, cot_width: int = 1, ca_width: int = 1, ioa_width: int = 2,
+                 ioa_overrides: Optional[Dict[int, int]] = None) -> None:
+        if address_width not in (0, 1, 2) or cot_width not in (1, 2) or ca_width not in (1, 2) or ioa_width not in IOA_CODES:
+            raise ValueError(f'unsupported widths: address={address_width:d} COT={cot_width:d} CA={ca_width:d} IOA={ioa_width:d}')
+        self.address_width = address_width
+        self.cot_width = cot_width
+        self.ca_width = ca_width
+        self.ioa_width = ioa_width
+        self.ioa_overrides = ioa_overrides or {}
+        self.header = struct.Struct('<BBB' + ('B' if cot_width == 2 else '') + ('H' if ca_width == 2 else 'B'))
+        self.address = ADDRESS_LAYOUTS.get(address_width)
+        self.asdu_offset = 5 + address_width
+        self.fixed_size = 4 + address_width
+        self.max_asdu_length = MAX_LENGTH_FIELD - 1 - address_width
+        self.types: Dict[int, TypeCodec] = {}
+
+    @classmethod
+    def parse(cls, text: str) -> 'LinkProfile':
+        widths = {}
+        for term in text.split(','):
+            name, sep, value = term.partition('=')
+            if not sep or name.strip() not in ('address', 'cot', 'ca', 'ioa'):
+                raise ValueError(f'bad profile term {term!r}')
+            widths[f'{name.strip()}_width'] = int(value)
+        return cls(**widths)
+
+    def __reduce__(self) -> Tuple:
+        return LinkProfile, (self.address_width, self.cot_width, self.ca_width, self.ioa_width, self.ioa_overrides)
+
+    def __repr__(self) -> str:
+        return f'LinkProfile(address={self.address_width:d}, cot={self.cot_width:d}, ca={self.ca_width:d}, ioa={self.ioa_width:d})'
+
+    def layout(self, type_id: int, sq: int) -> Optional[Layout]:
+        return compile_layout(type_id, sq, self.ioa_overrides.get(type_id, self.ioa_width))
+
+    def type_codec(self, type_id: int) -> Optional[TypeCodec]:
+        entry = self.types.get(type_id)
+        if entry is None and type_id in TYPE_LAYOUTS:
+            entry = self.types[type_id] = TypeCodec(
+                RECORDS[type_id]._make, self.layout(type_id, 0), self.layout(type_id, 1) if type_id in SEQUENCE_TYPES else None,
+                IOA_LAYOUTS[self.ioa_overrides.get(type_id, self.ioa_width)],
+                type_id in SEQUENCE_TYPES or type_id in LIST_TYPES or type_id in SQ0_LIST_TYPES)
+        return entry
+
+    def decode_asdu(self, buff: Any, offset: int = 0, end: Optional[int] = None) -> Optional[DecodedASDU]:
+        if end is None:
+            end = len(buff)
+        if offset + self.header.size > end:
+            raise ASDUError(f'ASDU of {end - offset:d} bytes is shorter than its header')
+        if self.cot_width == 2:
+            type_id, vsq, cot, originator, common_address = self.header.unpack_from(buff, offset)
+        else:
+            type_id, vsq, cot, common_address = self.header.unpack_from(buff, offset)
+            originator = 0
+        sq = vsq >> 7
+        entry = self.types.get(type_id) or self.type_codec(type_id)
+        if entry is None or (sq and type_id in SQ0_LIST_TYPES):
+            return None
+        record, layout, element, ioa, counted = entry
+        number = vsq & 0x7f
+        offset += self.header.size
+        objects = []
+        if sq and element is not None:
+            size = element.size
+            if offset + ioa.size + number * size > end:
+                raise ASDUError(f'{number:d} objects of type 0x{type_id:02x} overrun the ASDU')
+            base = ioa.unpack_from(buff, offset)[0]
+            offset += ioa.size
+            unpack_from = element.unpack_from
+            for index in range(number):
+                objects.append(record((base + index,) + unpack_from(buff, offset)))
+                offset += size
+        else:
+            unpack_from = layout.unpack_from
+            size = layout.size
+            count = number if counted else 1
+            if offset + count * size > end:
+                raise ASDUError(f'{count:d} objects of type 0x{type_id:02x} overrun the ASDU')
+            for _ in range(count):
+                objects.append(record(unpack_from(buff, offset)))
+                offset += size
+        return DecodedASDU(type_id, sq, number, cot >> 6, cot & 0x3f, common_address, objects, originator)
+
+    def asdu_size(self, type_id: int, count: int, sq: int = 0) -> int:
+        if sq:
+            return self.header.size + IOA_LAYOUTS[self.ioa_overrides.get(type_id, self.ioa_width)].size + self.layout(type_id, 1).size * count
+        return self.header.size + self.layout(type_id, 0).size * count
+
+    def asdu_capacity(self, type_id: int, sq: int, max_size: int) -> int:
+        room = max_size - self.header.size - (IOA_LAYOUTS[self.ioa_overrides.get(type_id, self.ioa_width)].size if sq else 0)
+        return max(0, min(0x7f, room // self.layout(type_id, sq).size))
+
+    def encode_asdu_into(self, buff: Any, offset: int, type_id: int, objects: List[Tuple], COT: int = 0, CommonAddress: int = 0, sq: int = 0,
+                         COT_flags: int = 0, originator: int = 0) -> int:
+        entry = self.type_codec(type_id)
+        if entry is None or len(objects) > 0x7f:
+            raise ValueError(f'cannot encode type 0x{type_id:02x} with {len(objects):d} objects')
+        _, layout, element, ioa, _ = entry
+        vsq = (0x80 if sq else 0) | len(objects)
+        if self.cot_width == 2:
+            self.header.pack_into(buff, offset, type_id, vsq, (COT_flags << 6) | COT, originator, CommonAddress)
+        else:
+            self.header.pack_into(buff, offset, type_id, vsq, (COT_flags << 6) | COT, CommonAddress)
+        offset += self.header.size
+        if sq:
+            if element is None:
+                raise ValueError(f'type 0x{type_id:02x} does not support SQ=1')
+            if objects:
+                ioa.pack_into(buff, offset, objects[0][0])
+            offset += ioa.size
+            pack_into = element.pack_into
+            size = element.size
+            for obj in objects:
+                pack_into(buff, offset, *obj[1:])
+                offset += size
+        else:
+            pack_into = layout.pack_into
+            size = layout.size
+            for obj in objects:
+                pack_into(buff, offset, *obj)
+                offset += size
+        return offset
+
+    def encode_asdu(self, type_id: int, objects: List[Tuple], COT: int = 0, CommonAddress: int = 0, sq: int = 0, COT_flags: int = 0,
+                    originator: int = 0) -> bytes:
+        if type_id not in TYPE_LAYOUTS:
+            raise ValueError(f'cannot encode type 0x{type_id:02x} with {len(objects):d} objects')
+        buff = bytearray(self.asdu_size(type_id, len(objects), sq))
+        self.encode_asdu_into(buff, 0, type_id, objects, COT, CommonAddress, sq, COT_flags, originator)
+        return bytes(buff)
+
+    def read_address(self, buff: Any, offset: int) -> Optional[int]:
+        return None if self.address is None else self.address.unpack_from(buff, offset)[0]
+
+    def finish_variable_frame(self, buff: Any, offset: int, end: int, control: int, address: int) -> int:
+        length = end - offset - 4
+        if length > 0xff:
+            raise FT12Error(f'user data of {length:d} bytes does not fit a variable frame')
+        FT12_VARIABLE_START.pack_into(buff, offset, 0x68, length, length, 0x68, control)
+        if self.address is not None:
+            self.address.pack_into(buff, offset + 5, address)
+        with memoryview(buff) as view:
+            checksum = sum(view[offset + 4:end]) & 0xff
+        buff[end] = checksum
+        buff[end + 1] = 0x16
+        return end + 2
+
+    def encode_variable_frame_into(self, buff: Any, offset: int, control: int, address: int, type_id: int, objects: List[Tuple], COT: int = 0,
+                                   CommonAddress: int = 0, sq: int = 0, COT_flags: int = 0, originator: int = 0) -> int:
+        end = self.encode_asdu_into(buff, offset + self.asdu_offset, type_id, objects, COT, CommonAddress, sq, COT_flags, originator)
+        return self.finish_variable_frame(buff, offset, end, control, address)
+
+    def encode_variable_frame(self, control: int, address: int, asdu: bytes) -> bytes:
+        buff = bytearray(len(asdu) + self.asdu_offset + 2)
+        buff[self.asdu_offset:-2] = asdu
+        self.finish_variable_frame(buff, 0, len(asdu) + self.asdu_offset, control, address)
+        return bytes(buff)
+
+    def encode_fixed_frame(self, control: int, address: int) -> bytes:
+        buff = bytearray(self.fixed_size)
+        buff[0] = 0x10
+        buff[1] = control
+        if self.address is not None:
+            self.address.pack_into(buff, 2, address)
+        buff[-2] = sum(buff[1:-2]) & 0xff
+        buff[-1] = 0x16
+        return bytes(buff)
+
+    def scan_frame(self, buff: Any, pos: int, end: int, strict: bool = False) -> Tuple[int, int]:
+        return scan_frame(buff, pos, end, strict, self.fixed_size)
+
+    def parse_frames(self, buff: Any, strict: bool = False) -> Iterator['FrameView']:
+        return parse_frames(buff, strict, self)
+
+# The balanced flag used throughout selects between these two 1-octet address,
+# COT and common address profiles, which keep the Scapy layer's IOA quirks.
+BALANCED_PROFILE = LinkProfile(ioa_width=2, ioa_overrides=IOA_WIDTH_OVERRIDES)
+UNBALANCED_PROFILE = LinkProfile(ioa_width=3, ioa_overrides=IOA_WIDTH_OVERRIDES)
+
+def legacy_profile(balanced: bool) -> LinkProfile:
+    return BALANCED_PROFILE if balanced else UNBALANCED_PROFILE
+
+def decode_asdu(buff: Any, offset: int = 0, balanced: bool = True, end: Optional[int] = None) -> Optional[DecodedASDU]:
+    return (BALANCED_PROFILE if balanced else UNBALANCED_PROFILE).decode_asdu(buff, offset, end)
+
+def asdu_size(type_id: int, count: int, sq: int = 0, balanced: bool = True) -> int:
+    return legacy_profile(balanced).asdu_size(type_id, count, sq)
+
+def encode_asdu_into(buff: Any, offset: int, type_id: int, objects: List[Tuple], COT: int = 0, CommonAddress: int = 0, sq: int = 0,
+                     balanced: bool = True, COT_flags: int = 0) -> int:
+    return legacy_profile(balanced).encode_asdu_into(buff, offset, type_id, objects, COT, CommonAddress, sq, COT_flags)
+
+def encode_asdu(type_id: int, objects: List[Tuple], COT: int = 0, CommonAddress: int = 0, sq: int = 0, balanced: bool = True, COT_flags: int = 0) -> bytes:
+    return legacy_profile(balanced).encode_asdu(type_id, objects, COT, CommonAddress, sq, COT_flags)
+
+MAX_ASDU_LENGTH = BALANCED_PROFILE.max_asdu_length
+
+def asdu_capacity(type_id: int, sq: int, max_size: int, balanced: bool = True) -> int:
+    return legacy_profile(balanced).asdu_capacity(type_id, sq, max_size)
+
+def pack_asdus(type_id: int, objects: List[Tuple], COT: int = 0, CommonAddress: int = 0, max_size: Optional[int] = None,
+               balanced: bool = True, COT_flags: int = 0, profile: Optional[LinkProfile] = None, originator: int = 0) -> List[bytes]:
+    profile = profile or legacy_profile(balanced)
+    if max_size is None:
+        max_size = profile.max_asdu_length
+    # Repeated updates of one IOA are packed in generations, so an older update
+    # is always sent in an earlier ASDU than a newer one
+    generations: List[List[Tuple]] = []
+    seen: Dict[int, int] = {}
+    for obj in objects:
+        generation = seen.get(obj[0], 0)
+        seen[obj[0]] = generation + 1
+        if generation == len(generations):
+            generations.append([])
+        generations[generation].append(obj)
+    if len(generations) > 1:
+        return [asdu for generation in generations
+                for asdu in pack_asdus(type_id, generation, COT, CommonAddress, max_size, balanced, COT_flags, profile, originator)]
+    objects = sorted(objects, key=lambda obj: obj[0])
+    list_capacity = profile.asdu_capacity(type_id, 0, max_size)
+    if type_id not in SEQUENCE_TYPES and type_id not in LIST_TYPES and type_id not in SQ0_LIST_TYPES:
+        list_capacity = min(list_capacity, 1)
+    if not list_capacity:
+        raise ValueError(f'type 0x{type_id:02x} does not fit in {max_size:d} bytes')
+    runs: List[List[Tuple]] = []
+    if type_id in SEQUENCE_TYPES:
+        for obj in objects:
+            if runs and obj[0] == runs[-1][-1][0] + 1:
+                runs[-1].append(obj)
+            else:
+                runs.append([obj])
+    asdus = []
+    remainders = []
+    sequence_capacity = profile.asdu_capacity(type_id, 1, max_size) if runs else 0
+    for run in runs:
+        full = len(run) - len(run) % sequence_capacity
+        for start in range(0, full, sequence_capacity):
+            asdus.append(profile.encode_asdu(type_id, run[start:start + sequence_capacity], COT, CommonAddress, 1, COT_flags, originator))
+        if full < len(run):
+            remainders.append(run[full:])
+    # Each leftover run either gets an SQ=1 ASDU of its own or joins the SQ=0
+    # pool; giving the longest runs their own ASDU first is optimal.
+    remainders.sort(key=len, reverse=True)
+    pooled = sum(len(run) for run in remainders) if runs else len(objects)
+    best, best_count = 0, -(-pooled // list_capacity)
+    for own, run in enumerate(remainders, 1):
+        pooled -= len(run)
+        count = own - (-pooled // list_capacity)
+        if count < best_count:
+            best, best_count = own, count
+    for run in remainders[:best]:
+        asdus.append(profile.encode_asdu(type_id, run, COT, CommonAddress, 1, COT_flags, originator))
+    rest = sorted((obj for run in remainders[best:] for obj in run), key=lambda obj: obj[0]) if runs else objects
+    for start in range(0, len(rest), list_capacity):
+        asdus.append(profile.encode_asdu(type_id, rest[start:start + list_capacity], COT, CommonAddress, 0, COT_flags, originator))
+    return asdus
+
+def cp56_to_datetime(tag: bytes, century: int = 2000, utc_offset: Optional[timedelta] = None, dst_offset: timedelta = timedelta(hours=1), mask_invalid: bool = True) -> Optional[datetime]:
+    if mask_invalid and tag[2] & 0x80:
+        return None
+    milliseconds = tag[0] | tag[1] << 8
+    # Impossible dates and times give None, as they give NaT in cp56_to_datetime64
+    try:
+        value = datetime(century + (tag[6] & 0x7f), tag[5] & 0x0f, tag[4] & 0x1f, tag[3] & 0x1f, tag[2] & 0x3f,
+                         milliseconds // 1000, milliseconds % 1000 * 1000)
+    except ValueError:
+        return None
+    if utc_offset is None:
+        return value
+    value -= utc_offset + (dst_offset if tag[3] & 0x80 else timedelta(0))
+    return value.replace(tzinfo=timezone.utc)
+
+def datetime_to_cp56(value: datetime, century: int = 2000, invalid: bool = False, summer_time: bool = False) -> bytes:
+    milliseconds = value.second * 1000 + value.microsecond // 1000
+    return bytes([
+        milliseconds & 0xff, milliseconds >> 8,
+        (0x80 if invalid else 0) | value.minute,
+        (0x80 if summer_time else 0) | value.hour,
+        value.isoweekday() << 5 | value.day,
+        value.month,
+        value.year - century,
+    ])
+
+def cp24_to_datetime(tag: bytes, reference: datetime, mask_invalid: bool = True) -> Optional[datetime]:
+    if mask_invalid and tag[2] & 0x80:
+        return None
+    value = reference.replace(minute=0, second=0, microsecond=0) + timedelta(minutes=tag[2] & 0x3f, milliseconds=tag[0] | tag[1] << 8)
+    if value - reference > timedelta(minutes=30):
+        value -= timedelta(hours=1)
+    elif reference - value > timedelta(minutes=30):
+        value += timedelta(hours=1)
+    return value
+
+def datetime_to_cp24(value: datetime, invalid: bool = False) -> bytes:
+    milliseconds = value.second * 1000 + value.microsecond // 1000
+    return bytes([milliseconds & 0xff, milliseconds >> 8, (0x80 if invalid else 0) | value.minute])
+
+FT12_SINGLE_CHARS = (0xe5, 0xa2)
+FT12_START = re.compile(rb'[\x10\x68\xe5\xa2]')
+
+class FT12Error(ValueError):
+    pass
+
+def ft12_checksum(data: bytes) -> int:
+    return sum(data) & 0xff
+
+def ft12_validate(buff: bytes, fixed_size: int = 5) -> None:
+    if len(buff) == 1 and buff[0] in FT12_SINGLE_CHARS:
+        return
+    if len(buff) < fixed_size:
+        raise FT12Error(f'frame too short ({len(buff):d} bytes)')
+    if buff[-1] != 0x16:
+        raise FT12Error(f'bad end octet 0x{buff[-1]:02x}')
+    if buff[0] == 0x10:
+        if len(buff) != fixed_size:
+            raise FT12Error(f'fixed frame of {len(buff):d} bytes')
+        user_data = buff[1:-2]
+    elif buff[0] == 0x68:
+        if buff[1] != buff[2] or buff[3] != 0x68:
+            raise FT12Error(f'bad variable frame header {bytes(buff[:4]).hex()}')
+        if len(buff) != buff[1] + 6:
+            raise FT12Error(f'length {buff[1]:d} does not match frame of {len(buff):d} bytes')
+        user_data = buff[4:-2]
+    else:
+        raise FT12Error(f'bad start octet 0x{buff[0]:02x}')
+    if ft12_checksum(user_data) != buff[-2]:
+        raise FT12Error(f'bad checksum 0x{buff[-2]:02x}, expected 0x{ft12_checksum(user_data):02x}')
+
+FT12_FIXED = struct.Struct('<BBBBB')
+
+def finish_variable_frame(buff: Any, offset: int, end: int, control: int, address: int) -> int:
+    return BALANCED_PROFILE.finish_variable_frame(buff, offset, end, control, address)
+
+def encode_variable_frame_into(buff: Any, offset: int, control: int, address: int, type_id: int, objects: List[Tuple], COT: int = 0,
+                               CommonAddress: int = 0, sq: int = 0, balanced: bool = True, COT_flags: int = 0) -> int:
+    return legacy_profile(balanced).encode_variable_frame_into(buff, offset, control, address, type_id, objects, COT, CommonAddress, sq, COT_flags)
+
+def encode_variable_frame(control: int, address: int, asdu: bytes) -> bytes:
+    return BALANCED_PROFILE.encode_variable_frame(control, address, asdu)
+
+def encode_fixed_frame(control: int, address: int) -> bytes:
+    return FT12_FIXED.pack(0x10, control, address, (control + address) & 0xff, 0x16)
+
+def scan_frame(buff: Any, pos: int, end: int, strict: bool = False, fixed_size: int = 5) -> Tuple[int, int]:
+    while pos < end:
+        first = buff[pos]
+        if first in FT12_SINGLE_CHARS:
+            return pos, 1
+        if first == 0x10:
+            size = fixed_size
+            if pos + size > end:
+                break
+            if buff[pos + size - 1] != 0x16:
+                pos += 1
+                continue
+            if strict and ft12_checksum(buff[pos + 1:pos + size - 2]) != buff[pos + size - 2]:
+                pos += size
+                continue
+            return pos, size
+        if first == 0x68:
+            if pos + 4 > end:
+                break
+            length = buff[pos + 1]
+            if length != buff[pos + 2] or buff[pos + 3] != 0x68:
+                pos += 1
+                continue
+            size = length + 6
+            if pos + size > end:
+                break
+            if buff[pos + size - 1] != 0x16:
+                pos += 1
+                continue
+            if strict and ft12_checksum(buff[pos + 4:pos + size - 2]) != buff[pos + size - 2]:
+                pos += size
+                continue
+            return pos, size
+        match = FT12_START.search(buff, pos, end)
+        pos = match.start() if match is not None else end
+    return pos, 0
+
+class FrameView:
+    __slots__ = ['buff', 'offset', 'size', 'profile']
+
+    def __init__(self, buff: Any, offset: int, size: int, profile: Optional[LinkProfile] = None) -> None:
+        self.buff = buff
+        self.offset = offset
+        self.size = size
+        self.profile = profile
+
+    @property
+    def start(self) -> int:
+        return self.buff[self.offset]
+
+    @property
+    def is_single(self) -> bool:
+        return self.size == 1
+
+    @property
+    def is_fixed(self) -> bool:
+        return self.buff[self.offset] == 0x10
+
+    @property
+    def control(self) -> Optional[int]:
+        if self.size == 1:
+            return None
+        return self.buff[self.offset + (1 if self.is_fixed else 4)]
+
+    @property
+    def Control_Flags(self) -> Optional[int]:
+        control = self.control
+        return None if control is None else control >> 4
+
+    @property
+    def fcode(self) -> Optional[int]:
+        control = self.control
+        return None if control is None else control & 0x0f
+
+    @property
+    def address(self) -> Optional[int]:
+        if self.size == 1:
+            return None
+        return (self.profile or BALANCED_PROFILE).read_address(self.buff, self.offset + (2 if self.is_fixed else 5))
+
+    @property
+    def asdu_offset(self) -> Optional[int]:
+        if self.size == 1 or self.is_fixed:
+            return None
+        return self.offset + (self.profile or BALANCED_PROFILE).asdu_offset
+
+    def asdu(self) -> memoryview:
+        return memoryview(self.buff)[self.offset + (self.profile or BALANCED_PROFILE).asdu_offset:self.offset + self.size - 2]
+
+    def decode(self, balanced: bool = True) -> Optional[DecodedASDU]:
+        if self.size == 1 or self.is_fixed:
+            return None
+        profile = self.profile or legacy_profile(balanced)
+        return profile.decode_asdu(self.buff, self.offset + profile.asdu_offset, self.offset + self.size - 2)
+
+    def __bytes__(self) -> bytes:
+        return bytes(memoryview(self.buff)[self.offset:self.offset + self.size])
+
+    def __repr__(self) -> str:
+        return f'<FrameView offset={self.offset:d} size={self.size:d}>'
+
+def parse_frames(buff: Any, strict: bool = False, profile: Optional[LinkProfile] = None) -> Iterator[FrameView]:
+    fixed_size = profile.fixed_size if profile is not None else 5
+    pos = 0
+    end = len(buff)
+    while True:
+        pos, size = scan_frame(buff, pos, end, strict, fixed_size)
+        if not size:
+            return
+        yield FrameView(buff, pos, size, profile)
+        pos += size
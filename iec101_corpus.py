@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+
+import argparse
+import math
+import random
+import struct
+import sys
+from collections import namedtuple
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from scapy.fields import FieldLenField, MultipleTypeField, PacketField, StrField
+from scapy.packet import Packet
+
+from iec101 import ASDU, IO_CLASSES, IO_SINGLE_TYPES, FT12Frame, FT12Variable, VSQ, io_types, lazy_dissection
+from iec101_codec import (
+    BALANCED_PROFILE, SEQUENCE_TYPES, UNBALANCED_PROFILE, DecodedASDU, LinkProfile, parse_frames
+)
+
+# Reference behaviour the fast paths deliberately do not reproduce. Cases listed
+# here are reported as quirks rather than mismatches.
+KNOWN_QUIRKS = {
+    (0x15, 1): 'IO21 cannot dissect SQ=1 NVA sequences',
+}
+
+# The Scapy layer only dissects balanced frames, so it is the reference for the
+# balanced profile; the other profiles are checked between the fast engines.
+PROFILES = {
+    'balanced': BALANCED_PROFILE,
+    'unbalanced': UNBALANCED_PROFILE,
+    'wide': LinkProfile(address_width=2, cot_width=2, ca_width=2, ioa_width=3),
+    'compact': LinkProfile(address_width=0, ioa_width=1),
+}
+
+Sample = namedtuple('Sample', ['profile', 'type', 'sq', 'frame', 'header', 'elements'])
+
+Result = namedtuple('Result', ['header', 'elements'])
+
+def _random_value(fld: Any, rng: random.Random) -> Any:
+    if isinstance(fld.sz, float):
+        return rng.randrange(1 << fld.size)
+    if fld.sz == 3:
+        return rng.randrange(1 << 24)
+    return struct.unpack(fld.fmt, rng.randbytes(fld.sz))[0]
+
+def fuzz_fields(pkt: Packet, rng: random.Random) -> Packet:
+    for fld in pkt.fields_desc:
+        if isinstance(fld, MultipleTypeField):
+            fld = fld._find_fld_pkt(pkt)
+        if isinstance(fld, PacketField):
+            pkt.setfieldval(fld.name, fuzz_fields(fld.cls(), rng))
+        elif isinstance(fld, FieldLenField):
+            pkt.setfieldval(fld.name, None)
+        elif isinstance(fld, StrField):
+            pkt.setfieldval(fld.name, rng.randbytes(rng.randrange(32)))
+        elif fld.name == 'IOA' and not isinstance(pkt.getfieldval('IOA'), list):
+            pkt.setfieldval('IOA', _random_value(fld, rng))
+        elif hasattr(fld, 'fmt') and not isinstance(fld.default, list):
+            pkt.setfieldval(fld.name, _random_value(fld, rng))
+    return pkt
+
+def ioa_width(profile: LinkProfile, type_id: int) -> int:
+    return profile.ioa_overrides.get(type_id, profile.ioa_width)
+
+def sample(type_id: int, sq: int, rng: random.Random, profile: str = 'balanced') -> Sample:
+    link = PROFILES[profile]
+    width = ioa_width(link, type_id)
+    cls = IO_CLASSES[type_id]
+    io = [fuzz_fields(cls(), rng)]
+    if type_id not in IO_SINGLE_TYPES:
+        size = len(io[0]) - 2 + width
+        room = link.max_asdu_length - link.header.size
+        capacity = (room - width) // (size - width) if sq else room // size
+        io.extend(fuzz_fields(cls(), rng) for _ in range(rng.randint(1, min(0x7f, capacity)) - 1))
+    count = len(io)
+    originator = rng.randrange(0x100) if link.cot_width == 2 else 0
+    header = (type_id, sq, count, rng.randrange(4), rng.randrange(64), originator, rng.randrange(1 << 8 * link.ca_width))
+    if profile == 'balanced' and not sq:
+        pkt = FT12Frame() / FT12Variable(Control_Flags=0, fcode=0x8, address=1, LinkUserData=ASDU(
+            type=type_id, VSQ=VSQ(number=count), COT_flags=header[3], COT=header[4], CommonAddress=header[6],
+            IO=io[0] if type_id in IO_SINGLE_TYPES else io))
+        return Sample(profile, type_id, sq, bytes(pkt), header, [bytes(obj) for obj in io])
+    bodies = [bytes(obj)[2:] for obj in io]
+    if sq:
+        base = rng.randrange((1 << 8 * width) - count)
+        ioas = [base + index for index in range(count)]
+    else:
+        ioas = [rng.randrange(1 << 8 * width) for _ in range(count)]
+    elements = [ioa.to_bytes(width, 'little') + body for ioa, body in zip(ioas, bodies)]
+    cot = header[3] << 6 | header[4]
+    fields = (cot, originator, header[6]) if link.cot_width == 2 else (cot, header[6])
+    asdu = link.header.pack(type_id, (0x80 if sq else 0) | count, *fields)
+    if sq:
+        asdu += elements[0][:width] + b''.join(bodies)
+    else:
+        asdu += b''.join(elements)
+    return Sample(profile, type_id, sq, link.encode_variable_frame(0x08, 1, asdu), header, elements)
+
+def generate(types: Optional[List[int]] = None, count: int = 100, seed: int = 0, profiles: Iterable[str] = PROFILES) -> Iterator[Sample]:
+    rng = random.Random(seed)
+    for profile in profiles:
+        for type_id in types or io_types():
+            for sq in ((0, 1) if type_id in SEQUENCE_TYPES else (0,)):
+                for _ in range(count):
+                    yield sample(type_id, sq, rng, profile)
+
+def _scapy_elements(asdu: ASDU) -> List[bytes]:
+    io = asdu.IO
+    if not isinstance(io, list):
+        io = [io]
+    if not asdu.VSQ.SQ:
+        return [bytes(obj) for obj in io]
+    obj = io[0]
+    cls = type(obj)
+    lists = [fld.name for fld in obj.fields_desc if isinstance(obj.getfieldval(fld.name), list)]
+    return [
+        bytes(cls(IOA=obj.IOA + index, **{name: obj.getfieldval(name)[index] for name in lists}))
+        for index in range(asdu.VSQ.number)
+    ]
+
+def scapy_result(pkt: Packet) -> Result:
+    asdu = pkt.payload.LinkUserData
+    header = (asdu.type, asdu.VSQ.SQ, asdu.VSQ.number, int(asdu.COT_flags), asdu.COT, 0, asdu.CommonAddress)
+    return Result(header, _scapy_elements(asdu))
+
+def scapy_decode(frame: bytes) -> Packet:
+    return FT12Frame(frame)
+
+def scapy_lazy_decode(frame: bytes) -> Packet:
+    with lazy_dissection():
+        return FT12Frame(frame)
+
+def scapy_encode(pkt: Packet) -> bytes:
+    pkt.clear_cache()
+    return bytes(pkt)
+
+def codec_decode(profile: LinkProfile) -> Callable[[bytes], Optional[DecodedASDU]]:
+    return lambda frame: profile.decode_asdu(frame, profile.asdu_offset, len(frame) - 2)
+
+def frame_view_decode(profile: LinkProfile) -> Callable[[bytes], Optional[DecodedASDU]]:
+    return lambda frame: next(parse_frames(frame, strict=True, profile=profile)).decode()
+
+def fast_decode(profile: LinkProfile) -> Callable[[bytes], Optional[DecodedASDU]]:
+    balanced = profile is BALANCED_PROFILE
+    return lambda frame: ASDU.fast_decode(frame[profile.asdu_offset:-2], balanced)
+
+def codec_result(profile: LinkProfile) -> Callable[[DecodedASDU], Result]:
+    def normalize(decoded: DecodedASDU) -> Result:
+        header = (decoded.type, decoded.SQ, decoded.number, decoded.COT_flags, decoded.COT, decoded.originator, decoded.CommonAddress)
+        if decoded.IO and isinstance(decoded.IO[0], Packet):
+            return Result(header, [bytes(obj) for obj in decoded.IO])
+        return Result(header, [profile.encode_asdu(decoded.type, [obj])[profile.header.size:] for obj in decoded.IO])
+    return normalize
+
+def codec_frame_decode(profile: LinkProfile) -> Callable[[bytes], Optional[Tuple[int, int, DecodedASDU]]]:
+    def decode(frame: bytes) -> Optional[Tuple[int, int, DecodedASDU]]:
+        decoded = profile.decode_asdu(frame, profile.asdu_offset, len(frame) - 2)
+        return None if decoded is None else (frame[4], profile.read_address(frame, 5) or 0, decoded)
+    return decode
+
+def codec_encode(profile: LinkProfile) -> Callable[[Tuple[int, int, DecodedASDU]], bytes]:
+    def encode(link: Tuple[int, int, DecodedASDU]) -> bytes:
+        control, address, decoded = link
+        asdu = profile.encode_asdu(decoded.type, decoded.IO, decoded.COT, decoded.CommonAddress, decoded.SQ, decoded.COT_flags, decoded.originator)
+        return profile.encode_variable_frame(control, address, asdu)
+    return encode
+
+def numpy_result(profile: LinkProfile) -> Callable[[Any], Result]:
+    def normalize(decoded: Any) -> Result:
+        width = ioa_width(profile, decoded.type)
+        header = (decoded.type, 1, len(decoded.values), decoded.COT_flags, decoded.COT, decoded.originator, decoded.CommonAddress)
+        return Result(header, [int(ioa).to_bytes(width, 'little') + value.tobytes() for ioa, value in zip(decoded.IOA, decoded.values)])
+    return normalize
+
+Engine = Tuple[Callable[[Any], Any], Callable[[Any], Any]]
+
+def engines(profile: str = 'balanced') -> Tuple[Dict[str, Engine], Dict[str, Engine]]:
+    link = PROFILES[profile]
+    legacy = link is BALANCED_PROFILE or link is UNBALANCED_PROFILE
+    decoders: Dict[str, Engine] = {}
+    encoders: Dict[str, Engine] = {}
+    if profile == 'balanced':
+        decoders['scapy'] = (scapy_decode, scapy_result)
+        decoders['scapy_lazy'] = (scapy_lazy_decode, scapy_result)
+        encoders['scapy'] = (scapy_decode, scapy_encode)
+    decoders['codec'] = (codec_decode(link), codec_result(link))
+    decoders['frame_view'] = (frame_view_decode(link), codec_result(link))
+    if legacy:
+        decoders['fast'] = (fast_decode(link), codec_result(link))
+    encoders['codec'] = (codec_frame_decode(link), codec_encode(link))
+    try:
+        from iec101_numpy import decode_sequence
+    except ImportError:
+        pass
+    else:
+        decoders['numpy'] = (lambda frame: decode_sequence(frame, link.asdu_offset, end=len(frame) - 2, profile=link), numpy_result(link))
+    return decoders, encoders
+
+class EngineStats:
+    __slots__ = ['checked', 'unsupported', 'quirks', 'mismatches', 'errors', 'elapsed']
+
+    def __init__(self) -> None:
+        self.checked = 0
+        self.unsupported = 0
+        self.quirks = 0
+        self.mismatches = 0
+        self.errors = 0
+        self.elapsed = 0.0
+
+    @property
+    def frames_per_s(self) -> float:
+        return self.checked / self.elapsed if self.elapsed else math.nan
+
+def _diff(expected: Any, result: Any) -> Optional[str]:
+    if isinstance(expected, bytes):
+        return None if result == expected else f'{result.hex()} != {expected.hex()}'
+    if result.header != expected.header:
+        return f'header {result.header} != {expected.header}'
+    if len(result.elements) != len(expected.elements):
+        return f'{len(result.elements):d} objects != {len(expected.elements):d}'
+    for index, (got, want) in enumerate(zip(result.elements, expected.elements)):
+        if got != want:
+            return f'object {index:d}: {got.hex()} != {want.hex()}'
+    return None
+
+def differential(samples: Iterable[Sample], max_reports: int = 20) -> Tuple[Dict[str, EngineStats], List[str]]:
+    profile_engines: Dict[str, Tuple[Dict[str, Engine], Dict[str, Engine]]] = {}
+    stats: Dict[str, EngineStats] = {}
+    reports: List[str] = []
+
+    def check(engine: str, first: Callable[[Any], Any], second: Callable[[Any], Any], item: Sample, expected: Any, time_first: bool) -> None:
+        stat = stats.setdefault(engine, EngineStats())
+        quirk = KNOWN_QUIRKS.get((item.type, item.sq))
+        try:
+            start = perf_counter()
+            prepared = first(item.frame)
+            middle = perf_counter()
+            if prepared is None:
+                stat.unsupported += 1
+                return
+            result = second(prepared)
+            end = perf_counter()
+        except Exception as exc:
+            problem: Optional[str] = f'{type(exc).__name__}: {exc}'
+            if not quirk:
+                stat.errors += 1
+        else:
+            stat.checked += 1
+            stat.elapsed += middle - start if time_first else end - middle
+            problem = _diff(expected, result)
+            if problem is not None and not quirk:
+                stat.mismatches += 1
+        if problem is None:
+            return
+        if quirk:
+            stat.quirks += 1
+        elif len(reports) < max_reports:
+            reports.append(f'{engine}: {item.frame.hex()}: {problem}')
+
+    for item in samples:
+        if item.profile not in profile_engines:
+            profile_engines[item.profile] = engines(item.profile)
+        decoders, encoders = profile_engines[item.profile]
+        expected = Result(item.header, item.elements)
+        for name, (decode, normalize) in decoders.items():
+            check(f'{item.profile} {name} decode', decode, normalize, item, expected, True)
+        for name, (prepare, encode) in encoders.items():
+            # Scapy cannot build SQ=1 ASDUs, so those frames are only dissected
+            if name == 'scapy' and item.sq:
+                continue
+            check(f'{item.profile} {name} encode', prepare, encode, item, item.frame, False)
+    return stats, reports
+
+def save(samples: Iterable[Sample], path: str) -> List[Sample]:
+    from iec101_capture import CaptureWriter
+    kept = list(samples)
+    with CaptureWriter(path) as writer:
+        for item in kept:
+            writer.write(item.frame)
+    return kept
+
+def load(path: str, profile: str = 'balanced') -> Iterator[Sample]:
+    from iec101_capture import CaptureReader
+    link = PROFILES[profile]
+    for record in CaptureReader(path):
+        frame = bytes(record.frame)
+        if len(frame) < link.asdu_offset + link.header.size + 2 or frame[0] != 0x68:
+            continue
+        try:
+            if profile != 'balanced':
+                raise ValueError(f'no Scapy reference for the {profile} profile')
+            reference = scapy_result(scapy_decode(frame))
+        except Exception:
+            try:
+                decoded = codec_decode(link)(frame)
+            except ValueError:
+                continue
+            if decoded is None:
+                continue
+            reference = codec_result(link)(decoded)
+        yield Sample(profile, reference.header[0], reference.header[1], frame, reference.header, reference.elements)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Differential round-trip test of the IEC 60870-5-101 engines against the Scapy reference')
+    parser.add_argument('--types', type=lambda text: [int(part, 0) for part in text.split(',')], help='comma separated type ids')
+    parser.add_argument('--count', type=int, default=100, help='samples per type and SQ')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', help='write the generated corpus to this capture')
+    parser.add_argument('--load', help='replay a corpus capture instead of generating one')
+    parser.add_argument('--profiles', type=lambda text: text.split(','), default=list(PROFILES),
+                        help=f'comma separated link profiles out of {", ".join(PROFILES)}; a capture is replayed with the first')
+    args = parser.parse_args()
+    unknown = [name for name in args.profiles if name not in PROFILES]
+    if unknown:
+        parser.error(f'unknown profiles: {", ".join(unknown)}')
+    samples: Iterable[Sample] = load(args.load, args.profiles[0]) if args.load else generate(args.types, args.count, args.seed, args.profiles)
+    if args.save:
+        samples = save(samples, args.save)
+    stats, reports = differential(samples)
+    for line in reports:
+        print(f'MISMATCH {line}')
+    for engine, stat in stats.items():
+        print(f'{engine:<29} checked={stat.checked:<7d} unsupported={stat.unsupported:<6d} quirks={stat.quirks:<5d} '
+              f'mismatches={stat.mismatches:<5d} errors={stat.errors:<5d} {stat.frames_per_s:10.0f} frames/s')
+    sys.exit(1 if any(stat.mismatches or stat.errors for stat in stats.values()) else 0)
+
+if __name__ == '__main__':
+    main()
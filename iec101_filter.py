@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+
+import argparse
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from iec101_codec import IOA_LAYOUTS, LIST_TYPES, SEQUENCE_TYPES, SQ0_LIST_TYPES, TYPE_LAYOUTS, LinkProfile, legacy_profile
+
+ACCEPT = 'accept'
+DROP = 'drop'
+
+Match = Union[int, range, Iterable[int]]
+
+RULE_FIELDS = {
+    'address': 'a',
+    'fcode': 'f',
+    'type': 't',
+    'COT': 'cot',
+    'CommonAddress': 'ca',
+    'originator': 'org',
+}
+
+def _object_strides(profile: LinkProfile, sq: int = 0) -> Dict[int, int]:
+    return {type_id: profile.layout(type_id, sq).size for type_id in (SEQUENCE_TYPES if sq else TYPE_LAYOUTS)}
+
+def _field_source(offset: int, width: int) -> str:
+    if width == 2:
+        return f'b[o + {offset:d}] | b[o + {offset + 1:d}] << 8'
+    return f'b[o + {offset:d}]'
+
+class Rule:
+    __slots__ = ['action', 'matches', 'ioa']
+
+    def __init__(self, action: Any = ACCEPT, ioa: Optional[Match] = None, **matches: Match) -> None:
+        unknown = set(matches) - set(RULE_FIELDS)
+        if unknown:
+            raise ValueError(f'unknown rule fields: {", ".join(sorted(unknown))}')
+        self.action = action
+        self.matches = matches
+        self.ioa = ioa
+
+    def __repr__(self) -> str:
+        fields = [f'{name}={value!r}' for name, value in self.matches.items()]
+        if self.ioa is not None:
+            fields.append(f'ioa={self.ioa!r}')
+        return f'Rule({self.action!r}, {", ".join(fields)})'
+
+def _match_source(var: str, value: Match, constants: Dict[str, Any]) -> str:
+    if isinstance(value, int):
+        return f'{var} == {value:d}'
+    name = f'_m{len(constants):d}'
+    constants[name] = value if isinstance(value, range) else frozenset(value)
+    return f'{var} in {name}'
+
+def _ioa_source(value: Match, constants: Dict[str, Any]) -> str:
+    name = f'_m{len(constants):d}'
+    constants[name] = range(value, value + 1) if isinstance(value, int) else value if isinstance(value, range) else frozenset(value)
+    return f't is not None and _ioa_in(b, o, n, {name})'
+
+def compile_rules(rules: Iterable[Rule], default: Any = ACCEPT, balanced: bool = True,
+                  profile: Optional[LinkProfile] = None) -> Callable[..., Any]:
+    profile = profile or legacy_profile(balanced)
+    strides = _object_strides(profile)
+    element_strides = _object_strides(profile, 1)
+    readers = {width: (layout.size, layout.unpack_from) for width, layout in IOA_LAYOUTS.items()}
+    ioa_layouts = {type_id: readers[profile.ioa_overrides.get(type_id, profile.ioa_width)] for type_id in range(0x100)}
+    counted = SEQUENCE_TYPES | LIST_TYPES | SQ0_LIST_TYPES
+    type_pos = profile.asdu_offset
+    ioa_pos = type_pos + profile.header.size
+
+    # Only the objects that fit before the checksum are compared, whatever the VSQ count claims
+    def ioa_in(b: Any, o: int, n: int, ioas: Any) -> bool:
+        type_id = b[o + type_pos]
+        vsq = b[o + type_pos + 1]
+        number = vsq & 0x7f
+        pos = o + ioa_pos
+        room = n - 2 - ioa_pos
+        width, unpack_from = ioa_layouts[type_id]
+        if room < width:
+            return False
+        ioa = unpack_from(b, pos)[0]
+        if vsq & 0x80:
+            stride = element_strides.get(type_id)
+            if stride is not None:
+                number = min(number, (room - width) // stride)
+            return any(ioa + index in ioas for index in range(number))
+        stride = strides.get(type_id)
+        if stride is None:
+            return ioa in ioas
+        count = number if type_id in counted else 1
+        if count * stride > room:
+            count = room // stride
+        for _ in range(count):
+            if unpack_from(b, pos)[0] in ioas:
+                return True
+            pos += stride
+        return False
+
+    fixed_size = profile.fixed_size
+    header_end = ioa_pos + 2
+    address = 'None' if profile.address is None else _field_source(5, profile.address_width)
+    fixed_address = 'None' if profile.address is None else _field_source(2, profile.address_width)
+    constants: Dict[str, Any] = {'_ioa_in': ioa_in, '_default': default}
+    # Frames too short for their header, other than single characters, get the default action
+    lines = [
+        'def classify(b, o=0, n=None):',
+        '    if n is None:',
+        '        n = len(b) - o',
+        f'    if n >= {header_end:d}:',
+        '        c = b[o + 4]',
+        f'        a = {address}',
+        f'        t = b[o + {type_pos:d}]',
+        f'        cot = b[o + {type_pos + 2:d}] & 0x3f',
+        f'        org = {f"b[o + {type_pos + 3:d}]" if profile.cot_width == 2 else "0"}',
+        f'        ca = {_field_source(type_pos + 2 + profile.cot_width, profile.ca_width)}',
+        f'    elif n == {fixed_size:d}:',
+        '        c = b[o + 1]',
+        f'        a = {fixed_address}',
+        '        t = cot = org = ca = None',
+        '    elif n > 1:',
+        '        return _default',
+        '    else:',
+        '        c = a = t = cot = org = ca = None',
+        '    f = None if c is None else c & 0x0f',
+    ]
+    for index, rule in enumerate(rules):
+        conditions = [_match_source(RULE_FIELDS[name], value, constants) for name, value in rule.matches.items()]
+        if rule.ioa is not None:
+            conditions.append(_ioa_source(rule.ioa, constants))
+        constants[f'_a{index:d}'] = rule.action
+        lines.append(f'    if {" and ".join(conditions) or "True"}:')
+        lines.append(f'        return _a{index:d}')
+    lines.append('    return _default')
+    exec('\n'.join(lines), constants)
+    return constants['classify']
+
+class RuleSet:
+    def __init__(self, rules: Iterable[Rule] = (), default: Any = ACCEPT, balanced: bool = True,
+                 profile: Optional[LinkProfile] = None) -> None:
+        self.rules: List[Rule] = list(rules)
+        self.default = default
+        self.balanced = balanced
+        self.profile = profile
+        self.classify = compile_rules(self.rules, default, balanced, profile)
+
+    def add(self, rule: Rule) -> None:
+        self.rules.append(rule)
+        self.classify = compile_rules(self.rules, self.default, self.balanced, self.profile)
+
+    def filter(self, frames: Iterable[bytes]) -> Iterator[bytes]:
+        classify = self.classify
+        for frame in frames:
+            if classify(frame) != DROP:
+                yield frame
+
+def _parse_match(text: str) -> Match:
+    if ',' in text:
+        return frozenset(int(part, 0) for part in text.split(','))
+    if '-' in text[1:]:
+        low, _, high = text.partition('-')
+        return range(int(low, 0), int(high, 0) + 1)
+    return int(text, 0)
+
+def parse_rule(text: str) -> Rule:
+    action, *terms = text.split()
+    matches = {}
+    for term in terms:
+        name, sep, value = term.partition('=')
+        if not sep:
+            raise ValueError(f'bad rule term {term!r}')
+        matches[name] = _parse_match(value)
+    ioa = matches.pop('ioa', None)
+    return Rule(action, ioa, **matches)
+
+def main() -> None:
+    from iec101_capture import CaptureReader, CaptureWriter
+    parser = argparse.ArgumentParser(description='Filter IEC 60870-5-101 captures with header rules')
+    parser.add_argument('capture')
+    parser.add_argument('--rule', action='append', default=[], help="e.g. 'drop type=0x24 address=7' or 'accept COT=3 ioa=100-199'")
+    parser.add_argument('--default', default=ACCEPT)
+    parser.add_argument('--unbalanced', action='store_true')
+    parser.add_argument('--profile', type=LinkProfile.parse, help="field widths, e.g. 'address=2,cot=2,ca=2,ioa=3'")
+    parser.add_argument('-o', '--output', help='write accepted frames to this capture')
+    args = parser.parse_args()
+    classify = RuleSet([parse_rule(text) for text in args.rule], args.default, not args.unbalanced, args.profile).classify
+    counts: Counter = Counter()
+    writer = CaptureWriter(args.output) if args.output else None
+    try:
+        for record in CaptureReader(args.capture):
+            action = classify(record.frame)
+            counts[action] += 1
+            if writer is not None and action != DROP:
+                writer.write(record.frame, record.direction, record.port, record.timestamp_ns)
+    finally:
+        if writer is not None:
+            writer.close()
+    for action, count in counts.most_common():
+        print(f'{action}: {count:d}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+import argparse
+import ast
+import mmap
+import os
+import struct
+from collections import deque, namedtuple
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from struct import Struct
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from iec101_capture import CaptureReader
+from iec101_codec import LinkProfile, legacy_profile, parse_frames, scan_frame
+
+PCAP_HEADER = Struct('<IHHiIII')
+PCAP_MAGICS = {
+    b'\xd4\xc3\xb2\xa1': ('<', 1e6),
+    b'\xa1\xb2\xc3\xd4': ('>', 1e6),
+    b'\x4d\x3c\xb2\xa1': ('<', 1e9),
+    b'\xa1\xb2\x3c\x4d': ('>', 1e9),
+}
+PCAP_USER_DLTS = range(147, 163)
+
+CapturedFrame = Tuple[Optional[float], bytes]
+
+IngestedFrame = namedtuple('IngestedFrame', ['time', 'raw', 'control', 'address', 'asdu', 'error'], defaults=(None,))
+
+def reassemble(records: Iterable[CapturedFrame], strict: bool = False, profile: Optional[LinkProfile] = None) -> Iterator[CapturedFrame]:
+    fixed_size = profile.fixed_size if profile is not None else 5
+    buff = bytearray()
+    stamp = None
+    for timestamp, data in records:
+        if not buff:
+            stamp = timestamp
+        buff += data
+        pos = 0
+        while True:
+            pos, size = scan_frame(buff, pos, len(buff), strict, fixed_size)
+            if not size:
+                break
+            yield stamp, bytes(buff[pos:pos + size])
+            pos += size
+            stamp = timestamp
+        del buff[:pos]
+
+def read_log(path: str, strict: bool = True, profile: Optional[LinkProfile] = None) -> Iterator[CapturedFrame]:
+    def records() -> Iterator[CapturedFrame]:
+        with open(path) as logfile:
+            for line in logfile:
+                timestamp, sep, data = line.partition(' Received: ')
+                if not sep:
+                    continue
+                try:
+                    yield float(timestamp), ast.literal_eval(data.strip())
+                except (ValueError, SyntaxError):
+                    continue
+    return reassemble(records(), strict, profile)
+
+def read_raw(path: str, strict: bool = True, profile: Optional[LinkProfile] = None) -> Iterator[CapturedFrame]:
+    with open(path, 'rb') as rawfile:
+        if not os.fstat(rawfile.fileno()).st_size:
+            return
+        with mmap.mmap(rawfile.fileno(), 0, access=mmap.ACCESS_READ) as buff:
+            for frame in parse_frames(buff, strict, profile):
+                yield None, bytes(frame)
+
+def read_pcap(path: str, strict: bool = True, profile: Optional[LinkProfile] = None) -> Iterator[CapturedFrame]:
+    def records() -> Iterator[CapturedFrame]:
+        with open(path, 'rb') as pcapfile:
+            header = pcapfile.read(PCAP_HEADER.size)
+            magic = header[:4]
+            if magic not in PCAP_MAGICS:
+                raise ValueError(f'{path}: not a pcap file')
+            endian, resolution = PCAP_MAGICS[magic]
+            linktype = Struct(f'{endian}I').unpack_from(header, 20)[0] & 0x0fffffff
+            if linktype not in PCAP_USER_DLTS:
+                raise ValueError(f'{path}: link type {linktype:d} is not a user DLT')
+            record = Struct(f'{endian}IIII')
+            while True:
+                hdr = pcapfile.read(record.size)
+                if len(hdr) < record.size:
+                    return
+                sec, frac, caplen, _ = record.unpack(hdr)
+                yield sec + frac / resolution, pcapfile.read(caplen)
+    return reassemble(records(), strict, profile)
+
+def read_cap(path: str, strict: bool = True, profile: Optional[LinkProfile] = None) -> Iterator[CapturedFrame]:
+    for record in CaptureReader(path):
+        yield record.timestamp_ns / 1e9, record.frame
+
+READERS = {
+    'cap': read_cap,
+    'log': read_log,
+    'raw': read_raw,
+    'pcap': read_pcap,
+}
+
+def capture_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.log':
+        return 'log'
+    if ext == '.cap':
+        return 'cap'
+    if ext == '.pcap':
+        return 'pcap'
+    return 'raw'
+
+def read_capture(path: str, fmt: Optional[str] = None, strict: bool = True, profile: Optional[LinkProfile] = None) -> Iterator[CapturedFrame]:
+    return READERS[fmt or capture_format(path)](path, strict, profile)
+
+def decode_frame(timestamp: Optional[float], raw: bytes, balanced: bool = True, profile: Optional[LinkProfile] = None) -> IngestedFrame:
+    if len(raw) == 1:
+        return IngestedFrame(timestamp, raw, None, None, None)
+    link = profile or legacy_profile(balanced)
+    if raw[0] == 0x10:
+        return IngestedFrame(timestamp, raw, raw[1], link.read_address(raw, 2), None)
+    try:
+        asdu = link.decode_asdu(raw, link.asdu_offset, len(raw) - 2)
+        # The Scapy fallback only understands the fixed 1-octet field widths
+        if asdu is None and profile is None:
+            from iec101 import ASDU
+            asdu = ASDU.fast_decode(raw[6:-2], balanced)
+            asdu = asdu._replace(IO=[bytes(obj) for obj in asdu.IO] if isinstance(asdu.IO, list) else bytes(asdu.IO))
+        return IngestedFrame(timestamp, raw, raw[4], link.read_address(raw, 5), asdu)
+    except (ValueError, IndexError, struct.error) as exc:
+        return IngestedFrame(timestamp, raw, raw[4], None, None, f'{type(exc).__name__}: {exc}')
+
+def decode_chunk(chunk: List[CapturedFrame], balanced: bool = True, profile: Optional[LinkProfile] = None) -> List[IngestedFrame]:
+    return [decode_frame(timestamp, raw, balanced, profile) for timestamp, raw in chunk]
+
+def show_chunk(chunk: List[CapturedFrame], balanced: bool = True, profile: Optional[LinkProfile] = None) -> List[Tuple[Optional[float], str]]:
+    from iec101 import FT12Frame
+    shown = []
+    for timestamp, raw in chunk:
+        try:
+            shown.append((timestamp, FT12Frame(raw).show2(dump=True)))
+        except Exception as exc:
+            shown.append((timestamp, f'{raw.hex()} {type(exc).__name__}: {exc}'))
+    return shown
+
+def chunked(frames: Iterable[CapturedFrame], size: int) -> Iterator[List[CapturedFrame]]:
+    frames = iter(frames)
+    while True:
+        chunk = list(islice(frames, size))
+        if not chunk:
+            return
+        yield chunk
+
+def ingest(frames: Iterable[CapturedFrame], worker: Callable[..., List[Any]] = decode_chunk, workers: Optional[int] = None,
+           chunk_size: int = 4096, balanced: bool = True, executor: Optional[Executor] = None,
+           profile: Optional[LinkProfile] = None) -> Iterator[Any]:
+    workers = workers or os.cpu_count() or 1
+    owned = executor is None
+    if owned:
+        executor = ProcessPoolExecutor(workers)
+    pending: deque = deque()
+    try:
+        for chunk in chunked(frames, chunk_size):
+            pending.append(executor.submit(worker, chunk, balanced, profile))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            executor.shutdown()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Decode IEC 60870-5-101 captures in parallel')
+    parser.add_argument('captures', nargs='+')
+    parser.add_argument('--format', choices=sorted(READERS), help='capture format (default: by file extension)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=4096)
+    parser.add_argument('--unbalanced', action='store_true')
+    parser.add_argument('--profile', type=LinkProfile.parse, help="field widths, e.g. 'address=2,cot=2,ca=2,ioa=3'")
+    parser.add_argument('--lenient', action='store_true', help='do not drop frames with bad checksums')
+    parser.add_argument('--show', action='store_true', help='print Scapy dissections instead of decoded tuples')
+    args = parser.parse_args()
+    worker = show_chunk if args.show else decode_chunk
+    with ProcessPoolExecutor(args.workers) as executor:
+        for path in args.captures:
+            frames = read_capture(path, args.format, not args.lenient, args.profile)
+            for result in ingest(frames, worker, args.workers, args.chunk_size, not args.unbalanced, executor, args.profile):
+                timestamp = result[0]
+                body = result[1] if args.show else result.asdu or result.error or result.raw.hex()
+                print(f'{timestamp if timestamp is not None else "-"} {body}')
+
+if __name__ == '__main__':
+    main()
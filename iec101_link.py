@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+
+import asyncio
+from collections import deque
+from typing import Callable, Optional, Union
+
+from scapy.packet import Packet
+from iec101 import ASDU, FT12Fixed, FT12Frame, FT12Single, FT12Variable
+from iec101_codec import encode_fixed_frame, encode_variable_frame
+from iec101_constants import CF_ACD, CF_DFC, CF_FCB, CF_FCV, CF_PRM
+from iec101_aio import IEC101LinkProtocol
+
+FC_RESET_LINK = 0x0
+FC_RESET_PROCESS = 0x1
+FC_TEST_LINK = 0x2
+FC_USER_DATA_CONFIRM = 0x3
+FC_USER_DATA_NO_REPLY = 0x4
+FC_REQUEST_STATUS = 0x9
+FC_REQUEST_CLASS_1 = 0xa
+FC_REQUEST_CLASS_2 = 0xb
+
+FC_ACK = 0x0
+FC_NACK = 0x1
+FC_USER_DATA = 0x8
+FC_NO_DATA = 0x9
+FC_STATUS = 0xb
+
+FCV_FUNCTION_CODES = frozenset({FC_TEST_LINK, FC_USER_DATA_CONFIRM, FC_REQUEST_CLASS_1, FC_REQUEST_CLASS_2})
+
+class LinkError(Exception):
+    pass
+
+class LinkBusy(LinkError):
+    pass
+
+class SecondaryLink:
+    __slots__ = ['address', 'direction', 'single_char', 'on_user_data', 'class1', 'class2', 'expected_fcb', 'last_response', 'dfc']
+
+    def __init__(self, address: int, on_user_data: Optional[Callable[[ASDU], bool]] = None, single_char: bool = True, direction: int = 0) -> None:
+        self.address = address
+        self.direction = direction
+        self.single_char = single_char
+        self.on_user_data = on_user_data
+        self.class1: deque = deque()
+        self.class2: deque = deque()
+        self.expected_fcb: Optional[int] = None
+        self.last_response: Optional[bytes] = None
+        self.dfc = False
+
+    def drained(self) -> None:
+        self.dfc = False
+
+    def accept(self, asdu: ASDU) -> bool:
+        # DFC stays set from a refused ASDU until the application calls drained() or the next ASDU is taken
+        if self.on_user_data is None:
+            return True
+        self.dfc = not self.on_user_data(asdu)
+        return not self.dfc
+
+    def status(self) -> int:
+        return self.direction | (CF_ACD if self.class1 else 0) | (CF_DFC if self.dfc else 0)
+
+    def fixed(self, fcode: int) -> bytes:
+        control = self.status()
+        if self.single_char and not control and fcode in (FC_ACK, FC_NO_DATA):
+            return b'\xe5'
+        return encode_fixed_frame(control << 4 | fcode, self.address)
+
+    def user_data(self, asdu: Union[ASDU, bytes]) -> bytes:
+        return encode_variable_frame(self.status() << 4 | FC_USER_DATA, self.address, bytes(asdu))
+
+    def handle(self, frame: FT12Frame) -> Optional[bytes]:
+        request = frame.payload
+        if not isinstance(request, (FT12Fixed, FT12Variable)) or request.getfieldval('address') != self.address:
+            return None
+        control = int(request.getfieldval('Control_Flags'))
+        if not control & CF_PRM:
+            return None
+        fcode = request.getfieldval('fcode')
+        if fcode == FC_RESET_LINK:
+            self.expected_fcb = 1
+            self.last_response = None
+            return self.fixed(FC_ACK)
+        if fcode == FC_REQUEST_STATUS:
+            return self.fixed(FC_STATUS)
+        if fcode == FC_USER_DATA_NO_REPLY:
+            if isinstance(request, FT12Variable):
+                self.accept(request.LinkUserData)
+            return None
+        if not control & CF_FCV:
+            if fcode == FC_RESET_PROCESS:
+                self.class1.clear()
+                self.class2.clear()
+                return self.fixed(FC_ACK)
+            return self.fixed(FC_NACK)
+        fcb = 1 if control & CF_FCB else 0
+        if self.expected_fcb is not None and fcb != self.expected_fcb and self.last_response is not None:
+            return self.last_response
+        response = self.process(fcode, request)
+        if response is not None:
+            self.expected_fcb = fcb ^ 1
+            self.last_response = response
+            return response
+        return self.fixed(FC_NACK)
+
+    def process(self, fcode: int, request: Packet) -> Optional[bytes]:
+        if fcode == FC_USER_DATA_CONFIRM:
+            if not isinstance(request, FT12Variable):
+                return None
+            if not self.accept(request.LinkUserData):
+                return None
+            return self.fixed(FC_ACK)
+        if fcode == FC_TEST_LINK:
+            return self.fixed(FC_ACK)
+        if fcode == FC_REQUEST_CLASS_1 and self.class1:
+            return self.user_data(self.class1.popleft())
+        if fcode == FC_REQUEST_CLASS_2 and self.class2:
+            return self.user_data(self.class2.popleft())
+        if fcode in (FC_REQUEST_CLASS_1, FC_REQUEST_CLASS_2):
+            return self.fixed(FC_NO_DATA)
+        return None
+
+class PrimaryLink:
+    __slots__ = ['address', 'direction', 'timeout', 'retries', 'fcb', 'pending', 'attempts', 'acd', 'dfc']
+
+    def __init__(self, address: int, timeout: float = 0.5, retries: int = 2, direction: int = 0) -> None:
+        self.address = address
+        self.direction = direction
+        self.timeout = timeout
+        self.retries = retries
+        self.fcb = 0
+        self.pending: Optional[Packet] = None
+        self.attempts = 0
+        self.acd = False
+        self.dfc = False
+
+    def request(self, fcode: int, asdu: Optional[ASDU] = None) -> Packet:
+        control = self.direction | CF_PRM
+        if fcode in FCV_FUNCTION_CODES:
+            control |= CF_FCV | (CF_FCB if self.fcb else 0)
+        if asdu is None:
+            self.pending = FT12Fixed(Control_Flags=control, fcode=fcode, address=self.address)
+        else:
+            self.pending = FT12Variable(Control_Flags=control, fcode=fcode, address=self.address, LinkUserData=asdu)
+        self.attempts = 1
+        return self.pending
+
+    def retransmit(self) -> Optional[Packet]:
+        if self.pending is None or self.attempts > self.retries:
+            self.pending = None
+            return None
+        self.attempts += 1
+        return self.pending
+
+    def confirm(self, frame: FT12Frame) -> bool:
+        if self.pending is None:
+            return False
+        response = frame.payload
+        if isinstance(response, FT12Single):
+            control = 0
+        elif response.getfieldval('address') == self.address and not int(response.getfieldval('Control_Flags')) & CF_PRM:
+            control = int(response.getfieldval('Control_Flags'))
+        else:
+            return False
+        fcode = self.pending.getfieldval('fcode')
+        if fcode == FC_RESET_LINK:
+            self.fcb = 1
+        elif fcode in FCV_FUNCTION_CODES and not (isinstance(response, FT12Fixed) and response.getfieldval('fcode') == FC_NACK):
+            self.fcb ^= 1
+        self.acd = bool(control & CF_ACD)
+        self.dfc = bool(control & CF_DFC)
+        self.pending = None
+        return True
+
+    async def transact(self, link: IEC101LinkProtocol, fcode: int, asdu: Optional[ASDU] = None) -> Optional[FT12Frame]:
+        if fcode == FC_USER_DATA_CONFIRM and self.dfc:
+            await self.transact(link, FC_REQUEST_STATUS)
+            if self.dfc:
+                raise LinkBusy(f'station {self.address:d} signals DFC')
+        frame = self.request(fcode, asdu)
+        while frame is not None:
+            try:
+                response = await link.request(frame, self.timeout)
+            except asyncio.TimeoutError:
+                frame = self.retransmit()
+                continue
+            if self.confirm(response):
+                return response
+            frame = self.retransmit()
+        return None
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+import asyncio
+import sys
+from time import monotonic
+from typing import Callable, Iterable, List, Optional
+
+from iec101 import FT12Frame, FT12Variable
+from iec101_aio import IEC101LinkProtocol, open_link
+from iec101_link import FC_REQUEST_CLASS_1, FC_REQUEST_CLASS_2, FC_RESET_LINK, PrimaryLink
+
+class Station:
+    __slots__ = ['address', 'primary', 'online', 'due', 'failures', 'polls', 'data_frames', 'timeouts']
+
+    def __init__(self, address: int, timeout: float, retries: int) -> None:
+        self.address = address
+        self.primary = PrimaryLink(address, timeout, retries)
+        self.online = False
+        self.due = 0.0
+        self.failures = 0
+        self.polls = 0
+        self.data_frames = 0
+        self.timeouts = 0
+
+class UnbalancedMaster:
+    def __init__(self, link: IEC101LinkProtocol, addresses: Iterable[int], timeout: float = 0.5, retries: int = 1,
+                 idle_interval: float = 1.0, max_backoff: float = 30.0,
+                 on_frame: Optional[Callable[[Station, FT12Frame], None]] = None) -> None:
+        self.link = link
+        self.stations: List[Station] = [Station(address, timeout, retries) for address in addresses]
+        if not self.stations:
+            raise ValueError('no station addresses to poll')
+        self.idle_interval = idle_interval
+        self.max_backoff = max_backoff
+        self.on_frame = on_frame
+
+    def next_station(self, now: float) -> Optional[Station]:
+        best = None
+        for station in self.stations:
+            if not station.online and station.due > now:
+                continue
+            if best is None or (not station.primary.acd, station.due) < (not best.primary.acd, best.due):
+                best = station
+        return best
+
+    async def exchange(self, station: Station, fcode: int) -> Optional[FT12Frame]:
+        response = await station.primary.transact(self.link, fcode)
+        attempts = station.primary.attempts
+        station.polls += attempts
+        station.timeouts += attempts if response is None else attempts - 1
+        return response
+
+    async def reset(self, station: Station) -> bool:
+        station.online = await self.exchange(station, FC_RESET_LINK) is not None
+        return station.online
+
+    async def poll(self, station: Station) -> None:
+        now = monotonic()
+        if not station.online:
+            if not await self.reset(station):
+                self.backoff(station, now)
+                return
+        fcode = FC_REQUEST_CLASS_1 if station.primary.acd else FC_REQUEST_CLASS_2
+        response = await self.exchange(station, fcode)
+        if response is None:
+            station.online = False
+            station.primary.acd = False
+            self.backoff(station, now)
+            return
+        station.failures = 0
+        if isinstance(response.payload, FT12Variable):
+            station.data_frames += 1
+            station.due = now
+            if self.on_frame is not None:
+                self.on_frame(station, response)
+        else:
+            station.due = now + self.idle_interval
+
+    def backoff(self, station: Station, now: float) -> None:
+        station.failures += 1
+        station.due = now + min(self.idle_interval * 2 ** station.failures, self.max_backoff)
+
+    async def run(self) -> None:
+        while True:
+            now = monotonic()
+            station = self.next_station(now)
+            if station is None:
+                await asyncio.sleep(min(station.due for station in self.stations) - now)
+                continue
+            try:
+                await self.poll(station)
+            except ConnectionError:
+                break
+
+async def amain(url: str, addresses: List[int]) -> None:
+    link = await open_link(url)
+    master = UnbalancedMaster(link, addresses, on_frame=lambda station, frame: print(f'{station.address:d}: {frame!r}'))
+    await master.run()
+
+if __name__ == '__main__':
+    asyncio.run(amain(sys.argv[1] if len(sys.argv) > 1 else '/dev/ttyS0', [int(x) for x in sys.argv[2:]] or [1]))
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+from collections import namedtuple
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from iec101_codec import IOA_LAYOUTS, SEQUENCE_TYPES, TYPE_LAYOUTS, ASDUError, LinkProfile, legacy_profile
+
+DTYPE_CODES = {
+    'B': 'u1',
+    '<H': '<u2',
+    '>H': '>u2',
+    '<h': '<i2',
+    '<e': '<f2',
+    '>f': '>f4',
+    '<i': '<i4',
+    '>I': '>u4',
+    '3s': ('u1', (3,)),
+    '7s': ('u1', (7,)),
+}
+
+SEQUENCE_DTYPES = {
+    type_id: np.dtype([(fname, DTYPE_CODES[code]) for fname, code in TYPE_LAYOUTS[type_id][1]])
+    for type_id in SEQUENCE_TYPES
+}
+
+ColumnarASDU = namedtuple('ColumnarASDU', ['type', 'COT_flags', 'COT', 'CommonAddress', 'IOA', 'values', 'originator'], defaults=(0,))
+
+def decode_sequence(buff: Any, offset: int = 0, balanced: bool = True, end: Optional[int] = None,
+                    profile: Optional[LinkProfile] = None) -> Optional[ColumnarASDU]:
+    if profile is None:
+        profile = legacy_profile(balanced)
+    if end is None:
+        end = len(buff)
+    header = profile.header
+    if offset + header.size > end:
+        raise ASDUError(f'ASDU of {end - offset:d} bytes is shorter than its header')
+    if profile.cot_width == 2:
+        type_id, vsq, cot, originator, common_address = header.unpack_from(buff, offset)
+    else:
+        type_id, vsq, cot, common_address = header.unpack_from(buff, offset)
+        originator = 0
+    if not vsq >> 7 or type_id not in SEQUENCE_DTYPES:
+        return None
+    number = vsq & 0x7f
+    ioa = IOA_LAYOUTS[profile.ioa_overrides.get(type_id, profile.ioa_width)]
+    offset += header.size
+    if offset + ioa.size + number * SEQUENCE_DTYPES[type_id].itemsize > end:
+        raise ASDUError(f'{number:d} objects of type 0x{type_id:02x} overrun the ASDU')
+    base = ioa.unpack_from(buff, offset)[0]
+    values = np.frombuffer(buff, dtype=SEQUENCE_DTYPES[type_id], count=number, offset=offset + ioa.size)
+    return ColumnarASDU(type_id, cot >> 6, cot & 0x3f, common_address, np.arange(base, base + number, dtype=np.uint32), values, originator)
+
+def flag_columns(column: np.ndarray, flags: Dict[int, str]) -> Dict[str, np.ndarray]:
+    return {name: (column >> bit) & 1 == 1 for bit, name in flags.items()}
+
+MS_PER_MINUTE = 60000
+MS_PER_HOUR = 3600000
+
+def _tag_array(tags: Any, width: int) -> np.ndarray:
+    tags = np.asarray(tags)
+    if tags.dtype.kind == 'S':
+        tags = tags.view(np.uint8)
+    return tags.reshape(-1, width)
+
+def cp56_to_datetime64(tags: Any, century: int = 2000, utc_offset_minutes: Optional[int] = None,
+                       dst_offset_minutes: int = 60, mask_invalid: bool = True) -> np.ndarray:
+    tags = _tag_array(tags, 7).astype(np.int64)
+    month = tags[:, 5] & 0x0f
+    day = tags[:, 4] & 0x1f
+    months = (century + (tags[:, 6] & 0x7f) - 1970) * 12 + month - 1
+    first = months.astype('datetime64[M]')
+    days = first.astype('datetime64[D]') + (day - 1)
+    month_days = ((first + 1).astype('datetime64[D]') - first.astype('datetime64[D]')).astype(np.int64)
+    hour = tags[:, 3] & 0x1f
+    minute = tags[:, 2] & 0x3f
+    milliseconds = tags[:, 0] | tags[:, 1] << 8
+    offset = hour * MS_PER_HOUR + minute * MS_PER_MINUTE + milliseconds
+    if utc_offset_minutes is not None:
+        offset -= (utc_offset_minutes + np.where(tags[:, 3] & 0x80, dst_offset_minutes, 0)) * MS_PER_MINUTE
+    result = days.astype('datetime64[ms]') + offset.astype('timedelta64[ms]')
+    bad = (month == 0) | (month > 12) | (day == 0) | (day > month_days) | (hour > 23) | (minute > 59) | (milliseconds >= MS_PER_MINUTE)
+    if mask_invalid:
+        bad |= (tags[:, 2] & 0x80) != 0
+    result[bad] = np.datetime64('NaT')
+    return result
+
+def datetime64_to_cp56(values: Any, century: int = 2000, invalid: Any = False, summer_time: Any = False) -> np.ndarray:
+    values = np.asarray(values, dtype='datetime64[ms]')
+    years = values.astype('datetime64[Y]')
+    months = values.astype('datetime64[M]')
+    days = values.astype('datetime64[D]')
+    year = years.astype(np.int64) + 1970 - century
+    if np.any((year < 0) | (year > 99)):
+        raise ValueError(f'timestamps outside the {century:d} century')
+    milliseconds = (values - days).astype(np.int64)
+    tags = np.empty((values.size, 7), dtype=np.uint8)
+    seconds = milliseconds % MS_PER_MINUTE
+    tags[:, 0] = seconds & 0xff
+    tags[:, 1] = seconds >> 8
+    tags[:, 2] = (milliseconds // MS_PER_MINUTE) % 60 | np.where(invalid, 0x80, 0)
+    tags[:, 3] = milliseconds // MS_PER_HOUR | np.where(summer_time, 0x80, 0)
+    tags[:, 4] = (((days.astype(np.int64) + 3) % 7 + 1) << 5) | ((days - months).astype(np.int64) + 1)
+    tags[:, 5] = (months - years).astype(np.int64) + 1
+    tags[:, 6] = year
+    return tags
+
+def cp24_to_datetime64(tags: Any, reference: Any, mask_invalid: bool = True) -> np.ndarray:
+    tags = _tag_array(tags, 3).astype(np.int64)
+    reference = np.asarray(reference, dtype='datetime64[ms]')
+    hours = reference.astype('datetime64[h]').astype('datetime64[ms]')
+    offset = (tags[:, 2] & 0x3f) * MS_PER_MINUTE + (tags[:, 0] | tags[:, 1] << 8)
+    result = hours + offset.astype('timedelta64[ms]')
+    drift = (result - reference).astype(np.int64)
+    result = result - np.where(drift > 30 * MS_PER_MINUTE, MS_PER_HOUR, 0).astype('timedelta64[ms]')
+    result = result + np.where(drift < -30 * MS_PER_MINUTE, MS_PER_HOUR, 0).astype('timedelta64[ms]')
+    if mask_invalid:
+        result[(tags[:, 2] & 0x80) != 0] = np.datetime64('NaT')
+    return result
+
+def datetime64_to_cp24(values: Any, invalid: Any = False) -> np.ndarray:
+    values = np.asarray(values, dtype='datetime64[ms]')
+    milliseconds = (values - values.astype('datetime64[h]')).astype(np.int64)
+    tags = np.empty((values.size, 3), dtype=np.uint8)
+    seconds = milliseconds % MS_PER_MINUTE
+    tags[:, 0] = seconds & 0xff
+    tags[:, 1] = seconds >> 8
+    tags[:, 2] = milliseconds // MS_PER_MINUTE | np.where(invalid, 0x80, 0)
+    return tags
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+from array import array
+from collections import namedtuple
+from datetime import datetime, timezone
+from time import time_ns
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+
+from iec101_codec import DecodedASDU, cp24_to_datetime, cp56_to_datetime
+from iec101_records import RECORD_TYPES, Record, record_value, records_from_decoded
+
+PointKey = Tuple[int, int, Type[Record]]
+
+PointState = namedtuple('PointState', ['value', 'quality', 'timestamp_ns'])
+
+Subscriber = Callable[[PointKey, PointState], None]
+
+def _timestamp_ns(tag: Optional[bytes], received_ns: int) -> int:
+    if not tag:
+        return received_ns
+    try:
+        if len(tag) == 7:
+            value = cp56_to_datetime(tag)
+        else:
+            reference = datetime.fromtimestamp(received_ns / 1e9, timezone.utc).replace(tzinfo=None)
+            value = cp24_to_datetime(tag, reference)
+    except ValueError:
+        return received_ns
+    if value is None:
+        return received_ns
+    return int(value.replace(tzinfo=timezone.utc).timestamp() * 1000) * 1000000
+
+class PointDatabase:
+    def __init__(self) -> None:
+        self.index: Dict[PointKey, int] = {}
+        self.keys: List[PointKey] = []
+        self.values = array('d')
+        self.qualities = array('B')
+        self.timestamps = array('q')
+        self.point_subscribers: Dict[int, List[Subscriber]] = {}
+        self.subscribers: List[Subscriber] = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: PointKey) -> bool:
+        return key in self.index
+
+    def slot(self, key: PointKey) -> int:
+        slot = self.index.get(key)
+        if slot is None:
+            slot = self.index[key] = len(self.keys)
+            self.keys.append(key)
+            self.values.append(float('nan'))
+            self.qualities.append(0)
+            self.timestamps.append(0)
+        return slot
+
+    def get(self, common_address: int, ioa: int, family: Type[Record]) -> Optional[PointState]:
+        slot = self.index.get((common_address, ioa, family))
+        if slot is None:
+            return None
+        return PointState(self.values[slot], self.qualities[slot], self.timestamps[slot])
+
+    def update(self, key: PointKey, value: float, quality: int, timestamp_ns: int) -> bool:
+        slot = self.slot(key)
+        previous = self.values[slot]
+        # A slot that was never updated has timestamp 0, and NaN values compare equal to each other
+        changed = (not self.timestamps[slot] or self.qualities[slot] != quality
+                   or (previous != value and (previous == previous or value == value)))
+        self.values[slot] = value
+        self.qualities[slot] = quality
+        self.timestamps[slot] = timestamp_ns
+        if changed and (self.subscribers or slot in self.point_subscribers):
+            state = PointState(value, quality, timestamp_ns)
+            for callback in self.point_subscribers.get(slot, ()):
+                callback(key, state)
+            for callback in self.subscribers:
+                callback(key, state)
+        return changed
+
+    def apply(self, asdu: Union[DecodedASDU, Any], received_ns: Optional[int] = None) -> int:
+        records = records_from_decoded(asdu) if isinstance(asdu, DecodedASDU) else asdu.to_records()
+        family = RECORD_TYPES[asdu.type]
+        received_ns = time_ns() if received_ns is None else received_ns
+        changed = 0
+        for record in records:
+            value, quality = record_value(record)
+            if self.update((asdu.CommonAddress, record.ioa, family), value, quality, _timestamp_ns(record.time, received_ns)):
+                changed += 1
+        return changed
+
+    def subscribe(self, callback: Subscriber, key: Optional[PointKey] = None) -> None:
+        if key is None:
+            self.subscribers.append(callback)
+        else:
+            self.point_subscribers.setdefault(self.slot(key), []).append(callback)
+
+    def unsubscribe(self, callback: Subscriber, key: Optional[PointKey] = None) -> None:
+        if key is None:
+            self.subscribers.remove(callback)
+        else:
+            self.point_subscribers[self.index[key]].remove(callback)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from iec101_codec import TYPE_LAYOUTS, DecodedASDU
+
+class Record:
+    __slots__: Tuple[str, ...] = ()
+    _fields: Tuple[str, ...] = ()
+
+    def __iter__(self) -> Iterator[Any]:
+        return (getattr(self, name) for name in self._fields)
+
+    def __eq__(self, other: Any) -> bool:
+        return type(self) is type(other) and tuple(self) == tuple(other)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)})'
+
+class SinglePoint(Record):
+    __slots__ = _fields = ('ioa', 'siq', 'time')
+
+    def __init__(self, ioa: int, siq: int, time: Optional[bytes] = None) -> None:
+        self.ioa = ioa
+        self.siq = siq
+        self.time = time
+
+class DoublePoint(Record):
+    __slots__ = _fields = ('ioa', 'diq', 'time')
+
+    def __init__(self, ioa: int, diq: int, time: Optional[bytes] = None) -> None:
+        self.ioa = ioa
+        self.diq = diq
+        self.time = time
+
+class QualifiedRecord(Record):
+    __slots__ = _fields = ('ioa', 'value', 'qds', 'time')
+
+    def __init__(self, ioa: int, value: Any, qds: int = 0, time: Optional[bytes] = None) -> None:
+        self.ioa = ioa
+        self.value = value
+        self.qds = qds
+        self.time = time
+
+class StepPosition(QualifiedRecord):
+    __slots__ = ()
+
+class Bitstring(QualifiedRecord):
+    __slots__ = ()
+
+class MeasuredNormalized(QualifiedRecord):
+    __slots__ = ()
+
+class MeasuredScaled(QualifiedRecord):
+    __slots__ = ()
+
+class MeasuredFloat(QualifiedRecord):
+    __slots__ = ()
+
+class IntegratedTotal(QualifiedRecord):
+    __slots__ = ()
+
+RECORD_TYPES: Dict[int, Type[Record]] = {
+    0x01: SinglePoint,
+    0x02: SinglePoint,
+    0x1e: SinglePoint,
+    0x03: DoublePoint,
+    0x04: DoublePoint,
+    0x1f: DoublePoint,
+    0x05: StepPosition,
+    0x06: StepPosition,
+    0x20: StepPosition,
+    0x07: Bitstring,
+    0x08: Bitstring,
+    0x09: MeasuredNormalized,
+    0x0a: MeasuredNormalized,
+    0x15: MeasuredNormalized,
+    0x22: MeasuredNormalized,
+    0x0b: MeasuredScaled,
+    0x0c: MeasuredScaled,
+    0x23: MeasuredScaled,
+    0x0d: MeasuredFloat,
+    0x0e: MeasuredFloat,
+    0x24: MeasuredFloat,
+    0x0f: IntegratedTotal,
+    0x10: IntegratedTotal,
+    0x25: IntegratedTotal,
+}
+
+DEFAULT_TYPES: Dict[Type[Record], int] = {
+    SinglePoint: 0x01,
+    DoublePoint: 0x03,
+    StepPosition: 0x05,
+    Bitstring: 0x07,
+    MeasuredNormalized: 0x09,
+    MeasuredScaled: 0x0b,
+    MeasuredFloat: 0x0d,
+    IntegratedTotal: 0x0f,
+}
+
+TIME_WIDTHS = {type_id: int(fields[-1][1][0]) for type_id, (_, fields) in TYPE_LAYOUTS.items() if fields and fields[-1][0] == 'time'}
+
+def records_from_decoded(decoded: DecodedASDU) -> List[Record]:
+    cls = RECORD_TYPES.get(decoded.type)
+    if cls is None or not isinstance(decoded.IO, list):
+        raise ValueError(f'no record class for type 0x{decoded.type:02x}')
+    return [cls(*obj) for obj in decoded.IO]
+
+def record_to_object(type_id: int, record: Record) -> Tuple:
+    size = len(TYPE_LAYOUTS[type_id][1]) + 1
+    values = tuple(record)
+    if type_id in TIME_WIDTHS:
+        return values[:size - 1] + (record.time if record.time is not None else bytes(TIME_WIDTHS[type_id]),)
+    return values[:size]
+
+def records_to_objects(type_id: int, records: Iterable[Record]) -> List[Tuple]:
+    return [record_to_object(type_id, record) for record in records]
+
+def record_value(record: Record) -> Tuple[float, int]:
+    if isinstance(record, SinglePoint):
+        return record.siq & 0x01, record.siq & 0xf0
+    if isinstance(record, DoublePoint):
+        return record.diq & 0x03, record.diq & 0xf0
+    if isinstance(record, StepPosition):
+        return (record.value & 0x7f) - (record.value & 0x40) * 2, record.qds
+    if isinstance(record, IntegratedTotal):
+        # The low five bits of the BCR flags octet are the sequence number, not quality
+        return record.value, record.qds & 0xe0
+    return record.value, record.qds
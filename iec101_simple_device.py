@@ -1,24 +1,32 @@
 #!/usr/bin/env python3
 
+import sys
 import serial
-from time import time, time_ns
-from iec101 import FT12Frame
+from time import time
+from iec101 import FT12StreamDecoder
+from iec101_capture import DIR_RX, DIR_TX, CaptureWriter
+from iec101_link import SecondaryLink
 
-def main():
+def main(address: int = 1):
+    decoder = FT12StreamDecoder()
+    link = SecondaryLink(address)
     with serial.Serial('/dev/ttyS0', 9600, timeout=3) as ss:
-        with open(f'iec101_{int(time())}.log', 'w') as logfile:
+        with CaptureWriter(f'iec101_{int(time())}.cap') as capture:
             while True:
                 try:
                     buff = ss.read(2048)
                     if len(buff) > 0:
-                        ss.write(b'\xe5')
-                        print(f'Received {len(buff):d} bytes:')
-                        logfile.write(f'{float((time_ns()//1000))/1000000:0.6f} Received: {repr(buff)}\n')
-                        frame = FT12Frame(buff).show2(dump=True)
-                        print(frame)
-                        logfile.write(frame)
+                        print(f'Received {len(buff):d} bytes')
+                        decoder.feed(buff)
+                        for frame in decoder:
+                            capture.write(bytes(frame), DIR_RX)
+                            response = link.handle(frame)
+                            if response is not None:
+                                response = bytes(response)
+                                ss.write(response)
+                                capture.write(response, DIR_TX)
                 except KeyboardInterrupt:
                     break
 
 if __name__ == '__main__':
-    main()
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1)
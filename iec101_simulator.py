@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import random
+from collections import deque
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+from iec101 import ASDU
+from iec101_aio import IEC101LinkProtocol, open_link
+from iec101_codec import MAX_ASDU_LENGTH, datetime_to_cp56, encode_asdu, pack_asdus
+from iec101_link import SecondaryLink
+from iec101_records import (
+    DEFAULT_TYPES, TIME_WIDTHS, Bitstring, DoublePoint, IntegratedTotal, MeasuredFloat, MeasuredNormalized,
+    MeasuredScaled, Record, SinglePoint, StepPosition, record_to_object
+)
+
+COT_SPONT = 3
+COT_ACT = 6
+COT_ACTCON = 7
+COT_DEACT = 8
+COT_DEACTCON = 9
+COT_ACTTERM = 10
+COT_INROGEN = 20
+COT_REQCOGEN = 37
+COT_UNKNOWN_TYPE = 44
+COT_UNKNOWN_COT = 45
+COT_UNKNOWN_CA = 46
+COT_NEGATIVE = 1
+
+QOI_STATION = 20
+RQT_GENERAL = 5
+
+EVENT_TYPES: Dict[Type[Record], int] = {
+    SinglePoint: 0x1e,
+    DoublePoint: 0x1f,
+    StepPosition: 0x20,
+    Bitstring: 0x07,
+    MeasuredNormalized: 0x22,
+    MeasuredScaled: 0x23,
+    MeasuredFloat: 0x24,
+    IntegratedTotal: 0x25,
+}
+
+def _change(record: Record) -> None:
+    if isinstance(record, SinglePoint):
+        record.siq ^= 0x01
+    elif isinstance(record, DoublePoint):
+        record.diq ^= 0x03
+    elif isinstance(record, StepPosition):
+        record.value = (record.value + 1) & 0x3f
+    elif isinstance(record, Bitstring):
+        record.value ^= 1 << random.randrange(32)
+    elif isinstance(record, MeasuredNormalized):
+        record.value = min(0.999, max(-1.0, record.value + random.uniform(-0.01, 0.01)))
+    elif isinstance(record, MeasuredScaled):
+        record.value = min(0x7fff, max(-0x8000, record.value + random.randint(-10, 10)))
+    elif isinstance(record, MeasuredFloat):
+        record.value += random.gauss(0.0, 1.0)
+    elif isinstance(record, IntegratedTotal):
+        record.value = (record.value + random.randint(1, 10)) & 0x7fffffff
+
+class Outstation:
+    def __init__(self, address: int, common_address: int, points: Iterable[Record], rate: float = 0.0,
+                 buffer_size: int = 1000, max_asdu_length: int = MAX_ASDU_LENGTH) -> None:
+        self.common_address = common_address
+        self.link = SecondaryLink(address, on_user_data=self.on_user_data)
+        self.points: Dict[int, Dict[int, Record]] = {}
+        for record in points:
+            self.points.setdefault(DEFAULT_TYPES[type(record)], {})[record.ioa] = record
+        self.records = [record for table in self.points.values() for record in table.values()]
+        self.rate = rate
+        self.buffer_size = buffer_size
+        self.max_asdu_size = max_asdu_length
+        self.overflows = 0
+
+    def queue(self, queue: deque, asdus: Iterable[bytes]) -> None:
+        queue.extend(asdus)
+
+    def confirm(self, type_id: int, objects: List[Tuple], COT: int, negative: bool = False) -> bytes:
+        return encode_asdu(type_id, objects, COT, self.common_address, COT_flags=COT_NEGATIVE if negative else 0)
+
+    def snapshot(self, counters: bool, COT: int) -> List[bytes]:
+        asdus = []
+        for type_id, table in self.points.items():
+            if (type_id == DEFAULT_TYPES[IntegratedTotal]) == counters:
+                objects = [record_to_object(type_id, record) for record in table.values()]
+                asdus.extend(pack_asdus(type_id, objects, COT, self.common_address, self.max_asdu_size))
+        return asdus
+
+    def on_user_data(self, request: ASDU) -> bool:
+        decoded = ASDU.fast_decode(bytes(request))
+        objects = decoded.IO if isinstance(decoded.IO, list) else []
+        if decoded.CommonAddress not in (self.common_address, 0xff):
+            self.queue(self.link.class1, [self.confirm(decoded.type, objects, COT_UNKNOWN_CA, True)])
+        elif decoded.type in (0x64, 0x65) and objects and decoded.COT != COT_ACT:
+            # Interrogation replies are queued in full on activation, so a deactivation is simply confirmed
+            if decoded.COT == COT_DEACT:
+                self.queue(self.link.class1, [self.confirm(decoded.type, objects, COT_DEACTCON)])
+            else:
+                self.queue(self.link.class1, [self.confirm(decoded.type, objects, COT_UNKNOWN_COT, True)])
+        elif decoded.type == 0x64 and objects:
+            qoi = objects[0].QOI
+            asdus = self.snapshot(False, COT_INROGEN) if qoi == QOI_STATION else []
+            self.queue(self.link.class2, [self.confirm(0x64, objects, COT_ACTCON)] + asdus + [self.confirm(0x64, objects, COT_ACTTERM)])
+        elif decoded.type == 0x65 and objects:
+            rqt = objects[0].QCC & 0x3f
+            asdus = self.snapshot(True, COT_REQCOGEN) if rqt == RQT_GENERAL else []
+            self.queue(self.link.class2, [self.confirm(0x65, objects, COT_ACTCON)] + asdus + [self.confirm(0x65, objects, COT_ACTTERM)])
+        elif objects:
+            self.queue(self.link.class1, [self.confirm(decoded.type, objects, COT_UNKNOWN_TYPE, True)])
+        return True
+
+    def generate(self, count: int) -> None:
+        events: Dict[int, List[Tuple]] = {}
+        tag = datetime_to_cp56(datetime.now())
+        for record in random.sample(self.records, min(count, len(self.records))):
+            _change(record)
+            type_id = EVENT_TYPES[type(record)]
+            obj = record_to_object(type_id, record)
+            events.setdefault(type_id, []).append(obj[:-1] + (tag,) if type_id in TIME_WIDTHS else obj)
+        for type_id, objects in events.items():
+            self.queue(self.link.class1, pack_asdus(type_id, objects, COT_SPONT, self.common_address, self.max_asdu_size))
+        while len(self.link.class1) > self.buffer_size:
+            self.link.class1.popleft()
+            self.overflows += 1
+
+    async def spontaneous(self, interval: float = 0.1) -> None:
+        pending = 0.0
+        while True:
+            await asyncio.sleep(interval)
+            pending += self.rate * interval
+            if pending >= 1:
+                self.generate(int(pending))
+                pending -= int(pending)
+
+    async def serve(self, link: IEC101LinkProtocol) -> None:
+        task = asyncio.create_task(self.spontaneous()) if self.rate > 0 else None
+        try:
+            while True:
+                try:
+                    frame = await link.receive()
+                except ConnectionError:
+                    break
+                response = self.link.handle(frame)
+                if response is not None:
+                    await link.send(response)
+        finally:
+            if task is not None:
+                task.cancel()
+
+def make_points(count: int) -> List[Record]:
+    kinds = [SinglePoint, DoublePoint, MeasuredScaled, MeasuredFloat, IntegratedTotal]
+    points: List[Record] = []
+    for index in range(count):
+        cls = kinds[index * len(kinds) // count]
+        ioa = index + 1
+        if cls is SinglePoint:
+            points.append(SinglePoint(ioa, 0))
+        elif cls is DoublePoint:
+            points.append(DoublePoint(ioa, 1))
+        else:
+            points.append(cls(ioa, 0))
+    return points
+
+async def amain(url: str, address: int, common_address: int, count: int, rate: float) -> None:
+    link = await open_link(url)
+    print(f'outstation {address:d}/{common_address:d} with {count:d} points on {link.name}')
+    await Outstation(address, common_address, make_points(count), rate).serve(link)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Simulate an IEC 60870-5-101 outstation')
+    parser.add_argument('port', nargs='?', default='pty', help="serial port, tcp://host:port or 'pty' for a new pseudo-terminal")
+    parser.add_argument('--address', type=int, default=1)
+    parser.add_argument('--common-address', type=int, default=1)
+    parser.add_argument('--points', type=int, default=1000)
+    parser.add_argument('--rate', type=float, default=10.0, help='spontaneous changes per second')
+    args = parser.parse_args()
+    asyncio.run(amain(args.port, args.address, args.common_address, args.points, args.rate))
@@ -0,0 +1,245 @@
+from datetime import datetime
+
+import pytest
+
+from scapy.fields import PacketListField
+
+from iec101 import (
+    ASDU, IO13, IO30, IO45, IO100, TYPEID_ASDU, VSQ, CP56Time2a, FT12Fixed, FT12Frame, FT12StreamDecoder, FT12Variable, LazyIO, ShortFloat,
+    io_list_field, io_types, lazy_dissection, register_io, strict_dissection, unregister_io
+)
+from iec101_codec import FT12Error, datetime_to_cp56, encode_asdu, encode_fixed_frame, encode_variable_frame
+
+def _objects(count):
+    return [(100 + index, float(index), 0) for index in range(count)]
+
+def test_list_types_dissect_number_objects():
+    asdu = ASDU(encode_asdu(0x0d, _objects(3), 3, 1))
+    assert [io.IOA for io in asdu.IO] == [100, 101, 102]
+    assert [io.value.value for io in asdu.IO] == [0.0, 1.0, 2.0]
+
+def test_list_types_stop_at_truncation():
+    raw = encode_asdu(0x0d, _objects(3), 3, 1)
+    asdu = ASDU(raw[:-4])
+    assert [io.IOA for io in asdu.IO[:2]] == [100, 101]
+    assert bytes(asdu) == raw[:-4]
+
+def test_sequence_and_single_types_dissect_one_packet():
+    sequence = ASDU(encode_asdu(0x0d, _objects(3), 20, 1, 1))
+    assert isinstance(sequence.IO, IO13)
+    assert sequence.IO.IOA == 100
+    command = ASDU(encode_asdu(0x2d, [(5, 1)], 6, 1))
+    assert isinstance(command.IO, IO45)
+    assert command.IO.IOA == 5
+
+def test_unknown_types_keep_raw_bytes():
+    asdu = ASDU(b'\x99\x01\x03\x01abc')
+    assert asdu.IO == b'abc'
+
+@pytest.mark.parametrize('type_id, sq', [(0x0d, 0), (0x0d, 1), (0x2d, 0)])
+def test_build_round_trip(type_id, sq):
+    raw = bytes(ASDU(type=type_id, VSQ=VSQ(SQ=sq, number=1), COT=3, CommonAddress=1))
+    assert bytes(ASDU(raw)) == raw
+
+@pytest.fixture
+def private_types():
+    type_field = ASDU.fields_desc[0]
+    names, i2s, s2i = dict(TYPEID_ASDU), dict(type_field.i2s), dict(type_field.s2i)
+    registered = []
+
+    def register(type_id, fld, **kwargs):
+        register_io(type_id, fld, **kwargs)
+        registered.append(type_id)
+
+    yield register
+    for type_id in registered:
+        unregister_io(type_id)
+    for table, saved in ((TYPEID_ASDU, names), (type_field.i2s, i2s), (type_field.s2i, s2i)):
+        table.clear()
+        table.update(saved)
+
+def test_register_io(private_types):
+    private_types(0x88, io_list_field(IO13), name='P_TEST (136)')
+    raw = b'\x88' + encode_asdu(0x0d, _objects(2), 3, 1)[1:]
+    asdu = ASDU(raw)
+    assert [io.IOA for io in asdu.IO] == [100, 101]
+    assert bytes(asdu) == raw
+    assert TYPEID_ASDU[0x88] == 'P_TEST (136)'
+
+def test_registered_field_controls_dissection(private_types):
+    private_types(0x89, PacketListField('IO', [], IO13, length_from=lambda pkt: 7))
+    raw = b'\x89' + encode_asdu(0x0d, _objects(3), 3, 1)[1:]
+    asdu = ASDU(raw)
+    assert [io.IOA for io in asdu.IO] == [100]
+    assert bytes(asdu) == raw
+    unregister_io(0x89)
+    assert ASDU(raw).IO == raw[4:]
+
+def test_io_types_cover_the_named_io_classes(private_types):
+    types = io_types()
+    assert types == sorted(types) and 0x0d in types and 0x7d in types
+    private_types(0x88, io_list_field(IO13), name='P_TEST (136)')
+    assert io_types() == types
+
+def test_fresh_asdu_has_the_type_default():
+    asdu = ASDU(type=0x64, COT=6, CommonAddress=1)
+    assert isinstance(asdu.IO, IO100)
+    asdu.IO.QOI = 20
+    assert bytes(asdu) == bytes.fromhex('640006010000' + '14')
+    assert ASDU(type=0x64).IO.QOI == 0
+    assert 'IO100' in repr(ASDU(bytes(asdu)))
+    assert ASDU(type=0x0d).IO == []
+
+def test_dissection_is_eager_by_default():
+    raw = encode_asdu(0x0d, _objects(3), 3, 1)
+    asdu = ASDU(raw)
+    assert isinstance(asdu.getfieldval('IO'), list)
+    assert asdu == ASDU(raw, lazy=False)
+    assert asdu == ASDU(raw, lazy=True)
+
+@pytest.mark.parametrize('lazy', ['kwarg', 'context'])
+def test_lazy_dissection_defers_objects(lazy):
+    raw = encode_asdu(0x0d, _objects(3), 3, 1)
+    if lazy == 'kwarg':
+        asdu = ASDU(raw, lazy=True)
+    else:
+        with lazy_dissection():
+            asdu = ASDU(raw)
+    assert isinstance(asdu.getfieldval('IO'), LazyIO)
+    assert asdu.COT == 3
+    assert bytes(asdu) == raw
+    assert [io.IOA for io in asdu.IO] == [100, 101, 102]
+    assert isinstance(asdu.getfieldval('IO'), list)
+    asdu.COT = 20
+    assert bytes(asdu) == raw[:2] + b'\x14' + raw[3:]
+
+def test_lazy_dissection_is_scoped():
+    raw = encode_asdu(0x0d, _objects(3), 3, 1)
+    with lazy_dissection():
+        pass
+    assert not isinstance(ASDU(raw).getfieldval('IO'), LazyIO)
+    frame = encode_variable_frame(0x08, 1, raw)
+    with lazy_dissection():
+        lazy = FT12Frame(frame).payload.LinkUserData
+    assert isinstance(lazy.getfieldval('IO'), LazyIO)
+    assert not isinstance(FT12Frame(frame).payload.LinkUserData.getfieldval('IO'), LazyIO)
+
+def test_lazy_dissection_keeps_packet_methods():
+    assert 'do_dissect' not in ASDU.__dict__
+    assert 'getfieldval' not in ASDU.__dict__
+    raw = encode_asdu(0x0d, _objects(2), 3, 1)
+    assert ASDU(raw, lazy=True).copy() == ASDU(raw)
+    eager, lazy = ASDU(raw + b'\xaa'), ASDU(raw + b'\xaa', lazy=True)
+    assert repr(lazy) == repr(eager)
+    assert bytes(lazy.payload) == bytes(eager.payload) == b'\xaa'
+    assert bytes(lazy) == bytes(eager) == raw + b'\xaa'
+
+def test_fast_decode_falls_back_with_the_ioa_width():
+    asdu = b'\x7d\x01\x0d\x01' + bytes.fromhex('452301') + b'\x02\x00\x01\x03abc'
+    decoded = ASDU.fast_decode(asdu, balanced=False)
+    assert decoded.IO[0].IOA == 0x012345
+    assert decoded.IO[0].segment == b'abc'
+    assert ASDU(asdu, balanced=False).IO[0].IOA == 0x012345
+    assert ASDU(asdu, balanced=False, lazy=True).IO[0].IOA == 0x012345
+
+def test_variable_frame_fills_lengths_and_checksum():
+    asdu = encode_asdu(0x0d, _objects(2), 3, 1)
+    frame = FT12Variable(Control_Flags=0, fcode=0x8, address=1, LinkUserData=ASDU(asdu))
+    assert bytes(frame) == encode_variable_frame(0x08, 1, asdu)
+    assert bytes(FT12Variable(length_1=9, LinkUserData=ASDU(asdu)))[1:3] == bytes([9, len(asdu) + 2])
+
+def test_fixed_frame_fills_checksum():
+    assert bytes(FT12Fixed(Control_Flags=0x4, fcode=0x9, address=7)) == encode_fixed_frame(0x49, 7)
+    assert bytes(FT12Fixed(Control_Flags=0x4, fcode=0x9, address=7, checksum=0))[3] == 0
+
+def _fast_build_cases():
+    tag = datetime_to_cp56(datetime(2024, 5, 6, 7, 8, 9, 123000))
+    return [
+        (0x0d, 0, _objects(2), [IO13(IOA=100 + index, value=ShortFloat(value=float(index))) for index in range(2)]),
+        (0x0d, 1, _objects(3), IO13(sq=1, IOA=100, value=[ShortFloat(value=float(index)) for index in range(3)])),
+        (0x1e, 0, [(5, 0x01, tag), (6, 0x80, tag)], [IO30(IOA=5, SIQ=0x01, time=CP56Time2a(tag)), IO30(IOA=6, SIQ=0x80, time=CP56Time2a(tag))]),
+    ]
+
+@pytest.mark.parametrize('type_id, sq, objects, io', _fast_build_cases())
+def test_fast_build_matches_scapy_build(type_id, sq, objects, io):
+    asdu = ASDU(type=type_id, VSQ=VSQ(SQ=sq, number=len(objects)), COT=3, CommonAddress=1, IO=io)
+    assert ASDU.fast_build(type_id, objects, 3, 1, sq) == bytes(asdu)
+    frame = FT12Variable(Control_Flags=0, fcode=0x8, address=1, LinkUserData=asdu)
+    assert FT12Variable.fast_build(0, 0x8, 1, type_id, objects, 3, 1, sq) == bytes(frame)
+
+def test_fixed_fast_build_matches_scapy_build():
+    assert FT12Fixed.fast_build(0x4, 0x9, 7) == bytes(FT12Fixed(Control_Flags=0x4, fcode=0x9, address=7))
+
+def _bad_frames():
+    good = encode_variable_frame(0x08, 1, encode_asdu(0x0d, _objects(1), 3, 1))
+    bad_checksum = good[:-2] + bytes([good[-2] ^ 0xff]) + good[-1:]
+    bad_length = good[:2] + bytes([good[2] + 1]) + good[3:]
+    fixed = encode_fixed_frame(0x49, 7)
+    return good, [bad_checksum, bad_length, fixed[:3] + b'\x00' + fixed[4:]]
+
+@pytest.mark.parametrize('index', range(3))
+def test_strict_rejects_bad_frames(index):
+    good, bad = _bad_frames()
+    frame = bad[index]
+    assert FT12Frame(frame)
+    with pytest.raises(FT12Error):
+        FT12Frame(frame, strict=True)
+    with pytest.raises(FT12Error):
+        with strict_dissection():
+            FT12Frame(frame)
+    cls = FT12Fixed if frame[0] == 0x10 else FT12Variable
+    with pytest.raises(FT12Error):
+        cls(frame, strict=True)
+    assert bytes(FT12Frame(good, strict=True)) == good
+
+def test_strict_rejects_garbage_and_is_scoped():
+    with pytest.raises(FT12Error):
+        FT12Frame(b'\x42\x00\x16', strict=True)
+    assert FT12Frame(b'\xe5', strict=True).payload.acknowledge == 0xe5
+    with strict_dissection():
+        pass
+    _, bad = _bad_frames()
+    assert FT12Frame(bad[0]).payload.name == 'FT 1.2 Variable Length'
+
+def _stream_frames():
+    return [
+        encode_variable_frame(0x08, 1, encode_asdu(0x0d, _objects(2), 3, 1)),
+        encode_fixed_frame(0x49, 7),
+        encode_variable_frame(0x08, 2, encode_asdu(0x2d, [(5, 1)], 6, 1)),
+    ]
+
+def _decode(chunks, strict=False):
+    decoder = FT12StreamDecoder(strict=strict)
+    frames = []
+    for chunk in chunks:
+        decoder.feed(chunk)
+        frames.extend(bytes(frame) for frame in decoder)
+    return frames
+
+def test_stream_decoder_reassembles_split_frames():
+    frames = _stream_frames()
+    data = b''.join(frames)
+    assert _decode([data[index:index + 1] for index in range(len(data))]) == frames
+    assert _decode([data[:3], data[3:20], data[20:]]) == frames
+
+def test_stream_decoder_splits_back_to_back_frames():
+    frames = _stream_frames()
+    assert _decode([b''.join(frames)]) == frames
+
+def test_stream_decoder_resyncs_after_garbage():
+    frames = _stream_frames()
+    assert _decode([b'\x00\x42' + frames[0] + b'\x68\x05\x06\x68' + frames[1] + b'\x10\x00' + frames[2]]) == frames
+
+def test_stream_decoder_single_characters():
+    frames = _stream_frames()
+    decoded = _decode([b'\xe5' + frames[1] + b'\xa2'])
+    assert decoded == [b'\xe5', frames[1], b'\xa2']
+    decoder = FT12StreamDecoder()
+    decoder.feed(b'\xa2')
+    assert next(decoder).payload.acknowledge == 0xa2
+
+def test_stream_decoder_strict_skips_bad_checksums():
+    frames = _stream_frames()
+    bad = frames[0][:-2] + bytes([frames[0][-2] ^ 0xff]) + frames[0][-1:]
+    assert _decode([bad + frames[1]], strict=True) == [frames[1]]
+    assert _decode([bad + frames[1]]) == [bad, frames[1]]
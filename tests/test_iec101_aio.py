@@ -0,0 +1,27 @@
+import asyncio
+import os
+
+import pytest
+
+from iec101_aio import open_pty_link
+
+@pytest.mark.skipif(not hasattr(os, 'openpty'), reason='needs a pseudo-terminal')
+def test_pty_write_pipe_applies_backpressure():
+    async def run():
+        link = await open_pty_link()
+        reader = os.open(link.name, os.O_RDONLY | os.O_NONBLOCK)
+        try:
+            link.transport.set_write_buffer_limits(high=1024)
+            link.transport.write(bytes(1 << 16))
+            assert not link.writable.is_set()
+            while not link.writable.is_set():
+                try:
+                    os.read(reader, 1 << 16)
+                except BlockingIOError:
+                    pass
+                await asyncio.sleep(0.01)
+        finally:
+            os.close(reader)
+            link.close()
+
+    asyncio.run(asyncio.wait_for(run(), 5))
@@ -0,0 +1,42 @@
+from collections import namedtuple
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from iec101_arrow import point_batches
+from iec101_codec import datetime_to_cp56, decode_asdu, encode_asdu
+
+Frame = namedtuple('Frame', ['time', 'address', 'asdu'])
+
+TAG = datetime_to_cp56(datetime(2024, 1, 2, 3, 4, 5))
+
+def _frame(type_id, objects, COT=3):
+    return Frame(1700000000.0, 1, decode_asdu(encode_asdu(type_id, objects, COT, 1)))
+
+def _rows(frames):
+    rows = {}
+    for batch in point_batches(frames):
+        for name, column in batch.to_pydict().items():
+            rows.setdefault(name, []).extend(column)
+    return rows
+
+def test_control_types_are_not_points():
+    rows = _rows([_frame(0x67, [(0, TAG)], 6), _frame(0x0d, [(100, 1.5, 0x10)]), _frame(0x64, [(0, 20)], 6)])
+    assert rows['type'] == [0x0d]
+    assert rows['value'] == [1.5]
+    assert rows['quality'] == [0x10]
+
+def test_protection_event_flags_are_quality():
+    rows = _rows([_frame(0x26, [(200, 0x80 | 0x08 | 0x02, 15, TAG)])])
+    assert rows['value'] == [2]
+    assert rows['quality'] == [0x88]
+    assert rows['invalid'] == [True]
+
+def test_batches_are_bounded_by_rows_and_arrow_bytes():
+    frames = [_frame(0x0d, [(index * 100 + offset, float(offset), 0) for offset in range(100)]) for index in range(100)]
+    assert [batch.num_rows for batch in point_batches(frames, batch_size=3000)] == [3000, 3000, 3000, 1000]
+    batches = list(point_batches(frames, batch_size=10000, max_bytes=64 << 10))
+    assert sum(batch.num_rows for batch in batches) == 10000
+    assert all(abs(batch.nbytes - (64 << 10)) < (4 << 10) for batch in batches[:-1])
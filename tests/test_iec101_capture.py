@@ -0,0 +1,22 @@
+import time
+
+from iec101_capture import DIR_TX, CaptureReader, CaptureWriter
+
+def test_idle_writer_flushes_after_interval(tmp_path):
+    path = str(tmp_path / 'idle.cap')
+    writer = CaptureWriter(path, flush_interval=0.05)
+    try:
+        writer.write(b'\xe5', DIR_TX, 3, 123)
+        assert list(CaptureReader(path)) == []
+        time.sleep(0.3)
+        records = list(CaptureReader(path))
+        assert [(record.timestamp_ns, record.direction, record.port, bytes(record.frame)) for record in records] == [(123, DIR_TX, 3, b'\xe5')]
+    finally:
+        writer.close()
+
+def test_close_flushes_and_stops_timer(tmp_path):
+    path = str(tmp_path / 'closed.cap')
+    with CaptureWriter(path, flush_interval=60) as writer:
+        writer.write(b'\xe5')
+    assert writer.timer is None
+    assert len(list(CaptureReader(path))) == 1
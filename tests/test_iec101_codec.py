@@ -0,0 +1,65 @@
+import pytest
+
+from iec101_codec import (
+    MAX_LENGTH_FIELD, ASDUError, LinkProfile, decode_asdu, encode_asdu, encode_variable_frame, pack_asdus, parse_frames
+)
+
+def _objects(count):
+    return [(100 + index, float(index), 0) for index in range(count)]
+
+def test_decode_asdu_within_bounds():
+    asdu = encode_asdu(0x0d, _objects(3), 3, 1)
+    decoded = decode_asdu(asdu + b'\xaa\x16', 0, end=len(asdu))
+    assert [obj.IOA for obj in decoded.IO] == [100, 101, 102]
+
+@pytest.mark.parametrize('sq', [0, 1])
+def test_decode_asdu_rejects_overstated_count(sq):
+    asdu = bytearray(encode_asdu(0x0d, _objects(3), 3, 1, sq))
+    asdu[1] += 1
+    with pytest.raises(ASDUError):
+        decode_asdu(asdu + b'\xaa\x16' + bytes(16), 0, end=len(asdu))
+    with pytest.raises(ASDUError):
+        decode_asdu(asdu)
+
+def test_decode_asdu_rejects_short_header():
+    with pytest.raises(ASDUError):
+        decode_asdu(b'\x0d\x01\xaa\x16', 0, end=2)
+
+def _frame(asdu, address=1):
+    return encode_variable_frame(0x08, address, bytes(asdu))
+
+def test_frame_view_rejects_overstated_count():
+    asdu = bytearray(encode_asdu(0x0d, _objects(2), 3, 1))
+    asdu[1] += 1
+    buff = _frame(asdu) + _frame(encode_asdu(0x0d, _objects(2), 3, 1))
+    frames = list(parse_frames(buff, strict=True))
+    assert len(frames) == 2
+    with pytest.raises(ASDUError):
+        frames[0].decode()
+    assert frames[1].decode().number == 2
+
+def test_frame_view_rejects_short_length():
+    buff = encode_variable_frame(0x08, 1, b'') + _frame(encode_asdu(0x0d, _objects(1), 3, 1))
+    frames = list(parse_frames(buff, strict=True))
+    assert frames[0].size == 8
+    with pytest.raises(ASDUError):
+        frames[0].decode()
+    assert frames[1].decode().IO[0].IOA == 100
+
+@pytest.mark.parametrize('profile', [LinkProfile(), LinkProfile(address_width=2, cot_width=2, ca_width=2, ioa_width=3)])
+def test_pack_asdus_fills_the_length_field(profile):
+    asdus = pack_asdus(0x0d, [(index * 2, 1.0, 0) for index in range(200)], 3, 1, profile=profile)
+    assert max(len(asdu) for asdu in asdus) <= profile.max_asdu_length
+    assert len(asdus[0]) > profile.max_asdu_length - profile.layout(0x0d, 0).size
+    for asdu in asdus:
+        assert len(profile.encode_variable_frame(0x08, 1, asdu)) <= MAX_LENGTH_FIELD + 6
+
+@pytest.mark.parametrize('type_id', [0x0d, 0x24])
+def test_pack_asdus_keeps_duplicate_ioas_in_order(type_id):
+    if type_id == 0x0d:
+        objects = [(1, 1.0, 0), (1, 2.0, 0), (2, 3.0, 0)]
+    else:
+        objects = [(1, 1.0, 0, bytes(7)), (1, 2.0, 0, bytes(7)), (2, 3.0, 0, bytes(7))]
+    sent = [(obj.IOA, obj[1]) for asdu in pack_asdus(type_id, objects, 3, 1) for obj in decode_asdu(asdu).IO]
+    assert sorted(sent) == [(1, 1.0), (1, 2.0), (2, 3.0)]
+    assert sent.index((1, 1.0)) < sent.index((1, 2.0))
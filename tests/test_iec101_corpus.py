@@ -0,0 +1,24 @@
+import pytest
+
+from iec101_corpus import PROFILES, differential, generate
+
+TYPES = [0x01, 0x0d, 0x1e, 0x2d, 0x7d]
+
+@pytest.mark.parametrize('profile', list(PROFILES))
+def test_engines_agree(profile):
+    stats, reports = differential(generate(TYPES, count=2, seed=1, profiles=[profile]))
+    assert reports == []
+    assert stats[f'{profile} frame_view decode'].checked > 0
+    assert stats[f'{profile} codec encode'].checked > 0
+    assert all(not stat.mismatches and not stat.errors for stat in stats.values())
+
+def test_legacy_profiles_run_fast_decode():
+    stats, _ = differential(generate(TYPES, count=1, profiles=['balanced', 'unbalanced']))
+    assert stats['balanced fast decode'].checked == stats['balanced scapy decode'].checked
+    assert stats['unbalanced fast decode'].checked > 0
+
+def test_profile_drift_is_reported():
+    samples = [item._replace(profile='compact') for item in generate([0x0d], count=2, profiles=['wide'])]
+    stats, reports = differential(samples)
+    assert reports
+    assert stats['compact frame_view decode'].mismatches + stats['compact frame_view decode'].errors > 0
@@ -0,0 +1,37 @@
+import pytest
+
+from iec101_codec import LinkProfile, encode_asdu, encode_fixed_frame, encode_variable_frame
+from iec101_filter import ACCEPT, DROP, Rule, RuleSet
+
+RULES = [Rule(DROP, ioa=102), Rule('spont', COT=3), Rule('station', address=1)]
+
+def _frame(count=3, extra=0, sq=0):
+    asdu = bytearray(encode_asdu(0x0d, [(100 + index, 1.0, 0) for index in range(count)], 3, 1, sq))
+    asdu[1] += extra
+    return encode_variable_frame(0x08, 1, bytes(asdu))
+
+def test_classify_header_fields():
+    classify = RuleSet(RULES, default=ACCEPT).classify
+    assert classify(_frame(3)) == DROP
+    assert classify(_frame(2)) == 'spont'
+    assert classify(encode_fixed_frame(0x49, 1)) == 'station'
+    assert classify(b'\xe5') == ACCEPT
+
+@pytest.mark.parametrize('length', [0, 1, 2, 3, 4])
+def test_short_variable_frame_gets_default(length):
+    frame = encode_variable_frame(0x08, 1, bytes([0x0d, 0x01, 0x03][:max(0, length - 2)]))
+    assert RuleSet(RULES, default='malformed').classify(frame) == 'malformed'
+
+@pytest.mark.parametrize('sq', [0, 1])
+def test_overstated_count_only_checks_present_objects(sq):
+    classify = RuleSet([Rule(DROP, ioa=range(103, 200))], default=ACCEPT).classify
+    assert classify(_frame(3, extra=0x7f - 3, sq=sq)) == ACCEPT
+    assert classify(_frame(3, extra=0x7f - 3, sq=sq)[:-3]) == ACCEPT
+
+@pytest.mark.parametrize('profile', [None, LinkProfile(2, 2, 2, 3)])
+def test_truncated_frames_never_raise(profile):
+    rules = RuleSet(RULES + [Rule(DROP, ioa=range(0, 1 << 24))], default='malformed', profile=profile)
+    link = profile or LinkProfile(ioa_width=2)
+    frame = link.encode_variable_frame(0x08, 1, link.encode_asdu(0x0d, [(100, 1.0, 0)] * 30, 3, 1))
+    for size in range(len(frame) + 1):
+        rules.classify(frame[:size])
@@ -0,0 +1,23 @@
+from iec101_codec import encode_asdu, encode_variable_frame
+from iec101_ingest import decode_frame, ingest, read_capture
+
+def _frame(ioa, extra=0):
+    asdu = bytearray(encode_asdu(0x0d, [(ioa, 1.0, 0), (ioa + 1, 2.0, 0)], 3, 1))
+    asdu[1] += extra
+    return encode_variable_frame(0x08, 1, bytes(asdu))
+
+def test_corrupted_frame_does_not_abort_ingest(tmp_path):
+    frames = [_frame(100), _frame(200, extra=1), encode_variable_frame(0x08, 1, b'\x0d\x01'), _frame(300)]
+    path = tmp_path / 'corrupted.log'
+    path.write_text(''.join(f'{index:d}.0 Received: {frame!r}\n' for index, frame in enumerate(frames)))
+    results = list(ingest(read_capture(str(path)), workers=1))
+    assert [result.raw for result in results] == frames
+    assert [result.asdu.IO[0].IOA for result in results if result.asdu] == [100, 300]
+    assert results[1].asdu is None and results[1].error.startswith('ASDUError')
+    assert results[2].asdu is None and results[2].error.startswith('ASDUError')
+
+def test_unbalanced_fallback_keeps_the_ioa():
+    raw = encode_variable_frame(0x08, 1, b'\x7d\x01\x0d\x01' + bytes.fromhex('452301') + b'\x02\x00\x01\x03abc')
+    result = decode_frame(0.0, raw, balanced=False)
+    assert result.error is None
+    assert result.asdu.IO[:3] == bytes.fromhex('452301')
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from iec101 import ASDU, VSQ, FT12Frame
+from iec101_constants import CF_DFC
+from iec101_link import FC_NACK, FC_RESET_LINK, FC_USER_DATA_CONFIRM, LinkBusy, PrimaryLink, SecondaryLink
+
+class Loopback:
+    def __init__(self, secondary):
+        self.secondary = secondary
+
+    async def request(self, frame, timeout):
+        return FT12Frame(self.secondary.handle(FT12Frame(bytes(FT12Frame() / frame))))
+
+def _command():
+    return ASDU(type=0x64, VSQ=VSQ(number=1), COT=6, CommonAddress=1)
+
+def test_refused_user_data_sets_dfc_until_drained():
+    buffered = []
+
+    def on_user_data(asdu):
+        if buffered:
+            return False
+        buffered.append(asdu)
+        return True
+
+    secondary = SecondaryLink(1, on_user_data)
+    primary = PrimaryLink(1)
+    link = Loopback(secondary)
+
+    async def run():
+        await primary.transact(link, FC_RESET_LINK)
+        response = await primary.transact(link, FC_USER_DATA_CONFIRM, _command())
+        assert bytes(response) == b'\xe5' and not primary.dfc
+        response = await primary.transact(link, FC_USER_DATA_CONFIRM, _command())
+        assert response.payload.fcode == FC_NACK
+        assert int(response.payload.Control_Flags) & CF_DFC and primary.dfc
+        with pytest.raises(LinkBusy):
+            await primary.transact(link, FC_USER_DATA_CONFIRM, _command())
+        buffered.clear()
+        secondary.drained()
+        response = await primary.transact(link, FC_USER_DATA_CONFIRM, _command())
+        assert bytes(response) == b'\xe5' and not primary.dfc
+        assert len(buffered) == 1
+
+    asyncio.run(run())
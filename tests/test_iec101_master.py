@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+import iec101_master
+from iec101 import ASDU, VSQ, FT12Frame, FT12Variable
+from iec101_link import FC_REQUEST_CLASS_1, FC_REQUEST_CLASS_2, FC_RESET_LINK, SecondaryLink
+from iec101_master import UnbalancedMaster
+
+class Bus:
+    def __init__(self, *addresses):
+        self.secondaries = {address: SecondaryLink(address) for address in addresses}
+        self.offline = set()
+        self.sent = []
+
+    async def request(self, frame, timeout):
+        frame = FT12Frame(bytes(FT12Frame() / frame))
+        self.sent.append((frame.payload.address, frame.payload.fcode))
+        if frame.payload.address in self.offline:
+            raise asyncio.TimeoutError
+        return FT12Frame(self.secondaries[frame.payload.address].handle(frame))
+
+def _spontaneous():
+    return ASDU(type=0x1, VSQ=VSQ(number=1), COT=3, CommonAddress=1)
+
+def test_rejects_empty_station_list():
+    with pytest.raises(ValueError):
+        UnbalancedMaster(Bus(), [])
+
+def test_resets_then_switches_to_class_1_on_acd(monkeypatch):
+    monkeypatch.setattr(iec101_master, 'monotonic', lambda: 100.0)
+    bus = Bus(1)
+    frames = []
+    master = UnbalancedMaster(bus, [1], idle_interval=2.0, on_frame=lambda station, frame: frames.append(frame))
+    station = master.stations[0]
+
+    async def run():
+        await master.poll(station)
+        assert bus.sent == [(1, FC_RESET_LINK), (1, FC_REQUEST_CLASS_2)]
+        assert station.online and station.due == 102.0
+        bus.secondaries[1].class1.append(_spontaneous())
+        await master.poll(station)
+        assert bus.sent[-1] == (1, FC_REQUEST_CLASS_2) and station.primary.acd
+        await master.poll(station)
+        assert bus.sent[-1] == (1, FC_REQUEST_CLASS_1) and not station.primary.acd
+        assert station.data_frames == 1 and station.due == 100.0
+        assert isinstance(frames[0].payload, FT12Variable) and frames[0][ASDU].type == 0x1
+
+    asyncio.run(run())
+
+def test_backoff_grows_until_capped_and_skips_station(monkeypatch):
+    monkeypatch.setattr(iec101_master, 'monotonic', lambda: 100.0)
+    bus = Bus(1, 2)
+    bus.offline.add(1)
+    master = UnbalancedMaster(bus, [1, 2], retries=0, idle_interval=1.0, max_backoff=5.0)
+    station = master.stations[0]
+
+    async def run():
+        dues = []
+        for _ in range(4):
+            await master.poll(station)
+            dues.append(station.due)
+        assert dues == [102.0, 104.0, 105.0, 105.0]
+        assert station.failures == 4 and not station.online
+        assert all(fcode == FC_RESET_LINK for address, fcode in bus.sent)
+        assert master.next_station(100.0) is master.stations[1]
+        bus.offline.clear()
+        await master.poll(station)
+        assert station.online and station.failures == 0
+
+    asyncio.run(run())
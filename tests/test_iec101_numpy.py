@@ -0,0 +1,41 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from iec101_codec import LinkProfile, cp24_to_datetime, cp56_to_datetime, legacy_profile
+from iec101_numpy import cp24_to_datetime64, cp56_to_datetime64, decode_sequence
+
+def _tag(milliseconds=0, minute=0, hour=0, day=1, month=1, year=24):
+    return bytes([milliseconds & 0xff, milliseconds >> 8, minute, hour, day, month, year])
+
+@pytest.mark.parametrize('tag', [
+    _tag(day=0), _tag(month=0), _tag(month=13), _tag(day=30, month=2), _tag(day=31, month=4),
+    _tag(hour=24), _tag(minute=60), _tag(milliseconds=60000),
+])
+def test_impossible_cp56_is_none_and_nat(tag):
+    assert cp56_to_datetime(tag) is None
+    assert np.isnat(cp56_to_datetime64([tag], mask_invalid=False)[0])
+
+@pytest.mark.parametrize('tag', [_tag(), _tag(59999, 59, 23, 29, 2, 24), _tag(1234, 5, 6, 31, 12, 99)])
+def test_valid_cp56_agrees(tag):
+    assert np.datetime64(cp56_to_datetime(tag), 'ms') == cp56_to_datetime64([tag])[0]
+
+def test_invalid_tags_are_masked_by_default():
+    tag = _tag(minute=0x85)
+    reference = np.datetime64('2024-01-01T00:00', 'ms')
+    assert cp56_to_datetime(tag) is None and np.isnat(cp56_to_datetime64([tag])[0])
+    assert cp24_to_datetime(tag[:3], reference.item()) is None and np.isnat(cp24_to_datetime64([tag[:3]], reference)[0])
+    assert cp56_to_datetime(tag, mask_invalid=False) == cp56_to_datetime64([tag], mask_invalid=False)[0].item()
+    assert cp24_to_datetime(tag[:3], reference.item(), mask_invalid=False) == cp24_to_datetime64([tag[:3]], reference, mask_invalid=False)[0].item()
+
+@pytest.mark.parametrize('profile', [
+    legacy_profile(True), legacy_profile(False), LinkProfile(address_width=2, cot_width=2, ca_width=2, ioa_width=3), LinkProfile(ioa_width=1),
+])
+def test_decode_sequence_follows_the_profile(profile):
+    common_address = 0x0102 if profile.ca_width == 2 else 0x02
+    originator = 7 if profile.cot_width == 2 else 0
+    asdu = profile.encode_asdu(0x0d, [(100 + index, float(index), index) for index in range(3)], 20, common_address, 1, 0, originator)
+    columns = decode_sequence(asdu, profile=profile)
+    assert (columns.type, columns.COT, columns.CommonAddress, columns.originator) == (0x0d, 20, common_address, originator)
+    assert list(columns.IOA) == [100, 101, 102]
+    assert list(columns.values['value']) == [0.0, 1.0, 2.0] and list(columns.values['QDS']) == [0, 1, 2]
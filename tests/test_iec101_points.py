@@ -0,0 +1,28 @@
+from iec101_codec import decode_asdu, encode_asdu
+from iec101_points import PointDatabase
+from iec101_records import IntegratedTotal, MeasuredFloat
+
+def _notifications(db):
+    seen = []
+    db.subscribe(lambda key, state: seen.append(state))
+    return seen
+
+def test_counter_sequence_number_is_not_a_change():
+    db = PointDatabase()
+    seen = _notifications(db)
+    for sequence in range(4):
+        db.apply(decode_asdu(encode_asdu(0x0f, [(10, 1234, sequence)], 37, 1)), 1)
+    assert len(seen) == 1
+    assert db.get(1, 10, IntegratedTotal).quality == 0
+    db.apply(decode_asdu(encode_asdu(0x0f, [(10, 1234, 0x80 | 4)], 37, 1)), 2)
+    assert len(seen) == 2 and seen[-1].quality == 0x80
+
+def test_nan_values_compare_equal():
+    db = PointDatabase()
+    seen = _notifications(db)
+    key = (1, 20, MeasuredFloat)
+    assert db.update(key, float('nan'), 0, 1)
+    assert not db.update(key, float('nan'), 0, 2)
+    assert db.update(key, 1.0, 0, 3)
+    assert db.update(key, float('nan'), 0, 4)
+    assert len(seen) == 3
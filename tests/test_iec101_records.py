@@ -0,0 +1,32 @@
+import pytest
+
+from iec101_codec import decode_asdu, encode_asdu
+from iec101_records import (
+    Bitstring, DoublePoint, IntegratedTotal, MeasuredFloat, MeasuredNormalized, MeasuredScaled, SinglePoint, StepPosition,
+    records_from_decoded, records_to_objects, record_value
+)
+
+TAG = bytes([0x10, 0x27, 0x05, 0x0c, 0x06, 0x05, 0x18])
+
+@pytest.mark.parametrize('type_id, records, values', [
+    (0x01, [SinglePoint(1, 0x01), SinglePoint(2, 0x80)], [(1, 0x00), (0, 0x80)]),
+    (0x1e, [SinglePoint(1, 0x11, TAG)], [(1, 0x10)]),
+    (0x03, [DoublePoint(3, 0x02), DoublePoint(4, 0x43)], [(2, 0x00), (3, 0x40)]),
+    (0x05, [StepPosition(5, 0x05, 0x00), StepPosition(6, 0x7f, 0x80)], [(5, 0x00), (-1, 0x80)]),
+    (0x07, [Bitstring(7, 0x80000001, 0x10)], [(0x80000001, 0x10)]),
+    (0x09, [MeasuredNormalized(9, 0.5, 0x00), MeasuredNormalized(10, -0.25, 0x01)], [(0.5, 0x00), (-0.25, 0x01)]),
+    (0x0b, [MeasuredScaled(11, -1234, 0x00)], [(-1234, 0x00)]),
+    (0x0d, [MeasuredFloat(13, 1.5, 0x00), MeasuredFloat(14, -2.0, 0x80)], [(1.5, 0x00), (-2.0, 0x80)]),
+    (0x24, [MeasuredFloat(13, 1.5, 0x00, TAG)], [(1.5, 0x00)]),
+    (0x0f, [IntegratedTotal(15, -100000, 0x85)], [(-100000, 0x80)]),
+])
+def test_records_round_trip(type_id, records, values):
+    asdu = encode_asdu(type_id, records_to_objects(type_id, records), 3, 1)
+    decoded = records_from_decoded(decode_asdu(asdu))
+    assert decoded == records
+    assert [record_value(record) for record in decoded] == values
+    assert encode_asdu(type_id, records_to_objects(type_id, decoded), 3, 1) == asdu
+
+def test_records_reject_types_without_a_record_class():
+    with pytest.raises(ValueError):
+        records_from_decoded(decode_asdu(encode_asdu(0x2d, [(5, 1)], 6, 1)))
@@ -0,0 +1,39 @@
+import pytest
+
+from iec101 import ASDU, IO100, IO101, QCC, VSQ
+from iec101_records import SinglePoint
+from iec101_simulator import (
+    COT_ACT, COT_ACTCON, COT_ACTTERM, COT_DEACT, COT_DEACTCON, COT_NEGATIVE, COT_SPONT, COT_UNKNOWN_COT,
+    Outstation
+)
+
+def _request(type_id, COT):
+    io = IO100(IOA=0, QOI=20) if type_id == 0x64 else IO101(IOA=0, QCC=QCC(RQT=5))
+    return ASDU(type=type_id, VSQ=VSQ(number=1), COT=COT, CommonAddress=1, IO=io)
+
+def _replies(queue):
+    return [(asdu[0], asdu[2] >> 6, asdu[2] & 0x3f) for asdu in queue]
+
+@pytest.mark.parametrize('type_id', [0x64, 0x65])
+def test_interrogation_runs_on_act(type_id):
+    station = Outstation(1, 1, [SinglePoint(100, 0)])
+    station.on_user_data(_request(type_id, COT_ACT))
+    replies = _replies(station.link.class2)
+    assert replies[0] == (type_id, 0, COT_ACTCON) and replies[-1] == (type_id, 0, COT_ACTTERM)
+
+@pytest.mark.parametrize('type_id', [0x64, 0x65])
+def test_interrogation_deact_is_confirmed(type_id):
+    station = Outstation(1, 1, [SinglePoint(100, 0)])
+    station.on_user_data(_request(type_id, COT_DEACT))
+    assert not station.link.class2
+    assert _replies(station.link.class1) == [(type_id, 0, COT_DEACTCON)]
+
+@pytest.mark.parametrize('type_id', [0x64, 0x65])
+def test_interrogation_other_cause_is_refused(type_id):
+    station = Outstation(1, 1, [SinglePoint(100, 0)])
+    request = _request(type_id, COT_SPONT)
+    station.on_user_data(request)
+    assert not station.link.class2
+    assert _replies(station.link.class1) == [(type_id, COT_NEGATIVE, COT_UNKNOWN_COT)]
+    reply = station.link.class1[0]
+    assert reply[:2] + reply[3:] == bytes(request)[:2] + bytes(request)[3:]